@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+from platform import python_version
+from typing import NamedTuple
+
+from mines.__version__ import __version__
+from mines.bench.bench_suite import BenchResult
+
+
+class BenchResultsFormatError(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(f"Invalid bench results: {message}")
+
+
+class BenchComparison(NamedTuple):
+    result: BenchResult
+    baseline_result: BenchResult | None
+
+    def get_change(self) -> float | None:
+        # The relative change of the rate, which is negative if slower.
+        if self.baseline_result is None or self.baseline_result.get_rate() == 0:
+            return None
+        return self.result.get_rate() / self.baseline_result.get_rate() - 1
+
+    def is_regression(self, threshold: float) -> bool:
+        change = self.get_change()
+        return change is not None and change < -threshold
+
+
+def write_bench_results(results: list[BenchResult], path: Path) -> None:
+    data = {
+        "mines_version": __version__,
+        "python_version": python_version(),
+        "results": [
+            {
+                "name": result.name,
+                "unit": result.unit,
+                "count": result.count,
+                "seconds": result.seconds,
+                "rate": result.get_rate(),
+            }
+            for result in results
+        ],
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def read_bench_results(path: Path) -> list[BenchResult]:
+    data = json.loads(path.read_text())
+    try:
+        return [
+            BenchResult(
+                name=str(result["name"]),
+                unit=str(result["unit"]),
+                count=int(result["count"]),
+                seconds=float(result["seconds"]),
+            )
+            for result in data["results"]
+        ]
+    except (KeyError, TypeError, ValueError) as e:
+        message = f"{path} does not have results."
+        raise BenchResultsFormatError(message) from e
@@ -0,0 +1,266 @@
+import gc
+from collections.abc import Callable
+from functools import partial
+from io import BytesIO, StringIO
+from pathlib import Path
+from random import Random
+from time import perf_counter
+from typing import NamedTuple
+
+from mines.bench.program_generator import (
+    generate_bignum_mul_source,
+    generate_char_io_source,
+    generate_deep_roll_source,
+    generate_flood_restart_source,
+    generate_random_source,
+)
+from mines.player.board import BoardSize
+from mines.presenter.game import Game
+from mines.program.parser import parse
+from mines.program.program import Program
+from mines.runtime.runner import Runner, StepResult
+from mines.view.ansi import Ansi
+from mines.view.board_renderer import BoardRenderer
+from mines.view.board_viewport import BoardWindow
+from mines.view.chunked_input_source import DEFAULT_CHUNK_SIZE, ChunkedInputSource
+from mines.view.cli_frame_drawer import CliFrameDrawer
+from mines.view.input_view import InputView
+from mines.view.output_view import (
+    OUTPUT_VIEW_MAX_LEN,
+    OUTPUT_VIEW_MAX_LF,
+    OutputView,
+)
+from mines.view.player_view import PlayerView
+from mines.view.step_result_view import StepResultView
+from mines.view.tail_output_sink import TailOutputSink
+from mines.view.text_output_sink import TextOutputSink
+
+MAX_INTEGER_DIGITS = 4300
+RUN_STEP_LIMIT = 20_000
+FRAME_STEP_LIMIT = 1000
+DEEP_ROLL_DEPTHS = (10, 100, 1000, 10_000)
+
+# Two integers for the examples reading them, followed by text to echo.
+EXAMPLE_INPUT = "3 2\n" + "Mines is a Minesweeper-driven esolang.\n" * 1000
+CHAR_IO_INPUT = "".join(chr(0x20 + code % 0x5F) for code in range(RUN_STEP_LIMIT))
+
+
+class BenchCase(NamedTuple):
+    name: str
+    unit: str
+    # Runs the case once and returns the number of units processed.
+    run: Callable[[], int]
+
+
+class BenchResult(NamedTuple):
+    name: str
+    unit: str
+    count: int
+    seconds: float
+
+    def get_rate(self) -> float:
+        return self.count / self.seconds if self.seconds > 0 else 0.0
+
+
+def __parse_source(source: str) -> int:
+    parse(source)
+    return source.count("\n") + 1
+
+
+def __create_runner(program: Program, input_str: str, output_io: StringIO) -> Runner:
+    input_source = ChunkedInputSource(
+        BytesIO(input_str.encode()),
+        DEFAULT_CHUNK_SIZE,
+        None,
+        prefetches=False,
+    )
+    return Runner(
+        program,
+        input_source,
+        TextOutputSink(output_io),
+        None,
+        MAX_INTEGER_DIGITS,
+    )
+
+
+def __run_program(program: Program, input_str: str, max_step_count: int) -> int:
+    with StringIO() as output_io:
+        runner = __create_runner(program, input_str, output_io)
+        return runner.run_steps(max_step_count)
+
+
+def __create_game(board_size: BoardSize, mine_number: int) -> int:
+    Game("bench", board_size, mine_number, 0)
+    return 1
+
+
+def __draw_debugger_frame(
+    runner: Runner,
+    views: tuple[InputView, OutputView, BoardRenderer],
+    cli_frame_drawer: CliFrameDrawer,
+    frame_io: StringIO,
+    step_result: StepResult,
+) -> None:
+    # The same frame as drawn by the debugger at each step.
+    input_view, output_view, board_renderer = views
+    runtime_state = runner.get_runtime_state()
+    player_view = PlayerView(runtime_state.player)
+    step_result_view = StepResultView(runtime_state.player, step_result)
+    board_size = runtime_state.player.get_board_size()
+    board_renderer.update(None, BoardWindow(0, 0, board_size.width, board_size.height))
+
+    cli_frame_drawer.add_line(player_view.get_board_info_str(), "board")
+    cli_frame_drawer.add_line("")
+    cli_frame_drawer.add_board(board_renderer)
+    cli_frame_drawer.add_line("")
+    cli_frame_drawer.add_line(step_result_view.get_operation_str(), "operation")
+    cli_frame_drawer.add_line(player_view.get_click_result_str(), "click result")
+    cli_frame_drawer.add_line(step_result_view.get_command_str(), "command")
+    cli_frame_drawer.add_line(str(Ansi("--", faint=True)), "stack before")
+    cli_frame_drawer.add_line(str(runtime_state.stack), "stack after ")
+    cli_frame_drawer.add_line("", "input")
+    cli_frame_drawer.add_line(input_view.get_str())
+    cli_frame_drawer.add_line("", "output")
+    cli_frame_drawer.add_line(output_view.get_str())
+    cli_frame_drawer.add_line("")
+    cli_frame_drawer.draw_frame()
+
+    frame_io.seek(0)
+    frame_io.truncate()
+
+
+def __draw_debugger_frames(program: Program, input_str: str) -> int:
+    input_source = ChunkedInputSource(
+        BytesIO(input_str.encode()),
+        DEFAULT_CHUNK_SIZE,
+        None,
+        prefetches=False,
+    )
+    output_sink = TailOutputSink(OUTPUT_VIEW_MAX_LEN, OUTPUT_VIEW_MAX_LF)
+    with StringIO() as frame_io:
+        input_view = InputView(input_source)
+        output_view = OutputView(output_sink)
+        cli_frame_drawer = CliFrameDrawer(frame_io)
+
+        def draw(step_result: StepResult) -> None:
+            __draw_debugger_frame(
+                runner,
+                (input_view, output_view, board_renderer),
+                cli_frame_drawer,
+                frame_io,
+                step_result,
+            )
+
+        runner = Runner(
+            program,
+            input_source,
+            output_sink,
+            draw,
+            MAX_INTEGER_DIGITS,
+        )
+        board_renderer = BoardRenderer(runner.get_runtime_state().player)
+        return runner.run_steps(FRAME_STEP_LIMIT)
+
+
+def get_bench_cases(examples_dir: Path | None) -> list[BenchCase]:
+    small_source = generate_char_io_source(16)
+    huge_source = generate_random_source(
+        Random(0),  # noqa: S311
+        BoardSize(1000, 1000),
+        100_000,
+    )
+    cases = [
+        BenchCase("parse/small", "lines", partial(__parse_source, small_source)),
+        BenchCase("parse/huge", "lines", partial(__parse_source, huge_source)),
+    ]
+
+    if examples_dir is not None:
+        for example_path in sorted(examples_dir.glob("*.mines")):
+            program = parse(example_path.read_text())
+            cases.append(
+                BenchCase(
+                    f"run/examples/{example_path.stem}",
+                    "steps",
+                    partial(__run_program, program, EXAMPLE_INPUT, RUN_STEP_LIMIT),
+                ),
+            )
+
+    synthetic_cases: list[tuple[str, str, str, int]] = [
+        (
+            f"deep-roll/{depth}",
+            generate_deep_roll_source(depth, 1000),
+            "",
+            RUN_STEP_LIMIT,
+        )
+        for depth in DEEP_ROLL_DEPTHS
+    ]
+    synthetic_cases += [
+        (
+            "flood-restart",
+            generate_flood_restart_source(BoardSize(50, 50)),
+            "",
+            30,
+        ),
+        ("bignum-mul", generate_bignum_mul_source(3, 18), "", 100),
+        ("char-io", generate_char_io_source(1000), CHAR_IO_INPUT, RUN_STEP_LIMIT),
+    ]
+    for name, source, input_str, max_step_count in synthetic_cases:
+        cases.append(
+            BenchCase(
+                f"run/{name}",
+                "steps",
+                partial(__run_program, parse(source), input_str, max_step_count),
+            ),
+        )
+
+    cases.extend(
+        [
+            BenchCase(
+                "game/expert",
+                "boards",
+                partial(__create_game, BoardSize(30, 16), 99),
+            ),
+            BenchCase(
+                "game/huge",
+                "boards",
+                partial(__create_game, BoardSize(500, 500), 37_500),
+            ),
+            BenchCase(
+                "debugger/frame",
+                "frames",
+                partial(
+                    __draw_debugger_frames,
+                    parse(generate_char_io_source(16)),
+                    EXAMPLE_INPUT,
+                ),
+            ),
+        ],
+    )
+    return cases
+
+
+def __measure_round(case: BenchCase, min_seconds: float) -> BenchResult:
+    count = 0
+    begin = perf_counter()
+    seconds = 0.0
+    while seconds < min_seconds:
+        count += case.run()
+        seconds = perf_counter() - begin
+    return BenchResult(case.name, case.unit, count, seconds)
+
+
+def measure_case(case: BenchCase, min_seconds: float, repeat: int) -> BenchResult:
+    # Each round runs the case until min_seconds passes, and the fastest round
+    # is taken as the least disturbed one. GC is paused as in timeit.
+    best_result = BenchResult(case.name, case.unit, 0, 0.0)
+    is_gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            result = __measure_round(case, min_seconds)
+            if result.get_rate() > best_result.get_rate():
+                best_result = result
+    finally:
+        if is_gc_enabled:
+            gc.enable()
+    return best_result
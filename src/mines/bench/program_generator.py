@@ -0,0 +1,224 @@
+from random import Random
+
+from mines.player.board import BoardSize, Cell, CellDigit, CellState
+from mines.player.operation import ClickOperation, Operation, RestartOperation
+from mines.player.player import Player
+from mines.program.parser import parse
+from mines.runtime.command_type import CommandType
+
+# A small board which has cells of every digit from 0 to 7.
+GENERATOR_BOARD_LINES = [
+    "..***.*",
+    "...*...",
+    ".***.**",
+    "*.*.*..",
+    "***..**",
+]
+
+OPENED_CELL_CLICKS: dict[CommandType, tuple[bool, CellDigit]] = {
+    "pop": (True, 0),
+    "positive": (True, 1),
+    "dup": (True, 2),
+    "add": (True, 3),
+    "sub": (True, 4),
+    "mul": (True, 5),
+    "div": (True, 6),
+    "mod": (True, 7),
+    "perform(l)": (True, 8),
+    "not": (False, 1),
+    "roll": (False, 2),
+    "in(n)": (False, 3),
+    "in(c)": (False, 4),
+    "out(n)": (False, 5),
+    "out(c)": (False, 6),
+    "skip": (False, 7),
+    "perform(r)": (False, 8),
+}
+
+MIN_FLOOD_BOARD_LEN = 3
+RANDOM_MINE_RATIO = 0.2
+
+
+class ProgramGeneratorError(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(f"Program cannot be generated: {message}")
+
+
+class ProgramAssembler:
+    # Operations are performed by a player as they are added, so that every
+    # command is given by a click on a cell in the right state. Cells are
+    # opened on demand by a left click followed by a `pop`.
+    __board_lines: list[str]
+    __player: Player
+    __operation_lines: list[str]
+
+    def __init__(self, board_lines: list[str]) -> None:
+        self.__board_lines = board_lines
+        self.__player = Player(parse("\n".join([*board_lines, ""])).cell_digits)
+        self.__operation_lines = []
+
+    def __add(self, operation_line: str, operation: Operation) -> None:
+        self.__operation_lines.append(operation_line)
+        self.__player.perform_operation(operation)
+        game_status = self.__player.get_player_state().game_status
+        if game_status != "playing":
+            message = f"Game status became {game_status}."
+            raise ProgramGeneratorError(message)
+
+    def __click(self, cell: Cell, *, is_left_button: bool) -> None:
+        separator = "," if is_left_button else ";"
+        self.__add(
+            f"{cell.column_index}{separator}{cell.row_index}",
+            ClickOperation(cell, is_left_button=is_left_button),
+        )
+
+    def __find_cell(self, digit: CellDigit, cell_state: CellState) -> Cell | None:
+        player = self.__player
+        cell_states = player.get_player_state().cell_states
+        for cell in player.get_board_size().iterate_board_cells():
+            if player.get_cell_digit(cell) == digit and cell_states.get(cell) == (
+                cell_state
+            ):
+                return cell
+        return None
+
+    def restart(self) -> None:
+        self.__add("@", RestartOperation())
+
+    def open_cell(self, digit: CellDigit) -> Cell:
+        if digit != 0:
+            self.open_cell(0)
+        opened_cell = self.__find_cell(digit, "opened")
+        if opened_cell is not None:
+            return opened_cell
+
+        cell = self.__find_cell(digit, "unopened")
+        if cell is None:
+            message = f"No cell has digit {digit}."
+            raise ProgramGeneratorError(message)
+        self.__click(cell, is_left_button=True)
+        self.command("pop")
+        return cell
+
+    def command(self, command_type: CommandType) -> None:
+        click = OPENED_CELL_CLICKS.get(command_type)
+        if click is None:
+            message = f"{command_type} is not given by a click on an opened cell."
+            raise ProgramGeneratorError(message)
+        is_left_button, digit = click
+        self.__click(self.open_cell(digit), is_left_button=is_left_button)
+
+    def push_digit(self) -> None:
+        for digit in range(1, 9):
+            cell = self.__find_cell(digit, "unopened")
+            if cell is not None:
+                self.__click(cell, is_left_button=True)
+                return
+        message = "No unopened cell has a positive digit."
+        raise ProgramGeneratorError(message)
+
+    def push_constant(self, value: int) -> None:
+        if value < 1:
+            message = f"Constant {value} is not positive."
+            raise ProgramGeneratorError(message)
+        for command_type in ("positive", "dup", "add"):
+            self.open_cell(OPENED_CELL_CLICKS[command_type][1])
+
+        self.push_digit()
+        self.command("positive")
+        for bit in f"{value:b}"[1:]:
+            self.command("dup")
+            self.command("add")
+            if bit == "1":
+                self.command("dup")
+                self.command("positive")
+                self.command("add")
+
+    def get_source(self) -> str:
+        return "\n".join([*self.__board_lines, *self.__operation_lines])
+
+
+# Each program runs its operations endlessly, as the operation list is
+# circular and every round starts with a restart and an empty stack.
+
+
+def generate_deep_roll_source(depth: int, roll_count: int) -> str:
+    assembler = ProgramAssembler(GENERATOR_BOARD_LINES)
+    assembler.restart()
+    assembler.push_constant(depth)
+    for _ in range(depth - 1):
+        assembler.command("dup")
+    for _ in range(roll_count):
+        for command_type in ("dup", "dup", "positive", "roll"):
+            assembler.command(command_type)
+    for _ in range(depth):
+        assembler.command("pop")
+    return assembler.get_source()
+
+
+def generate_flood_restart_source(board_size: BoardSize) -> str:
+    width, height = board_size
+    if width < MIN_FLOOD_BOARD_LEN or height < MIN_FLOOD_BOARD_LEN:
+        message = f"Board size {width}x{height} is too small."
+        raise ProgramGeneratorError(message)
+
+    # The bottom right cell is enclosed by mines to keep the game uncleared.
+    board_lines = ["." * width for _ in range(height - 2)]
+    board_lines.append("." * (width - 2) + "**")
+    board_lines.append("." * (width - 2) + "*.")
+
+    assembler = ProgramAssembler(board_lines)
+    assembler.restart()
+    assembler.open_cell(0)
+    return assembler.get_source()
+
+
+def generate_bignum_mul_source(base: int, squaring_count: int) -> str:
+    assembler = ProgramAssembler(GENERATOR_BOARD_LINES)
+    assembler.restart()
+    assembler.open_cell(OPENED_CELL_CLICKS["mul"][1])
+    assembler.push_constant(base)
+    for _ in range(squaring_count):
+        assembler.command("dup")
+        assembler.command("mul")
+    assembler.command("pop")
+    return assembler.get_source()
+
+
+def generate_char_io_source(char_count: int) -> str:
+    assembler = ProgramAssembler(GENERATOR_BOARD_LINES)
+    assembler.restart()
+    for _ in range(char_count):
+        assembler.command("in(c)")
+        assembler.command("out(c)")
+    return assembler.get_source()
+
+
+def generate_random_source(
+    random: Random,
+    board_size: BoardSize,
+    operation_count: int,
+) -> str:
+    width, height = board_size
+    board_lines = [
+        "".join(
+            "*" if random.random() < RANDOM_MINE_RATIO else "." for _ in range(width)
+        )
+        for _ in range(height)
+    ]
+
+    operation_lines: list[str] = []
+    for _ in range(operation_count):
+        match random.randrange(8):
+            case 0:
+                operation_lines.append("!")
+            case 1:
+                operation_lines.append("@")
+            case 2:
+                operation_lines.append("")
+            case _:
+                separator = random.choice((",", ";"))
+                column_index = random.randrange(-width, 2 * width)
+                row_index = random.randrange(-height, 2 * height)
+                operation_lines.append(f"{column_index}{separator}{row_index}")
+    return "\n".join([*board_lines, *operation_lines])
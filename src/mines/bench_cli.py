@@ -0,0 +1,131 @@
+import sys
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from pathlib import Path
+from sys import stdout
+
+from mines.__version__ import __version__
+from mines.bench.bench_results import (
+    BenchComparison,
+    read_bench_results,
+    write_bench_results,
+)
+from mines.bench.bench_suite import BenchResult, get_bench_cases, measure_case
+
+
+@dataclass
+class Args:
+    output: str | None = None
+    baseline: str | None = None
+    threshold: float = 0.1
+    filter: str | None = None
+    examples: str = "examples"
+    min_time: float = 0.2
+    repeat: int = 3
+    list: bool | None = None
+
+
+def __get_result_str(result: BenchResult) -> str:
+    return f"{result.name:<28}{result.get_rate():>16.1f} {result.unit}/s"
+
+
+def __get_comparison_str(comparison: BenchComparison, threshold: float) -> str:
+    result_str = __get_result_str(comparison.result)
+    change = comparison.get_change()
+    if change is None:
+        return f"{result_str}  (no baseline)"
+    mark = "  REGRESSION" if comparison.is_regression(threshold) else ""
+    return f"{result_str}  {change:+8.1%}{mark}"
+
+
+def main() -> None:
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument("-V", "--version", action="version", version=__version__)
+    arg_parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        help="write the results to the JSON file",
+    )
+    arg_parser.add_argument(
+        "-b",
+        "--baseline",
+        type=str,
+        help="compare the results with the JSON file",
+    )
+    arg_parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="slowdown ratio regarded as a regression (default: 0.1)",
+    )
+    arg_parser.add_argument(
+        "-k",
+        "--filter",
+        type=str,
+        help="run only the cases whose names contain the string",
+    )
+    arg_parser.add_argument(
+        "--examples",
+        type=str,
+        default="examples",
+        help="directory of example programs to run (default: examples)",
+    )
+    arg_parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="min seconds of each round (default: 0.2)",
+    )
+    arg_parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="number of rounds of each case, of which the fastest is taken"
+        " (default: 3)",
+    )
+    arg_parser.add_argument(
+        "-l",
+        "--list",
+        action="store_true",
+        help="list the case names and exit",
+    )
+    args = arg_parser.parse_args(namespace=Args())
+
+    examples_dir = Path(args.examples)
+    cases = [
+        case
+        for case in get_bench_cases(examples_dir if examples_dir.is_dir() else None)
+        if args.filter is None or args.filter in case.name
+    ]
+    if args.list:
+        stdout.write("".join(f"{case.name}\n" for case in cases))
+        return
+
+    baseline_results = (
+        {result.name: result for result in read_bench_results(Path(args.baseline))}
+        if args.baseline is not None
+        else None
+    )
+
+    results: list[BenchResult] = []
+    regression_count = 0
+    for case in cases:
+        result = measure_case(case, args.min_time, args.repeat)
+        results.append(result)
+        if baseline_results is None:
+            stdout.write(__get_result_str(result) + "\n")
+        else:
+            comparison = BenchComparison(result, baseline_results.get(result.name))
+            stdout.write(__get_comparison_str(comparison, args.threshold) + "\n")
+            regression_count += comparison.is_regression(args.threshold)
+        stdout.flush()
+
+    if args.output is not None:
+        write_bench_results(results, Path(args.output))
+
+    if regression_count > 0:
+        stdout.write(f"{regression_count} regressions beyond the threshold\n")
+        sys.exit(1)
@@ -1,15 +1,39 @@
-from argparse import ArgumentParser
+import sys
+from argparse import ArgumentParser, ArgumentTypeError
+from collections.abc import Callable
+from contextlib import ExitStack
 from dataclasses import dataclass
-from io import StringIO
+from io import BufferedIOBase, BufferedWriter, BytesIO
 from pathlib import Path
 from sys import stderr, stdin, stdout
-from typing import TextIO
 
 from mines.__version__ import __version__
+from mines.player.cell_counters import CELL_COUNTER_KINDS, CellCounters
 from mines.presenter.debugger import Debugger
-from mines.program.parser import parse
+from mines.program.program import Program
+from mines.program.program_cache import (
+    get_default_cache_dir,
+    is_artifact_file,
+    load_program,
+)
+from mines.runtime.breakpoint import parse_breakpoint
+from mines.runtime.input_buffer import InputSource
+from mines.runtime.integer_str import IntegerDigitLimitError
+from mines.runtime.operation_counter import OperationCounter
+from mines.runtime.profiler import Profiler
 from mines.runtime.runner import Runner
+from mines.trace.trace_format import DEFAULT_SNAPSHOT_INTERVAL
+from mines.trace.trace_writer import TraceWriter
+from mines.view.buffered_output_sink import DEFAULT_FLUSH_THRESHOLD, BufferedOutputSink
+from mines.view.cell_counters_export import (
+    write_cell_counters_csv,
+    write_cell_counters_json,
+)
+from mines.view.chunked_input_source import DEFAULT_CHUNK_SIZE, ChunkedInputSource
 from mines.view.interactive_input_source import InteractiveInputSource
+from mines.view.operation_count_view import OperationCountView
+from mines.view.player_view import PlayerView
+from mines.view.profile_view import ProfileView
 
 
 @dataclass
@@ -18,16 +42,138 @@ class Args:
     input: str | None = None
     echo: str | None = None
     debug: bool | None = None
+    breakpoints: list[str] | None = None
+    max_digits: int = 0
+    line_buffered: bool | None = None
+    writer_thread: bool | None = None
+    prefetch: bool | None = None
+    cache_dir: str | None = None
+    no_cache: bool | None = None
+    profile: bool | None = None
+    annotate: bool | None = None
+    heatmap: str | None = None
+    trace: str | None = None
 
 
-def __get_input_io(args: Args) -> TextIO:
-    if args.input is not None:
-        return Path(args.input).open(encoding="utf-8")
+def __parse_max_digits(value: str) -> int:
+    try:
+        max_digits = int(value)
+    except ValueError:
+        message = f"invalid int value: {value!r}"
+        raise ArgumentTypeError(message) from None
+    if max_digits < 0:
+        message = f"{max_digits} is negative."
+        raise ArgumentTypeError(message)
+    return max_digits
 
-    if args.echo is not None:
-        return StringIO(args.echo)
 
-    return stdin
+def __get_input_source(
+    args: Args,
+    input_file: BufferedIOBase | None,
+    before_read: Callable[[], None] | None,
+) -> InputSource:
+    input_io: BufferedIOBase
+    if input_file is not None:
+        input_io = input_file
+    elif args.echo is not None:
+        input_io = BytesIO(args.echo.encode())
+    elif stdin.isatty():
+        return InteractiveInputSource(stdin, before_read)
+    else:
+        input_io = stdin.buffer
+
+    return ChunkedInputSource(
+        input_io,
+        DEFAULT_CHUNK_SIZE,
+        before_read,
+        prefetches=bool(args.prefetch),
+    )
+
+
+def __write_operation_counts(
+    args: Args,
+    program: Program,
+    operation_counter: OperationCounter,
+) -> None:
+    source_path = Path(args.source)
+    source_lines = (
+        None
+        if is_artifact_file(source_path)
+        else source_path.read_text(encoding="utf-8").split("\n")
+    )
+    operation_count_view = OperationCountView(
+        operation_counter,
+        source_lines,
+        program.operation_line_index,
+    )
+    stderr.write(operation_count_view.get_annotated_source_str())
+    stderr.write("\n")
+    stderr.write(operation_count_view.get_hot_loops_str())
+
+
+def __write_cell_counters(args: Args, runner: Runner) -> None:
+    player = runner.get_runtime_state().player
+    cell_counters = player.get_cell_counters()
+    if args.heatmap is None or cell_counters is None:
+        return
+
+    if args.heatmap == "-":
+        player_view = PlayerView(player)
+        for kind in CELL_COUNTER_KINDS:
+            stderr.write(player_view.get_heatmap_str(kind) + "\n")
+        return
+
+    heatmap_path = Path(args.heatmap)
+    with heatmap_path.open("w", encoding="utf-8") as f:
+        if heatmap_path.suffix == ".json":
+            write_cell_counters_json(cell_counters, f)
+        else:
+            write_cell_counters_csv(cell_counters, f)
+
+
+def __run(
+    args: Args,
+    program: Program,
+    input_file: BufferedIOBase | None,
+    trace_file: BufferedWriter | None,
+) -> None:
+    output_sink = BufferedOutputSink(
+        stdout.buffer,
+        DEFAULT_FLUSH_THRESHOLD,
+        is_line_buffered=bool(args.line_buffered) and stdout.isatty(),
+        uses_writer_thread=bool(args.writer_thread),
+    )
+    input_source = __get_input_source(args, input_file, output_sink.flush)
+    runner = Runner(program, input_source, output_sink, None, args.max_digits)
+    profiler = Profiler() if args.profile else None
+    if profiler is not None:
+        runner.set_step_profiler(profiler.record_step)
+    operation_counter = (
+        OperationCounter(len(program.operation_list)) if args.annotate else None
+    )
+    runner.set_operation_counter(operation_counter)
+    if args.heatmap is not None:
+        runner.get_runtime_state().player.set_cell_counters(
+            CellCounters(program.cell_digits.get_board_size()),
+        )
+    trace_writer = (
+        TraceWriter(trace_file, runner.get_runtime_state(), DEFAULT_SNAPSHOT_INTERVAL)
+        if trace_file is not None
+        else None
+    )
+    if trace_writer is not None:
+        runner.set_step_tracer(trace_writer.record_step)
+    try:
+        runner.run()
+    finally:
+        output_sink.close()
+        if trace_writer is not None:
+            trace_writer.close()
+        if profiler is not None:
+            stderr.write(ProfileView(profiler).get_str())
+        if operation_counter is not None:
+            __write_operation_counts(args, program, operation_counter)
+        __write_cell_counters(args, runner)
 
 
 def main() -> None:
@@ -42,6 +188,66 @@ def main() -> None:
         action="store_true",
         help="enable debug mode",
     )
+    arg_parser.add_argument(
+        "--break",
+        type=str,
+        action="append",
+        dest="breakpoints",
+        help="breakpoint or watch condition of debug mode (e.g. 'line 12', "
+        "'command add', 'depth > 10'), which can be repeated",
+    )
+    arg_parser.add_argument(
+        "--max-digits",
+        type=__parse_max_digits,
+        default=0,
+        help="max digits of integers to input or output (0 for unlimited)",
+    )
+    arg_parser.add_argument(
+        "--line-buffered",
+        action="store_true",
+        help="flush output at every newline if stdout is connected to tty",
+    )
+    arg_parser.add_argument(
+        "--writer-thread",
+        action="store_true",
+        help="write output on a background thread",
+    )
+    arg_parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="read input ahead on a background thread",
+    )
+    arg_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="directory to cache compiled programs",
+    )
+    arg_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="disable the cache of compiled programs",
+    )
+    arg_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="report command statistics to stderr after execution",
+    )
+    arg_parser.add_argument(
+        "--annotate",
+        action="store_true",
+        help="report source annotated with operation counts to stderr after execution",
+    )
+    arg_parser.add_argument(
+        "--heatmap",
+        type=str,
+        help="file path to export click counts of cells as CSV or JSON "
+        "('-' to show them on stderr)",
+    )
+    arg_parser.add_argument(
+        "--trace",
+        type=str,
+        help="file path to write the binary trace of execution",
+    )
     args = arg_parser.parse_args(namespace=Args())
 
     is_debug_mode = bool(args.debug)
@@ -50,14 +256,35 @@ def main() -> None:
         stderr.write(message)
         return
 
-    with Path(args.source).open(encoding="utf-8") as f:
-        code = f.read()
-    program = parse(code)
-    with __get_input_io(args) as input_io:
-        input_source = InteractiveInputSource(input_io)
-        if is_debug_mode:
-            debugger = Debugger(program, input_source)
-            debugger.run()
-        else:
-            runner = Runner(program, input_source, stdout, None)
-            runner.run()
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = (
+            Path(args.cache_dir)
+            if args.cache_dir is not None
+            else get_default_cache_dir()
+        )
+    program = load_program(Path(args.source), cache_dir)
+    with ExitStack() as exit_stack:
+        input_file = (
+            exit_stack.enter_context(Path(args.input).open("rb"))
+            if args.input is not None
+            else None
+        )
+        try:
+            if is_debug_mode:
+                input_source = __get_input_source(args, input_file, None)
+                breakpoints = [
+                    parse_breakpoint(spec, program) for spec in args.breakpoints or []
+                ]
+                debugger = Debugger(program, input_source, args.max_digits, breakpoints)
+                debugger.run()
+            else:
+                trace_file = (
+                    exit_stack.enter_context(Path(args.trace).open("wb"))
+                    if args.trace is not None
+                    else None
+                )
+                __run(args, program, input_file, trace_file)
+        except IntegerDigitLimitError as e:
+            stderr.write(f"{e}\n")
+            sys.exit(1)
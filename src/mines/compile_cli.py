@@ -0,0 +1,35 @@
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from pathlib import Path
+
+from mines.__version__ import __version__
+from mines.program.artifact import ARTIFACT_SUFFIX, write_artifact
+from mines.program.program_cache import compile_source
+
+
+@dataclass
+class Args:
+    source: str = ""
+    output: str | None = None
+
+
+def main() -> None:
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument("-V", "--version", action="version", version=__version__)
+    arg_parser.add_argument("source", type=str, help="source file path")
+    arg_parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        help=f"file path to output (source file path with {ARTIFACT_SUFFIX} suffix "
+        "by default)",
+    )
+    args = arg_parser.parse_args(namespace=Args())
+
+    source_path = Path(args.source)
+    output_path = (
+        Path(args.output)
+        if args.output is not None
+        else source_path.with_suffix(ARTIFACT_SUFFIX)
+    )
+    write_artifact(compile_source(source_path), output_path)
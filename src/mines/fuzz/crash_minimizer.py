@@ -0,0 +1,52 @@
+from collections.abc import Callable
+
+from mines.fuzz.fuzz_generator import FuzzProgram
+from mines.fuzz.fuzz_runner import FuzzCrash
+
+
+def __remove_chunks[T](
+    items: list[T],
+    min_len: int,
+    is_crashing: Callable[[list[T]], bool],
+) -> list[T]:
+    # Chunks are removed while the crash persists, halving the chunk length
+    # down to single items as in delta debugging.
+    chunk_len = max(len(items) // 2, 1)
+    while True:
+        index = 0
+        while index < len(items):
+            candidate = items[:index] + items[index + chunk_len :]
+            if len(candidate) >= min_len and is_crashing(candidate):
+                items = candidate
+            else:
+                index += chunk_len
+        if chunk_len == 1:
+            return items
+        chunk_len //= 2
+
+
+def minimize_crash(
+    fuzz_program: FuzzProgram,
+    crash: FuzzCrash,
+    find_crash: Callable[[FuzzProgram], FuzzCrash | None],
+) -> FuzzProgram:
+    def is_same_crash(candidate: FuzzProgram) -> bool:
+        candidate_crash = find_crash(candidate)
+        return candidate_crash is not None and (
+            candidate_crash.error_type,
+            candidate_crash.location,
+        ) == (crash.error_type, crash.location)
+
+    operation_lines = __remove_chunks(
+        fuzz_program.operation_lines,
+        1,
+        lambda lines: is_same_crash(fuzz_program._replace(operation_lines=lines)),
+    )
+    fuzz_program = fuzz_program._replace(operation_lines=operation_lines)
+
+    input_chars = __remove_chunks(
+        list(fuzz_program.input_str),
+        0,
+        lambda chars: is_same_crash(fuzz_program._replace(input_str="".join(chars))),
+    )
+    return fuzz_program._replace(input_str="".join(input_chars))
@@ -0,0 +1,114 @@
+from random import Random
+from typing import NamedTuple
+
+MAX_BOARD_WIDTH = 10
+MAX_BOARD_HEIGHT = 8
+MAX_OPERATION_COUNT = 48
+MAX_INPUT_TOKEN_COUNT = 16
+MAX_MINE_RATIO = 0.9
+
+# Probabilities of variations in a line or a token.
+IGNORED_CHARS_RATIO = 0.2
+COMMENT_RATIO = 0.1
+PLUS_SIGN_RATIO = 0.1
+COMMENT_HEADER_RATIO = 0.5
+INTEGER_TOKEN_RATIO = 0.5
+
+IGNORED_CHARS = (" ", "\t", "\v", "\f", "\r")
+INPUT_TOKENS = (" ", "\n", "\t", "-", "+", "0", "a", "\0", "あ", "\U0001f4a3")
+
+
+class FuzzProgram(NamedTuple):
+    # Header and board lines come before the operation lines.
+    board_lines: list[str]
+    operation_lines: list[str]
+    input_str: str
+
+    def get_source(self) -> str:
+        return "\n".join([*self.board_lines, *self.operation_lines])
+
+
+def __scatter_ignored_chars(random: Random, line: str) -> str:
+    if random.random() >= IGNORED_CHARS_RATIO:
+        return line
+    chars = list(line)
+    for _ in range(random.randint(1, 3)):
+        chars.insert(random.randint(0, len(chars)), random.choice(IGNORED_CHARS))
+    return "".join(chars)
+
+
+def __add_comment(random: Random, line: str) -> str:
+    if random.random() >= COMMENT_RATIO:
+        return line
+    return f"{line}# {random.choice(('.*', ',;', '!@', '#'))}"
+
+
+def __generate_index(random: Random, length: int) -> str:
+    match random.randrange(8):
+        case 0:
+            index = random.randrange(-3 * length, 0)
+        case 1:
+            index = random.randrange(length, 4 * length)
+        case 2:
+            index = random.choice((-1, 1)) * random.getrandbits(80)
+        case _:
+            index = random.randrange(length)
+    sign = "+" if index >= 0 and random.random() < PLUS_SIGN_RATIO else ""
+    return f"{sign}{index}"
+
+
+def __generate_board_lines(random: Random, width: int, height: int) -> list[str]:
+    lines = [
+        "# header" if random.random() < COMMENT_HEADER_RATIO else ""
+        for _ in range(random.randrange(3))
+    ]
+    mine_ratio = random.random() * MAX_MINE_RATIO
+    for _ in range(height):
+        row = "".join(
+            "*" if random.random() < mine_ratio else "." for _ in range(width)
+        )
+        lines.append(__add_comment(random, __scatter_ignored_chars(random, row)))
+    return lines
+
+
+def __generate_operation_line(random: Random, width: int, height: int) -> str:
+    match random.randrange(20):
+        case 0:
+            line = "!"
+        case 1:
+            line = "@"
+        case 2:
+            line = ""
+        case _:
+            separator = random.choice((",", ";"))
+            line = (
+                f"{__generate_index(random, width)}{separator}"
+                f"{__generate_index(random, height)}"
+            )
+    return __add_comment(random, __scatter_ignored_chars(random, line))
+
+
+def __generate_input_str(random: Random) -> str:
+    tokens: list[str] = []
+    for _ in range(random.randrange(MAX_INPUT_TOKEN_COUNT + 1)):
+        if random.random() < INTEGER_TOKEN_RATIO:
+            tokens.append(str(random.randrange(-1000, 1000)))
+        else:
+            tokens.append(random.choice(INPUT_TOKENS))
+    return "".join(tokens)
+
+
+def generate_fuzz_program(random: Random) -> FuzzProgram:
+    # Programs are always syntactically valid, while indices, comments and
+    # ignored characters vary, so that the runtime is exercised rather than
+    # the syntax check. Small boards make clicks hit the same cells often.
+    width = random.randint(1, MAX_BOARD_WIDTH)
+    height = random.randint(1, MAX_BOARD_HEIGHT)
+    return FuzzProgram(
+        __generate_board_lines(random, width, height),
+        [
+            __generate_operation_line(random, width, height)
+            for _ in range(random.randint(1, MAX_OPERATION_COUNT))
+        ],
+        __generate_input_str(random),
+    )
@@ -0,0 +1,139 @@
+import traceback
+from io import BytesIO, StringIO
+from itertools import product
+from pathlib import Path
+from random import Random
+from time import perf_counter
+from typing import NamedTuple, get_args
+
+from mines.fuzz.fuzz_generator import FuzzProgram, generate_fuzz_program
+from mines.player.board import CELL_DIGIT_MINE, CellDigit, CellState
+from mines.program.parser import parse
+from mines.runtime.runner import Runner, StepResult
+from mines.view.chunked_input_source import DEFAULT_CHUNK_SIZE, ChunkedInputSource
+from mines.view.player_view import PlayerView
+from mines.view.step_result_view import StepResultView
+from mines.view.text_output_sink import TextOutputSink
+
+# The cell state before a click, whether it was a left click, and the digit.
+ClickCombination = tuple[CellState, bool, CellDigit]
+# Only reachable combinations are counted. A mine is never opened, since
+# opening it makes the game over instead.
+CLICK_COMBINATIONS: tuple[ClickCombination, ...] = tuple(
+    (cell_state, is_left_click, digit)
+    for cell_state, is_left_click, digit in product(
+        get_args(CellState),
+        (True, False),
+        get_args(CellDigit),
+    )
+    if not (cell_state == "opened" and digit == CELL_DIGIT_MINE)
+)
+
+
+class FuzzCrash(NamedTuple):
+    error_type: str
+    # The file name and line number where the error was raised.
+    location: str
+    traceback: str
+
+
+class FuzzCaseResult(NamedTuple):
+    seed: int
+    step_count: int
+    is_timed_out: bool
+    click_combinations: frozenset[ClickCombination]
+    crash: FuzzCrash | None
+
+
+class FuzzRun(NamedTuple):
+    step_count: int
+    is_timed_out: bool
+    click_combinations: frozenset[ClickCombination]
+
+
+def run_fuzz_program(
+    fuzz_program: FuzzProgram,
+    max_step_count: int,
+    time_limit: float,
+) -> FuzzRun:
+    # Steps are run one by one to check the time limit, since a few steps on
+    # huge integers can take longer than all the others.
+    program = parse(fuzz_program.get_source())
+    input_source = ChunkedInputSource(
+        BytesIO(fuzz_program.input_str.encode()),
+        DEFAULT_CHUNK_SIZE,
+        None,
+        prefetches=False,
+    )
+    click_combinations: set[ClickCombination] = set()
+
+    def check_step(step_result: StepResult) -> None:
+        player = runner.get_runtime_state().player
+        step_result_view = StepResultView(player, step_result)
+        step_result_view.get_operation_str()
+        step_result_view.get_command_str()
+        PlayerView(player).get_click_result_str()
+
+        click_result = player.get_last_click_result()
+        if click_result is not None:
+            click_combinations.add(
+                (
+                    click_result.previous_cell_state,
+                    click_result.is_left_click,
+                    player.get_cell_digit(click_result.clicked_cell),
+                ),
+            )
+
+    with StringIO() as output_io:
+        runner = Runner(program, input_source, TextOutputSink(output_io), check_step, 0)
+        deadline = perf_counter() + time_limit
+        step_count = 0
+        is_timed_out = False
+        while step_count < max_step_count and runner.run_steps(1) > 0:
+            step_count += 1
+            if perf_counter() > deadline:
+                is_timed_out = True
+                break
+    return FuzzRun(step_count, is_timed_out, frozenset(click_combinations))
+
+
+def __get_crash(error: Exception) -> FuzzCrash:
+    frame = traceback.extract_tb(error.__traceback__)[-1]
+    return FuzzCrash(
+        type(error).__name__,
+        f"{Path(frame.filename).name}:{frame.lineno}",
+        "".join(traceback.format_exception(error)),
+    )
+
+
+def find_crash(
+    fuzz_program: FuzzProgram,
+    max_step_count: int,
+    time_limit: float,
+) -> FuzzCrash | None:
+    try:
+        run_fuzz_program(fuzz_program, max_step_count, time_limit)
+    except Exception as e:  # noqa: BLE001
+        return __get_crash(e)
+    return None
+
+
+def run_fuzz_case(seed: int, max_step_count: int, time_limit: float) -> FuzzCaseResult:
+    fuzz_program = generate_fuzz_program(Random(seed))  # noqa: S311
+    try:
+        fuzz_run = run_fuzz_program(fuzz_program, max_step_count, time_limit)
+    except Exception as e:  # noqa: BLE001
+        return FuzzCaseResult(
+            seed,
+            0,
+            is_timed_out=False,
+            click_combinations=frozenset(),
+            crash=__get_crash(e),
+        )
+    return FuzzCaseResult(
+        seed,
+        fuzz_run.step_count,
+        is_timed_out=fuzz_run.is_timed_out,
+        click_combinations=fuzz_run.click_combinations,
+        crash=None,
+    )
@@ -0,0 +1,172 @@
+from collections.abc import Callable, Iterable, Iterator
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
+from time import perf_counter
+from typing import NamedTuple, cast
+
+from mines.fuzz.fuzz_runner import FuzzCaseResult, FuzzCrash, run_fuzz_case
+
+# Added to the time limit of a program for the parse and the round trip.
+HARD_TIME_LIMIT_MARGIN = 1.0
+
+
+def get_hard_time_limit(time_limit: float) -> float:
+    return time_limit + HARD_TIME_LIMIT_MARGIN
+
+
+def serve_fuzz_tasks(connection: Connection) -> None:
+    while (task := connection.recv()) is not None:
+        function, args = task
+        connection.send(function(*args))
+
+
+class FuzzWorker:
+    # Tasks run in a child process, which is killed and replaced once a task
+    # runs past the hard time limit, since a single step on huge integers can
+    # neither be interrupted nor bounded by the time limit checked between
+    # steps.
+    __process: Process
+    __connection: Connection
+
+    def __init__(self) -> None:
+        self.__start_process()
+
+    def __start_process(self) -> None:
+        self.__connection, child_connection = Pipe()
+        self.__process = Process(
+            target=serve_fuzz_tasks,
+            args=(child_connection,),
+            daemon=True,
+        )
+        self.__process.start()
+        child_connection.close()
+
+    def get_connection(self) -> Connection:
+        return self.__connection
+
+    def submit[*Ts](self, function: Callable[[*Ts], object], args: tuple[*Ts]) -> None:
+        self.__connection.send((function, args))
+
+    def receive(self) -> object:
+        # Raises EOFError if the process has exited.
+        return self.__connection.recv()
+
+    def terminate(self) -> int | None:
+        # Returns the exit code of the process.
+        self.__process.kill()
+        self.__process.join()
+        self.__connection.close()
+        return self.__process.exitcode
+
+    def restart(self) -> int | None:
+        exit_code = self.terminate()
+        self.__start_process()
+        return exit_code
+
+    def call[*Ts, T](
+        self,
+        function: Callable[[*Ts], T],
+        args: tuple[*Ts],
+        hard_time_limit: float,
+        default: T,
+    ) -> T:
+        # Returns the default if the task runs past the hard time limit or
+        # the process exits.
+        self.submit(function, args)
+        try:
+            if self.__connection.poll(hard_time_limit):
+                return cast("T", self.receive())
+        except EOFError:
+            pass
+        self.restart()
+        return default
+
+    def close(self) -> None:
+        self.__connection.send(None)
+        self.__process.join()
+        self.__connection.close()
+
+
+class RunningFuzzCase(NamedTuple):
+    seed: int
+    deadline: float
+
+
+def __get_timed_out_result(seed: int) -> FuzzCaseResult:
+    return FuzzCaseResult(
+        seed,
+        0,
+        is_timed_out=True,
+        click_combinations=frozenset(),
+        crash=None,
+    )
+
+
+def __get_exited_result(seed: int, exit_code: int | None) -> FuzzCaseResult:
+    return FuzzCaseResult(
+        seed,
+        0,
+        is_timed_out=False,
+        click_combinations=frozenset(),
+        crash=FuzzCrash("WorkerExit", f"exit code {exit_code}", ""),
+    )
+
+
+def __receive_result(worker: FuzzWorker, seed: int) -> FuzzCaseResult:
+    try:
+        return cast("FuzzCaseResult", worker.receive())
+    except EOFError:
+        return __get_exited_result(seed, worker.restart())
+
+
+def run_fuzz_cases(
+    seeds: Iterable[int],
+    worker_count: int,
+    max_step_count: int,
+    time_limit: float,
+) -> Iterator[FuzzCaseResult]:
+    # Results are yielded as they complete. A case killed at the hard time
+    # limit counts as timed out.
+    hard_time_limit = get_hard_time_limit(time_limit)
+    seed_iter = iter(seeds)
+    workers = [FuzzWorker() for _ in range(worker_count)]
+    idle_workers = list(workers)
+    running_cases: dict[FuzzWorker, RunningFuzzCase] = {}
+    try:
+        while True:
+            while len(idle_workers) > 0 and (seed := next(seed_iter, None)) is not None:
+                worker = idle_workers.pop()
+                worker.submit(run_fuzz_case, (seed, max_step_count, time_limit))
+                running_cases[worker] = RunningFuzzCase(
+                    seed,
+                    perf_counter() + hard_time_limit,
+                )
+            if len(running_cases) == 0:
+                return
+
+            workers_by_connection = {
+                worker.get_connection(): worker for worker in running_cases
+            }
+            next_deadline = min(case.deadline for case in running_cases.values())
+            for connection in wait(
+                list(workers_by_connection),
+                max(next_deadline - perf_counter(), 0),
+            ):
+                worker = workers_by_connection[connection]
+                seed = running_cases.pop(worker).seed
+                idle_workers.append(worker)
+                yield __receive_result(worker, seed)
+
+            now = perf_counter()
+            for worker, case in list(running_cases.items()):
+                if case.deadline <= now:
+                    worker.restart()
+                    del running_cases[worker]
+                    idle_workers.append(worker)
+                    yield __get_timed_out_result(case.seed)
+    finally:
+        for worker in workers:
+            if worker in running_cases:
+                worker.terminate()
+            else:
+                worker.close()
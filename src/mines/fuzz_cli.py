@@ -0,0 +1,179 @@
+import sys
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from os import process_cpu_count
+from pathlib import Path
+from random import Random
+from sys import stdout
+from time import perf_counter
+
+from mines.__version__ import __version__
+from mines.fuzz.crash_minimizer import minimize_crash
+from mines.fuzz.fuzz_generator import FuzzProgram, generate_fuzz_program
+from mines.fuzz.fuzz_runner import (
+    CLICK_COMBINATIONS,
+    ClickCombination,
+    FuzzCaseResult,
+    FuzzCrash,
+    find_crash,
+)
+from mines.fuzz.fuzz_worker import FuzzWorker, get_hard_time_limit, run_fuzz_cases
+
+
+@dataclass
+class Args:
+    count: int = 1000
+    seed: int = 0
+    jobs: int | None = None
+    max_steps: int = 2000
+    time_limit: float = 1.0
+    output_dir: str = "fuzz-crashes"
+
+
+def __write_reproducer(
+    output_dir: Path,
+    seed: int,
+    fuzz_program: FuzzProgram,
+    crash: FuzzCrash,
+) -> Path:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    source_path = output_dir / f"crash-{seed}.mines"
+    header = f"# {crash.error_type} at {crash.location} (seed {seed})\n"
+    source_path.write_text(header + fuzz_program.get_source())
+    source_path.with_suffix(".input").write_text(fuzz_program.input_str)
+    source_path.with_suffix(".txt").write_text(crash.traceback)
+    return source_path
+
+
+def __get_click_combination_str(click_combination: ClickCombination) -> str:
+    cell_state, is_left_click, digit = click_combination
+    return f"{'left' if is_left_click else 'right'} click on {cell_state} {digit}"
+
+
+def __report_crash(
+    args: Args,
+    result: FuzzCaseResult,
+    crash: FuzzCrash,
+    worker: FuzzWorker,
+) -> None:
+    stdout.write(f"seed {result.seed}: {crash.error_type} at {crash.location}\n")
+    stdout.flush()
+    hard_time_limit = get_hard_time_limit(args.time_limit)
+    fuzz_program = minimize_crash(
+        generate_fuzz_program(Random(result.seed)),  # noqa: S311
+        crash,
+        lambda candidate: worker.call(
+            find_crash,
+            (candidate, args.max_steps, args.time_limit),
+            hard_time_limit,
+            None,
+        ),
+    )
+    source_path = __write_reproducer(
+        Path(args.output_dir),
+        result.seed,
+        fuzz_program,
+        crash,
+    )
+    stdout.write(
+        f"  minimized to {len(fuzz_program.operation_lines)} operations: "
+        f"{source_path}\n",
+    )
+
+
+def __report_coverage(click_combinations: set[ClickCombination]) -> None:
+    stdout.write(
+        f"click combinations: {len(click_combinations)}/{len(CLICK_COMBINATIONS)}\n",
+    )
+    for click_combination in CLICK_COMBINATIONS:
+        if click_combination not in click_combinations:
+            stdout.write(
+                f"  not covered: {__get_click_combination_str(click_combination)}\n",
+            )
+
+
+def main() -> None:
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument("-V", "--version", action="version", version=__version__)
+    arg_parser.add_argument(
+        "-n",
+        "--count",
+        type=int,
+        default=1000,
+        help="number of programs to run (default: 1000)",
+    )
+    arg_parser.add_argument(
+        "-s",
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the first program (default: 0)",
+    )
+    arg_parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help=f"number of worker processes (default: {process_cpu_count()})",
+    )
+    arg_parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=2000,
+        help="max steps of each program (default: 2000)",
+    )
+    arg_parser.add_argument(
+        "--time-limit",
+        type=float,
+        default=1.0,
+        help="max seconds of each program (default: 1.0)",
+    )
+    arg_parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=str,
+        default="fuzz-crashes",
+        help="directory to save reproducers of crashes (default: fuzz-crashes)",
+    )
+    args = arg_parser.parse_args(namespace=Args())
+
+    begin = perf_counter()
+    step_count = 0
+    timed_out_count = 0
+    click_combinations: set[ClickCombination] = set()
+    crash_signatures: set[tuple[str, str]] = set()
+    crash_count = 0
+    # Crashes are minimized in a separate worker, since candidates can hang.
+    minimizer_worker = FuzzWorker()
+    try:
+        for result in run_fuzz_cases(
+            range(args.seed, args.seed + args.count),
+            args.jobs or process_cpu_count() or 1,
+            args.max_steps,
+            args.time_limit,
+        ):
+            step_count += result.step_count
+            timed_out_count += result.is_timed_out
+            click_combinations |= result.click_combinations
+            crash = result.crash
+            if crash is None:
+                continue
+            crash_count += 1
+            # Only the first crash of each signature is minimized and saved.
+            if (crash.error_type, crash.location) not in crash_signatures:
+                crash_signatures.add((crash.error_type, crash.location))
+                __report_crash(args, result, crash, minimizer_worker)
+    finally:
+        minimizer_worker.close()
+    seconds = perf_counter() - begin
+
+    stdout.write(
+        f"{args.count} programs in {seconds:.2f} s"
+        f" ({args.count / seconds:.1f} programs/s,"
+        f" {step_count / seconds:.0f} steps/s)\n",
+    )
+    stdout.write(f"timed out: {timed_out_count}\n")
+    stdout.write(f"crashes: {crash_count} ({len(crash_signatures)} unique)\n")
+    __report_coverage(click_combinations)
+
+    if crash_count > 0:
+        sys.exit(1)
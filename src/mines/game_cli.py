@@ -7,7 +7,7 @@ from typing import Literal, NamedTuple
 from mines.__version__ import __version__
 from mines.player.board import BoardSize
 from mines.presenter.game import Game
-from mines.program.parser import parse
+from mines.program.program_cache import load_program
 
 LevelName = Literal["beginner", "intermediate", "expert"]
 LEVEL_NAMES: tuple[LevelName, ...] = ("beginner", "intermediate", "expert")
@@ -36,6 +36,7 @@ class Args:
     source: str | None = None
     level: str | None = None
     custom: list[int] | None = None
+    seed: int | None = None
 
 
 def __validate_level_config(level_config: LevelConfig) -> None:
@@ -77,6 +78,12 @@ def main() -> None:
         type=int,
         help="custom (width, height, mine number) for game level",
     )
+    arg_parser.add_argument(
+        "-r",
+        "--seed",
+        type=int,
+        help="random seed for mine placement",
+    )
     args = arg_parser.parse_args(namespace=Args())
 
     if not stdin.isatty():
@@ -86,10 +93,8 @@ def main() -> None:
 
     if args.source:
         path = Path(args.source)
-        with path.open(encoding="utf-8") as f:
-            code = f.read()
-        cell_digits = parse(code).cell_digits
-        game = Game(path.name, cell_digits.get_board_size(), cell_digits)
+        cell_digits = load_program(path, None).cell_digits
+        game = Game(path.name, cell_digits.get_board_size(), cell_digits, None)
     else:
         if args.level:
             if args.level in LEVEL_NAMES:
@@ -119,6 +124,7 @@ def main() -> None:
             level_name,
             BoardSize(width=level_config.width, height=level_config.height),
             level_config.mine_number,
+            args.seed,
         )
 
     game.run()
@@ -0,0 +1,14 @@
+from argparse import ArgumentParser
+from sys import stdin, stdout
+
+from mines.__version__ import __version__
+from mines.presenter.language_server import LanguageServer
+
+
+def main() -> None:
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument("-V", "--version", action="version", version=__version__)
+    arg_parser.parse_args()
+
+    language_server = LanguageServer(stdin.buffer, stdout.buffer)
+    language_server.run()
@@ -1,5 +1,5 @@
-from collections.abc import Callable, Iterable
-from typing import Literal, NamedTuple, TypeIs
+from collections.abc import Callable, Iterable, Sequence
+from typing import Literal, NamedTuple, Self, TypeIs, cast
 
 
 class Cell(NamedTuple):
@@ -58,6 +58,13 @@ class BoardValues[T]:
             for row_index in range(board_size.height)
         ]
 
+    @classmethod
+    def from_rows(cls, board_size: BoardSize, rows: list[list[T]]) -> Self:
+        board_values = cls.__new__(cls)
+        board_values.__board_size = board_size  # noqa: SLF001
+        board_values.__values = rows  # noqa: SLF001
+        return board_values
+
     def get_board_size(self) -> BoardSize:
         return self.__board_size
 
@@ -67,11 +74,24 @@ class BoardValues[T]:
     def set(self, cell: Cell, value: T) -> None:
         self.__values[cell.row_index][cell.column_index] = value
 
+    def get_row(self, row_index: int) -> list[T]:
+        return self.__values[row_index]
+
+    def fill(self, value: T) -> None:
+        for row in self.__values:
+            row[:] = [value] * len(row)
+
+    def count(self, value: T) -> int:
+        return sum(row.count(value) for row in self.__values)
+
     def iterate_values(self) -> Iterable[T]:
         for row_index in range(self.__board_size.height):
             for column_index in range(self.__board_size.width):
                 yield self.__values[row_index][column_index]
 
+    def iterate_rows(self) -> Iterable[list[T]]:
+        yield from self.__values
+
     def draw(self, sep: str = "", end: str = "\n") -> str:
         return end.join(
             [
@@ -95,3 +115,37 @@ CELL_DIGIT_MINE = 9
 
 def is_cell_digit(value: int) -> TypeIs[CellDigit]:
     return 0 <= value <= CELL_DIGIT_MINE
+
+
+# Every byte of a packed row holds one cell, so a 3x3 sum (at most 9) never
+# carries into its neighbor. Mine cells get 16 added and are mapped to 9.
+_MINE_FLAG_SHIFT = 4
+_PACKED_DIGIT_TABLE = bytes(range(1 << _MINE_FLAG_SHIFT)) + bytes(
+    [CELL_DIGIT_MINE] * (256 - (1 << _MINE_FLAG_SHIFT)),
+)
+
+
+def count_cell_digits(
+    board_size: BoardSize,
+    mine_rows: Sequence[bytes],
+) -> BoardValues[CellDigit]:
+    width = board_size.width
+    row_mask = (1 << (8 * width)) - 1
+
+    packed_mine_rows = [int.from_bytes(mine_row) for mine_row in mine_rows]
+    horizontal_sums = [
+        ((packed << 8) & row_mask) + packed + (packed >> 8)
+        for packed in packed_mine_rows
+    ]
+
+    rows: list[list[CellDigit]] = []
+    for row_index, packed in enumerate(packed_mine_rows):
+        packed_sum = horizontal_sums[row_index] + (packed << _MINE_FLAG_SHIFT)
+        if row_index > 0:
+            packed_sum += horizontal_sums[row_index - 1]
+        if row_index + 1 < board_size.height:
+            packed_sum += horizontal_sums[row_index + 1]
+        digit_bytes = packed_sum.to_bytes(width).translate(_PACKED_DIGIT_TABLE)
+        rows.append(cast("list[CellDigit]", list(digit_bytes)))
+
+    return BoardValues.from_rows(board_size, rows)
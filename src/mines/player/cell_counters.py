@@ -0,0 +1,43 @@
+from array import array
+from typing import Literal, get_args
+
+from mines.player.board import BoardSize, Cell
+
+CellCounterKind = Literal["click", "chord", "flag", "open"]
+CELL_COUNTER_KINDS: tuple[CellCounterKind, ...] = get_args(CellCounterKind)
+
+
+class CellCounters:
+    # Each kind of event has its own packed array indexed by
+    # `row_index * width + column_index`.
+    __board_size: BoardSize
+    __counts: dict[CellCounterKind, array[int]]
+
+    def __init__(self, board_size: BoardSize) -> None:
+        self.__board_size = board_size
+        cell_count = board_size.width * board_size.height
+        self.__counts = {
+            kind: array("Q", [0]) * cell_count for kind in CELL_COUNTER_KINDS
+        }
+
+    def get_board_size(self) -> BoardSize:
+        return self.__board_size
+
+    def get_cell_id(self, cell: Cell) -> int:
+        return cell.row_index * self.__board_size.width + cell.column_index
+
+    def increment(self, kind: CellCounterKind, cell: Cell) -> None:
+        self.__counts[kind][
+            cell.row_index * self.__board_size.width + cell.column_index
+        ] += 1
+
+    def get_counts(self, kind: CellCounterKind) -> array[int]:
+        return self.__counts[kind]
+
+    def get_rows(self, kind: CellCounterKind) -> list[list[int]]:
+        width = self.__board_size.width
+        counts = self.__counts[kind]
+        return [
+            counts[begin : begin + width].tolist()
+            for begin in range(0, len(counts), width)
+        ]
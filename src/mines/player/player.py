@@ -1,5 +1,6 @@
 from collections import deque
 from collections.abc import Iterable
+from typing import NamedTuple
 
 from mines.player.board import (
     CELL_DIGIT_MINE,
@@ -8,6 +9,7 @@ from mines.player.board import (
     Cell,
     CellDigit,
 )
+from mines.player.cell_counters import CellCounters
 from mines.player.operation import (
     ClickOperation,
     ClickResult,
@@ -17,7 +19,15 @@ from mines.player.operation import (
     RestartOperation,
     SwitchOperation,
 )
-from mines.player.player_state import PlayerState
+from mines.player.player_state import GameStatus, PlayerState
+
+
+class PlayerSnapshot(NamedTuple):
+    game_status: GameStatus
+    flagging_mode: bool
+    opened_cells: tuple[Cell, ...]
+    flagged_cells: tuple[Cell, ...]
+    last_click_result: ClickResult | None
 
 
 class Player:
@@ -28,7 +38,9 @@ class Player:
     __player_state: PlayerState
     __rest_mine_count: int
     __rest_safe_count: int
+    __opened_cells: list[Cell]
     __last_click_result: ClickResult | None
+    __cell_counters: CellCounters | None
 
     def __init__(
         self,
@@ -36,7 +48,7 @@ class Player:
     ) -> None:
         self.__board_size = cell_digits.get_board_size()
         self.__cell_digits = cell_digits
-        self.__mine_number = list(cell_digits.iterate_values()).count(9)
+        self.__mine_number = cell_digits.count(CELL_DIGIT_MINE)
 
         self.__player_state = PlayerState(
             game_status="playing",
@@ -45,7 +57,9 @@ class Player:
         )
         self.__rest_mine_count = self.__mine_number
         self.__rest_safe_count = self.get_initial_safe_count()
+        self.__opened_cells = []
         self.__last_click_result = None
+        self.__cell_counters = None
 
     def __open_safe_cells(self, cells: Iterable[Cell]) -> list[Cell]:
         opened_cells: list[Cell] = []
@@ -60,6 +74,9 @@ class Player:
             self.__player_state.cell_states.set(cell, "opened")
             self.__rest_safe_count -= 1
             opened_cells.append(cell)
+            self.__opened_cells.append(cell)
+            if self.__cell_counters is not None:
+                self.__cell_counters.increment("open", cell)
 
             if self.__cell_digits.get(cell) == 0:
                 for next_cell in self.__board_size.iterate_adjacent_cells(cell):
@@ -126,6 +143,19 @@ class Player:
             clicked_cell=cell,
             open_result=open_result,
         )
+        if self.__cell_counters is not None:
+            self.__count_click(self.__cell_counters, self.__last_click_result)
+
+    @staticmethod
+    def __count_click(cell_counters: CellCounters, click_result: ClickResult) -> None:
+        cell = click_result.clicked_cell
+        cell_counters.increment("click", cell)
+        if click_result.is_left_click:
+            return
+        if click_result.previous_cell_state != "opened":
+            cell_counters.increment("flag", cell)
+        elif click_result.open_result is not None:
+            cell_counters.increment("chord", cell)
 
     def __perform_switch(self) -> None:
         self.__player_state.flagging_mode ^= True
@@ -135,6 +165,7 @@ class Player:
             self.__player_state.cell_states.set(cell, "unopened")
         self.__rest_mine_count = self.__mine_number
         self.__rest_safe_count = self.get_initial_safe_count()
+        self.__opened_cells.clear()
         self.__player_state.game_status = "playing"
 
     def perform_operation(self, operation: Operation) -> None:
@@ -150,6 +181,12 @@ class Player:
             case NoOperation():
                 pass
 
+    def set_cell_counters(self, cell_counters: CellCounters | None) -> None:
+        self.__cell_counters = cell_counters
+
+    def get_cell_counters(self) -> CellCounters | None:
+        return self.__cell_counters
+
     def get_board_size(self) -> BoardSize:
         return self.__board_size
 
@@ -185,14 +222,49 @@ class Player:
         if cell_digits.get_board_size() != self.__board_size:
             return False
 
-        if list(cell_digits.iterate_values()).count(9) != self.__mine_number:
+        if cell_digits.count(CELL_DIGIT_MINE) != self.__mine_number:
             return False
 
-        for cell in self.__board_size.iterate_board_cells():
-            if self.__player_state.cell_states.get(cell) != "opened":
-                continue
+        for cell in self.__opened_cells:
             if cell_digits.get(cell) != self.__cell_digits.get(cell):
                 return False
 
         self.__cell_digits = cell_digits
         return True
+
+    def get_snapshot(self) -> PlayerSnapshot:
+        # Cell states are kept as the opened and flagged cells, which are
+        # usually far fewer than the cells of the board.
+        player_state = self.__player_state
+        flagged_cells = tuple(
+            Cell(column_index=column_index, row_index=row_index)
+            for row_index, row in enumerate(player_state.cell_states.iterate_rows())
+            if "flagged" in row
+            for column_index, cell_state in enumerate(row)
+            if cell_state == "flagged"
+        )
+        return PlayerSnapshot(
+            game_status=player_state.game_status,
+            flagging_mode=player_state.flagging_mode,
+            opened_cells=tuple(self.__opened_cells),
+            flagged_cells=flagged_cells,
+            last_click_result=self.__last_click_result,
+        )
+
+    def restore_snapshot(self, snapshot: PlayerSnapshot) -> None:
+        player_state = self.__player_state
+        cell_states = player_state.cell_states
+        cell_states.fill("unopened")
+        for cell in snapshot.opened_cells:
+            cell_states.set(cell, "opened")
+        for cell in snapshot.flagged_cells:
+            cell_states.set(cell, "flagged")
+
+        player_state.game_status = snapshot.game_status
+        player_state.flagging_mode = snapshot.flagging_mode
+        self.__opened_cells = list(snapshot.opened_cells)
+        self.__rest_safe_count = self.get_initial_safe_count() - len(
+            snapshot.opened_cells,
+        )
+        self.__rest_mine_count = self.__mine_number - len(snapshot.flagged_cells)
+        self.__last_click_result = snapshot.last_click_result
@@ -1,48 +1,181 @@
 import sys
-from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from sys import stderr, stdin
+from time import perf_counter
+from typing import NamedTuple
 
 from mines.program.program import Program
+from mines.runtime.breakpoint import (
+    Breakpoint,
+    BreakpointError,
+    StepBreaker,
+    compile_breakpoints,
+    parse_breakpoint,
+)
+from mines.runtime.checkpoint_store import CheckpointStore
 from mines.runtime.command_type import CommandType
 from mines.runtime.input_buffer import InputSource
 from mines.runtime.runner import Runner, StepResult
+from mines.runtime.runtime_handoff import HandoffResult, RuntimeHandoff
+from mines.runtime.runtime_snapshot import (
+    RuntimeSnapshot,
+    restore_runtime_snapshot,
+    take_runtime_snapshot,
+)
 from mines.view.ansi import Ansi, em
+from mines.view.board_renderer import BoardRenderer
+from mines.view.board_viewport import BoardViewport, get_viewport_size
 from mines.view.cli_frame_drawer import CliFrameDrawer
+from mines.view.getch import wait_key
 from mines.view.input_view import InputView
-from mines.view.output_view import OutputView
+from mines.view.interactive_input_source import InteractiveInputSource
+from mines.view.output_view import (
+    OUTPUT_VIEW_MAX_LEN,
+    OUTPUT_VIEW_MAX_LF,
+    OutputView,
+)
 from mines.view.player_view import PlayerView
 from mines.view.prompt import Prompt
+from mines.view.rewindable_input_source import RewindableInputSource
 from mines.view.step_result_view import StepResultView
+from mines.view.tail_output_sink import TailOutputSink, TailOutputSnapshot
+
+# Lines of a frame other than the board, with the input and output at most.
+DEBUGGER_RESERVED_LINE_COUNT = 23
+
+# Steps run in live mode between chances for the view to take the state.
+LIVE_BATCH_STEP_COUNT = 1024
+
+# Seconds between frames in live mode.
+LIVE_FRAME_INTERVAL = 1 / 20
+
+
+class DebuggerCheckpoint(NamedTuple):
+    runtime_snapshot: RuntimeSnapshot
+    input_consumed_len: int
+    output_snapshot: TailOutputSnapshot
+    last_command_name: CommandType
 
 
 class Debugger:
     __operation_count: int
     __last_command_name: CommandType
-    __last_stack_str: str
     __last_step_count: int
-    __rest_skip_count: int
+    __step_count_to_draw: int
+    __step_count_to_go_back: int
+    __input_source: RewindableInputSource
     __input_view: InputView
-    __output_io: StringIO
+    __output_sink: TailOutputSink
     __output_view: OutputView
+    __checkpoint_store: CheckpointStore[DebuggerCheckpoint]
+    __program: Program
+    __breakpoints: list[Breakpoint]
+    __hit_breakpoint: Breakpoint | None
+    __breakpoint_error: BreakpointError | None
+    __is_replaying: bool
+    __is_live: bool
+    __runtime_handoff: RuntimeHandoff | None
+    __live_cleared_step_result: StepResult | None
+    __board_viewport: BoardViewport
+    __board_renderer: BoardRenderer
+    __cli_frame_drawer: CliFrameDrawer
+    __is_redraw_requested: bool
 
     __runner: Runner
 
-    def __init__(self, program: Program, input_source: InputSource) -> None:
+    def __init__(
+        self,
+        program: Program,
+        input_source: InputSource,
+        max_integer_digits: int,
+        breakpoints: list[Breakpoint],
+    ) -> None:
         self.__operation_count = 0
         self.__last_command_name = "noop"
-        self.__last_stack_str = "--"
         self.__last_step_count = 100
-        self.__rest_skip_count = 0
-        self.__input_view = InputView(input_source)
-        self.__output_io = StringIO()
-        self.__output_view = OutputView(self.__output_io)
+        self.__step_count_to_draw = 1
+        self.__step_count_to_go_back = 0
+        self.__input_source = RewindableInputSource(
+            input_source,
+            self.__before_read
+            if isinstance(input_source, InteractiveInputSource)
+            else None,
+        )
+        self.__input_view = InputView(self.__input_source)
+        self.__output_sink = TailOutputSink(OUTPUT_VIEW_MAX_LEN, OUTPUT_VIEW_MAX_LF)
+        self.__output_view = OutputView(self.__output_sink)
+        self.__checkpoint_store = CheckpointStore()
+        self.__program = program
+        self.__breakpoints = breakpoints
+        self.__hit_breakpoint = None
+        self.__breakpoint_error = None
+        self.__is_replaying = False
+        self.__is_live = False
+        self.__runtime_handoff = None
+        self.__live_cleared_step_result = None
 
-        self.__runner = Runner(program, input_source, self.__output_io, self.__step)
+        self.__runner = Runner(
+            program,
+            self.__input_source,
+            self.__output_sink,
+            None,
+            max_integer_digits,
+        )
+        player = self.__runner.get_runtime_state().player
+        self.__board_viewport = BoardViewport(player.get_board_size())
+        self.__board_renderer = BoardRenderer(player)
+        self.__cli_frame_drawer = CliFrameDrawer(stderr)
+        self.__is_redraw_requested = False
+        self.__take_checkpoint(self.__last_command_name)
 
-    def __del__(self) -> None:
-        self.__output_io.close()
+    def __get_breakpoints_str(self) -> str:
+        return ", ".join(
+            em(str(breakpoint_))
+            if breakpoint_ is self.__hit_breakpoint
+            else str(breakpoint_)
+            for breakpoint_ in self.__breakpoints
+        )
 
-    def __draw(self, step_result: StepResult) -> None:
+    def __add_board_lines(self, player_view: PlayerView) -> None:
+        player = self.__runner.get_runtime_state().player
+        board_viewport = self.__board_viewport
+        board_viewport.resize(
+            get_viewport_size(
+                stderr,
+                DEBUGGER_RESERVED_LINE_COUNT,
+                player.get_board_size(),
+            ),
+        )
+        click_result = player.get_last_click_result()
+        if click_result is not None:
+            board_viewport.focus(click_result.clicked_cell)
+        self.__board_renderer.update(None, board_viewport.get_window())
+
+        cli_frame_drawer = self.__cli_frame_drawer
+        cli_frame_drawer.add_line(player_view.get_board_info_str(), "board")
+        cli_frame_drawer.add_line("")
+        cli_frame_drawer.add_board(self.__board_renderer)
+        if board_viewport.is_scrollable():
+            cli_frame_drawer.add_line(board_viewport.get_summary_str(), "view")
+        cli_frame_drawer.add_line("")
+        if self.__breakpoint_error is not None:
+            cli_frame_drawer.add_line(
+                str(Ansi(str(self.__breakpoint_error), fg=1)),
+                "break",
+            )
+        elif len(self.__breakpoints) > 0:
+            cli_frame_drawer.add_line(self.__get_breakpoints_str(), "break")
+
+    def __add_io_lines(self) -> None:
+        cli_frame_drawer = self.__cli_frame_drawer
+        cli_frame_drawer.add_line("", "input")
+        cli_frame_drawer.add_line(self.__input_view.get_str())
+        cli_frame_drawer.add_line("", "output")
+        cli_frame_drawer.add_line(self.__output_view.get_str())
+        cli_frame_drawer.add_line("")
+
+    def __draw(self, step_result: StepResult, stack_before_str: str) -> None:
         runtime_state = self.__runner.get_runtime_state()
 
         player_view = PlayerView(runtime_state.player)
@@ -63,74 +196,319 @@ class Debugger:
         if self.__last_command_name in commands_to_show_last:
             operation_descriptions.append(f"by {em(self.__last_command_name)}")
 
-        stack_before_str = str(Ansi(self.__last_stack_str, faint=True))
-
-        cli_frame_drawer = CliFrameDrawer()
-
-        cli_frame_drawer.add_line(player_view.get_board_info_str(), "board")
-        cli_frame_drawer.add_line("")
-        cli_frame_drawer.add_line(player_view.get_board_str())
-        cli_frame_drawer.add_line("")
+        self.__add_board_lines(player_view)
+        cli_frame_drawer = self.__cli_frame_drawer
         cli_frame_drawer.add_line(" ".join(operation_descriptions), "operation")
         cli_frame_drawer.add_line(player_view.get_click_result_str(), "click result")
         cli_frame_drawer.add_line(step_result_view.get_command_str(), "command")
-        cli_frame_drawer.add_line(stack_before_str, "stack before")
+        cli_frame_drawer.add_line(
+            str(Ansi(stack_before_str, faint=True)),
+            "stack before",
+        )
         cli_frame_drawer.add_line(str(runtime_state.stack), "stack after ")
-        cli_frame_drawer.add_line("", "input")
-        cli_frame_drawer.add_line(self.__input_view.get_str())
-        cli_frame_drawer.add_line("", "output")
-        cli_frame_drawer.add_line(self.__output_view.get_str())
-        cli_frame_drawer.add_line("")
+        self.__add_io_lines()
 
         cli_frame_drawer.draw_frame()
 
-    def __prompt_step_count(self) -> None:
-        message = str(Ansi("enter the step count >>> ", fg=5, bold=True))
+    def __draw_live(self, steps_per_second: float) -> None:
+        runtime_state = self.__runner.get_runtime_state()
+
+        self.__add_board_lines(PlayerView(runtime_state.player))
+        cli_frame_drawer = self.__cli_frame_drawer
+        cli_frame_drawer.add_line(
+            f"#{self.__operation_count} at {steps_per_second:,.0f} steps/s",
+            "live",
+        )
+        cli_frame_drawer.add_line(str(runtime_state.stack), "stack")
+        self.__add_io_lines()
+        cli_frame_drawer.add_line(str(Ansi("press any key to pause", fg=6)))
+
+        cli_frame_drawer.draw_frame()
+
+    def __read_line(self, message: str) -> str:
+        message = str(Ansi(message, fg=5, bold=True))
         stderr.write(message)
         stderr.flush()
-        self.__last_step_count = int(stdin.readline())
-        self.__rest_skip_count = self.__last_step_count
+        line = stdin.readline()
+        self.__cli_frame_drawer.add_text_below(message + line)
+        return line
+
+    def __prompt_step_count(self) -> None:
+        line = self.__read_line("enter the step count >>> ")
+        self.__last_step_count = max(int(line), 1)
+        self.__step_count_to_draw = self.__last_step_count
+
+    def __prompt_step_count_to_go_back(self) -> None:
+        line = self.__read_line("enter the step count to go back >>> ")
+        self.__step_count_to_go_back = max(int(line), 1)
+
+    def __prompt_breakpoint(self) -> None:
+        spec = self.__read_line("enter a breakpoint (empty to clear all) >>> ").strip()
+        self.__is_redraw_requested = True
+        self.__breakpoint_error = None
+        if len(spec) == 0:
+            self.__breakpoints = []
+            return
+        try:
+            self.__breakpoints = [
+                *self.__breakpoints,
+                parse_breakpoint(spec, self.__program),
+            ]
+        except BreakpointError as e:
+            self.__breakpoint_error = e
+
+    def __go_back_step(self) -> None:
+        self.__step_count_to_go_back = 1
+
+    def __next_step(self) -> None:
+        self.__step_count_to_draw = 1
 
     def __rerun_step(self) -> None:
-        self.__rest_skip_count = self.__last_step_count
+        self.__step_count_to_draw = self.__last_step_count
 
     def __continue(self) -> None:
-        self.__rest_skip_count = -1
+        self.__step_count_to_draw = -1
+
+    def __live(self) -> None:
+        self.__is_live = True
+
+    def __scroll(self, dx: int, dy: int) -> None:
+        self.__board_viewport.scroll(dx, dy)
+        self.__is_redraw_requested = True
 
     def __show_prompt(self) -> None:
         prompt = Prompt()
 
-        prompt.add((" ", "n"), lambda: None, "[space]/[n]ext")
+        prompt.add((" ", "n"), self.__next_step, "[space]/[n]ext")
         prompt.add("s", self.__prompt_step_count, "[s]tep N")
         prompt.add("r", self.__rerun_step, f"[r]erun step {self.__last_step_count}")
         prompt.add("c", self.__continue, "[c]ontinue")
+        prompt.add("l", self.__live, "[l]ive")
+        prompt.add("p", self.__go_back_step, "[p]revious")
+        prompt.add("b", self.__prompt_step_count_to_go_back, "[b]ack N")
+        prompt.add("w", self.__prompt_breakpoint, "[w]atch/break")
+        if self.__board_viewport.is_scrollable():
+            prompt.add_desc("[↑←↓→] scroll")
+            scroll_params: tuple[tuple[str, int, int], ...] = (
+                ("UP", 0, -1),
+                ("LEFT", -1, 0),
+                ("DOWN", 0, 1),
+                ("RIGHT", 1, 0),
+            )
+            for key, dx, dy in scroll_params:
+                prompt.add(key, partial(self.__scroll, dx, dy), None)
         prompt.add("q", lambda: sys.exit(0), "[q]uit\n")
 
+        self.__cli_frame_drawer.add_text_below(prompt.get_str())
         prompt.show()
 
-    def __step(self, step_result: StepResult) -> None:
+    def __take_checkpoint(self, last_command_name: CommandType) -> None:
+        runtime_snapshot = take_runtime_snapshot(self.__runner.get_runtime_state())
+        self.__checkpoint_store.add(
+            self.__operation_count,
+            DebuggerCheckpoint(
+                runtime_snapshot,
+                self.__input_source.get_consumed_len(),
+                self.__output_sink.get_snapshot(),
+                last_command_name,
+            ),
+            runtime_snapshot.get_size(),
+        )
+
+    def __step(self) -> StepResult | None:
+        step_result = self.__runner.step()
+        if step_result is None:
+            return None
         self.__operation_count += 1
+        if self.__operation_count % self.__checkpoint_store.get_interval() == 0:
+            self.__take_checkpoint(step_result.command_type)
+        return step_result
 
-        is_cleared = (
-            self.__runner.get_runtime_state().player.get_player_state().game_status
-            == "cleared"
+    def __go_back(self, step_count: int) -> None:
+        # The last checkpoint before the step to draw is restored, and the
+        # steps after it are run again without drawing.
+        step_count_to_draw = max(self.__operation_count - step_count, 1)
+        checkpoint_step_count, checkpoint = self.__checkpoint_store.find(
+            step_count_to_draw - 1,
+        )
+        restore_runtime_snapshot(
+            self.__runner.get_runtime_state(),
+            checkpoint.runtime_snapshot,
         )
+        self.__input_source.rewind(checkpoint.input_consumed_len)
+        self.__output_sink.restore_snapshot(checkpoint.output_snapshot)
+        self.__last_command_name = checkpoint.last_command_name
+        self.__operation_count = checkpoint_step_count
+        self.__step_count_to_draw = step_count_to_draw - checkpoint_step_count
+        self.__is_replaying = True
 
-        if is_cleared:
-            self.__draw(step_result)
-            stderr.write(str(Ansi("game cleared and exit.\n", fg=2)))
-            stderr.flush()
-            return
+    def __skip_steps(
+        self,
+        step_count: int,
+        step_breaker: StepBreaker | None,
+    ) -> StepResult | None:
+        # Runs steps without drawing, or endlessly if step_count is negative,
+        # keeping only the result of the last step, until a breakpoint is hit.
+        # Returns the result of the step which cleared the game, if any.
+        runtime_state = self.__runner.get_runtime_state()
+        operation_pointer = runtime_state.operation_pointer
+        operation_queue = runtime_state.operation_queue
+        last_command_name = self.__last_command_name
+        step_result: StepResult | None = None
+        rest_step_count = step_count
+        while rest_step_count != 0:
+            operation_index = (
+                operation_pointer.get_index()
+                if step_breaker is not None and len(operation_queue) == 0
+                else None
+            )
+            next_step_result = self.__step()
+            if next_step_result is None:
+                break
+            if step_result is not None:
+                last_command_name = step_result.command_type
+            step_result = next_step_result
+            rest_step_count -= 1
+            if step_breaker is not None:
+                self.__hit_breakpoint = step_breaker(operation_index, step_result)
+                if self.__hit_breakpoint is not None:
+                    break
 
-        if self.__rest_skip_count > 0:
-            self.__rest_skip_count -= 1
+        if step_result is None:
+            return None
+        player_state = self.__runner.get_runtime_state().player.get_player_state()
+        if player_state.game_status == "cleared":
+            self.__last_command_name = last_command_name
+            return step_result
+        self.__last_command_name = step_result.command_type
+        return None
 
-        if self.__rest_skip_count == 0:
-            self.__draw(step_result)
-            self.__show_prompt()
+    def __before_read(self) -> None:
+        runtime_handoff = self.__runtime_handoff
+        if runtime_handoff is not None:
+            runtime_handoff.wait_before_reading()
 
-        self.__last_command_name = step_result.command_type
-        self.__last_stack_str = str(self.__runner.get_runtime_state().stack)
+    def __run_live_steps(
+        self,
+        step_breaker: StepBreaker | None,
+        runtime_handoff: RuntimeHandoff,
+    ) -> None:
+        try:
+            while not runtime_handoff.is_pause_requested():
+                self.__live_cleared_step_result = self.__skip_steps(
+                    LIVE_BATCH_STEP_COUNT,
+                    step_breaker,
+                )
+                if (
+                    self.__live_cleared_step_result is not None
+                    or self.__hit_breakpoint is not None
+                ):
+                    return
+                runtime_handoff.lend_if_requested()
+        finally:
+            runtime_handoff.finish()
+
+    def __skip_steps_live(self, step_breaker: StepBreaker | None) -> StepResult | None:
+        # Steps run at full speed on a worker thread, while this thread draws
+        # the state lent by it at a fixed rate until any key is pressed. Keys
+        # are not waited for while the worker reads input from the terminal.
+        runtime_handoff = RuntimeHandoff()
+        self.__runtime_handoff = runtime_handoff
+        self.__live_cleared_step_result = None
+        last_operation_count = self.__operation_count
+        last_time = perf_counter()
+        try:
+            with ThreadPoolExecutor(1) as executor:
+                future = executor.submit(
+                    self.__run_live_steps,
+                    step_breaker,
+                    runtime_handoff,
+                )
+                try:
+                    handoff_result: HandoffResult = "lent"
+                    while handoff_result != "finished":
+                        if (
+                            handoff_result == "lent"
+                            and wait_key(LIVE_FRAME_INTERVAL) is not None
+                        ):
+                            runtime_handoff.request_pause()
+                        handoff_result = runtime_handoff.borrow()
+                        if handoff_result == "lent":
+                            time = perf_counter()
+                            self.__draw_live(
+                                (self.__operation_count - last_operation_count)
+                                / (time - last_time),
+                            )
+                            last_operation_count = self.__operation_count
+                            last_time = time
+                        runtime_handoff.give_back()
+                finally:
+                    runtime_handoff.request_pause()
+                    runtime_handoff.give_back()
+                future.result()
+        finally:
+            self.__runtime_handoff = None
+        return self.__live_cleared_step_result
+
+    def __skip_steps_to_draw(self) -> StepResult | None:
+        # Breakpoints are not checked while the steps are replayed.
+        step_count = self.__step_count_to_draw
+        step_breaker = None
+        if not self.__is_replaying:
+            self.__hit_breakpoint = None
+            step_breaker = compile_breakpoints(
+                self.__breakpoints,
+                self.__runner.get_runtime_state(),
+                self.__output_sink.get_total_len,
+            )
+        if self.__is_live:
+            self.__is_live = False
+            return self.__skip_steps_live(step_breaker)
+        return self.__skip_steps(
+            step_count - 1 if step_count > 0 else -1,
+            step_breaker,
+        )
+
+    def __exit_cleared(self, step_result: StepResult, stack_before_str: str) -> None:
+        self.__draw(step_result, stack_before_str)
+        stderr.write(str(Ansi("game cleared and exit.\n", fg=2)))
+        stderr.flush()
 
     def run(self) -> None:
-        self.__runner.run()
+        # Only the steps to draw go through the views, and the stack before a
+        # step is formatted only if the step is drawn.
+        runtime_state = self.__runner.get_runtime_state()
+        while True:
+            cleared_step_result = self.__skip_steps_to_draw()
+            if self.__is_replaying:
+                self.__is_replaying = False
+            elif cleared_step_result is not None or self.__hit_breakpoint is not None:
+                # The step which cleared the game or hit is run again from a
+                # checkpoint, so that it is drawn with the stack before it.
+                self.__go_back(0)
+                continue
+
+            stack_before_str = (
+                str(runtime_state.stack) if self.__operation_count > 0 else "--"
+            )
+            step_result = self.__step()
+            if step_result is None:
+                return
+
+            if runtime_state.player.get_player_state().game_status == "cleared":
+                self.__exit_cleared(step_result, stack_before_str)
+                return
+
+            self.__draw(step_result, stack_before_str)
+            self.__show_prompt()
+            while self.__is_redraw_requested:
+                self.__is_redraw_requested = False
+                self.__draw(step_result, stack_before_str)
+                self.__show_prompt()
+            self.__breakpoint_error = None
+            self.__last_command_name = step_result.command_type
+
+            if self.__step_count_to_go_back > 0:
+                self.__hit_breakpoint = None
+                self.__go_back(self.__step_count_to_go_back)
+                self.__step_count_to_go_back = 0
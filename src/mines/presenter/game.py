@@ -1,15 +1,15 @@
 import sys
+from bisect import bisect_right
 from functools import partial
-from random import shuffle
+from random import Random
 from sys import stderr
 
 from mines.player.board import (
-    CELL_DIGIT_MINE,
     BoardSize,
     BoardValues,
     Cell,
     CellDigit,
-    is_cell_digit,
+    count_cell_digits,
 )
 from mines.player.operation import (
     ClickOperation,
@@ -19,10 +19,15 @@ from mines.player.operation import (
 )
 from mines.player.player import Player
 from mines.view.ansi import Ansi
+from mines.view.board_renderer import BoardRenderer
+from mines.view.board_viewport import BoardViewport, get_viewport_size
 from mines.view.cli_frame_drawer import CliFrameDrawer
 from mines.view.player_view import PlayerView
 from mines.view.prompt import Prompt
 
+# Lines of a frame other than the board, with a game over message.
+GAME_RESERVED_LINE_COUNT = 7
+
 
 class GameInternalError(Exception):
     def __init__(self, message: str) -> None:
@@ -36,34 +41,51 @@ class Game:
     __level_name: str
     __board_size: BoardSize
     __mine_pattern: MinePattern
+    __random: Random
 
     __player: Player
     __selected_cell: Cell
+    __board_viewport: BoardViewport
+    __board_renderer: BoardRenderer
+    __cli_frame_drawer: CliFrameDrawer
 
     def __init__(
         self,
         level_name: str,
         board_size: BoardSize,
         mine_pattern: MinePattern,
+        seed: int | None,
     ) -> None:
         self.__level_name = level_name
         self.__board_size = board_size
         self.__mine_pattern = mine_pattern
+        self.__random = Random(seed)  # noqa: S311
         if isinstance(mine_pattern, int):
             cell_digits = self.__get_random_cell_digits(None)
             self.__player = Player(cell_digits)
         else:
             self.__player = Player(mine_pattern)
         self.__selected_cell = Cell(0, 0)
+        self.__board_viewport = BoardViewport(board_size)
+        self.__board_renderer = BoardRenderer(self.__player)
+        self.__cli_frame_drawer = CliFrameDrawer(stderr)
 
     def __draw(self) -> None:
         player_view = PlayerView(self.__player)
+        board_viewport = self.__board_viewport
+        board_viewport.resize(
+            get_viewport_size(stderr, GAME_RESERVED_LINE_COUNT, self.__board_size),
+        )
+        board_viewport.focus(self.__selected_cell)
+        self.__board_renderer.update(self.__selected_cell, board_viewport.get_window())
 
-        cli_frame_drawer = CliFrameDrawer()
+        cli_frame_drawer = self.__cli_frame_drawer
         cli_frame_drawer.add_line(self.__level_name, "level")
         cli_frame_drawer.add_line(player_view.get_board_info_str())
         cli_frame_drawer.add_line("")
-        cli_frame_drawer.add_line(player_view.get_board_str(self.__selected_cell))
+        cli_frame_drawer.add_board(self.__board_renderer)
+        if board_viewport.is_scrollable():
+            cli_frame_drawer.add_line(board_viewport.get_summary_str(), "view")
         cli_frame_drawer.add_line("")
 
         cli_frame_drawer.draw_frame()
@@ -72,39 +94,41 @@ class Game:
         self,
         start_cell: Cell | None,
     ) -> BoardValues[CellDigit]:
-        board_size = self.__board_size
-        excluded_cells: list[Cell] = []
-        if start_cell:
-            excluded_cells.append(start_cell)
-            excluded_cells.extend(board_size.iterate_adjacent_cells(start_cell))
-
-        mine_candidates = [
-            cell
-            for cell in board_size.iterate_board_cells()
-            if cell not in excluded_cells
-        ]
-        shuffle(mine_candidates)
-
-        cell_digits = BoardValues[CellDigit](board_size, lambda _: 0)
-
         if not isinstance(self.__mine_pattern, int):
             message = "Mine pattern is fixed."
             raise GameInternalError(message)
 
-        for _ in range(self.__mine_pattern):
-            cell = mine_candidates.pop()
-            cell_digits.set(cell, 9)
-            for next_cell in board_size.iterate_adjacent_cells(cell):
-                old_digit = cell_digits.get(next_cell)
-                if old_digit == CELL_DIGIT_MINE:
-                    continue
-                new_digit = old_digit + 1
-                if not is_cell_digit(new_digit):
-                    message = f"{new_digit} is not a cell digit."
-                    raise GameInternalError(message)
-                cell_digits.set(next_cell, new_digit)
-
-        return cell_digits
+        board_size = self.__board_size
+        width, height = board_size
+        # The k-th candidate skips every excluded index e_j with e_j - j <= k.
+        excluded_thresholds: list[int] = []
+        if start_cell:
+            excluded_indices = sorted(
+                cell.row_index * width + cell.column_index
+                for cell in (
+                    start_cell,
+                    *board_size.iterate_adjacent_cells(start_cell),
+                )
+            )
+            excluded_thresholds = [
+                excluded_index - order
+                for order, excluded_index in enumerate(excluded_indices)
+            ]
+
+        cell_count = width * height
+        mine_flags = bytearray(cell_count)
+        for sampled_index in self.__random.sample(
+            range(cell_count - len(excluded_thresholds)),
+            self.__mine_pattern,
+        ):
+            index = sampled_index + bisect_right(excluded_thresholds, sampled_index)
+            mine_flags[index] = 1
+
+        mine_rows = [
+            bytes(mine_flags[row_index * width : (row_index + 1) * width])
+            for row_index in range(height)
+        ]
+        return count_cell_digits(board_size, mine_rows)
 
     def __set_safe_cell_digits_for_first_open(self, *, is_z_key: bool) -> None:
         if not isinstance(self.__mine_pattern, int):
@@ -169,8 +193,15 @@ class Game:
             move = partial(self.__move, dx, dy)
             prompt.add(keys, move, None)
 
+        if self.__board_viewport.is_scrollable():
+            prompt.add_desc("[WASD] scroll")
+            for keys, dx, dy in move_params:
+                scroll = partial(self.__board_viewport.scroll, dx, dy)
+                prompt.add(keys[0].upper(), scroll, None)
+
         prompt.add("q", lambda: sys.exit(0), "[q] quit\n")
 
+        self.__cli_frame_drawer.add_text_below(prompt.get_str())
         prompt.show()
 
     def __new_game(self) -> None:
@@ -183,8 +214,14 @@ class Game:
 
         prompt.add("q", lambda: sys.exit(0), "[q] quit\n")
 
+        self.__cli_frame_drawer.add_text_below(prompt.get_str())
         prompt.show()
 
+    def __write_message(self, message: str) -> None:
+        stderr.write(message)
+        stderr.flush()
+        self.__cli_frame_drawer.add_text_below(message)
+
     def __step(self) -> None:
         self.__draw()
 
@@ -192,12 +229,10 @@ class Game:
             case "playing":
                 self.__show_playing_prompt()
             case "over":
-                stderr.write(str(Ansi("game over!\n", fg=1)))
-                stderr.flush()
+                self.__write_message(str(Ansi("game over!\n", fg=1)))
                 self.__show_over_prompt()
             case "cleared":
-                stderr.write(str(Ansi("game cleared!\n", fg=2)))
-                stderr.flush()
+                self.__write_message(str(Ansi("game cleared!\n", fg=2)))
                 self.__show_over_prompt()
 
     def run(self) -> None:
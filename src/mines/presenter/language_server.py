@@ -0,0 +1,285 @@
+import json
+from collections.abc import Callable
+from typing import Any, BinaryIO
+
+from mines.program.operation_list import (
+    CLICK_OPERATION_CODE_OFFSET,
+    NO_OPERATION,
+    NO_OPERATION_CODE,
+    RESTART_OPERATION,
+    RESTART_OPERATION_CODE,
+    SWITCH_OPERATION,
+    SWITCH_OPERATION_CODE,
+    decode_click_operation,
+)
+from mines.program.source_document import SourceDocument
+from mines.runtime.command_selector import select_initial_command
+
+JsonObject = dict[str, Any]
+
+SERVER_NAME = "mines-language-server"
+TEXT_DOCUMENT_SYNC_INCREMENTAL = 2
+DIAGNOSTIC_SEVERITY_ERROR = 1
+METHOD_NOT_FOUND_ERROR_CODE = -32601
+INTERNAL_ERROR_CODE = -32603
+MESSAGE_TYPE_ERROR = 1
+CONTENT_LENGTH_HEADER = b"content-length"
+HEADER_SEPARATOR = b":"
+
+
+class LanguageServer:
+    __input_io: BinaryIO
+    __output_io: BinaryIO
+    __documents: dict[str, SourceDocument]
+    __is_running: bool
+    __request_handlers: dict[str, Callable[[JsonObject], Any]]
+    __notification_handlers: dict[str, Callable[[JsonObject], None]]
+
+    def __init__(self, input_io: BinaryIO, output_io: BinaryIO) -> None:
+        self.__input_io = input_io
+        self.__output_io = output_io
+        self.__documents = {}
+        self.__is_running = False
+        self.__request_handlers = {
+            "initialize": self.__initialize,
+            "shutdown": lambda _: None,
+            "textDocument/hover": self.__hover,
+            "textDocument/inlayHint": self.__get_inlay_hints,
+        }
+        self.__notification_handlers = {
+            "exit": self.__exit,
+            "textDocument/didOpen": self.__did_open,
+            "textDocument/didChange": self.__did_change,
+            "textDocument/didClose": self.__did_close,
+        }
+
+    @staticmethod
+    def __get_utf16_len(value: str) -> int:
+        return len(value.encode("utf-16-le")) // 2
+
+    @staticmethod
+    def __get_char_index(line: str, utf16_index: int) -> int:
+        # Positions of LSP count UTF-16 code units by default.
+        if line.isascii():
+            return utf16_index
+        encoded = line.encode("utf-16-le")[: utf16_index * 2]
+        return len(encoded.decode("utf-16-le", errors="ignore"))
+
+    def __get_line_range(self, line_index: int, line: str) -> JsonObject:
+        return {
+            "start": {"line": line_index, "character": 0},
+            "end": {"line": line_index, "character": self.__get_utf16_len(line)},
+        }
+
+    def __read_message(self) -> JsonObject | None:
+        content_length = 0
+        while True:
+            header = self.__input_io.readline()
+            if len(header) == 0:
+                return None
+            header = header.strip()
+            if len(header) == 0:
+                break
+            name, _, value = header.partition(HEADER_SEPARATOR)
+            if name.strip().lower() == CONTENT_LENGTH_HEADER:
+                content_length = int(value)
+        return json.loads(self.__input_io.read(content_length))
+
+    def __write_message(self, message: JsonObject) -> None:
+        content = json.dumps({"jsonrpc": "2.0", **message}).encode()
+        self.__output_io.write(b"Content-Length: %d\r\n\r\n" % len(content))
+        self.__output_io.write(content)
+        self.__output_io.flush()
+
+    def __publish_diagnostics(self, uri: str) -> None:
+        document = self.__documents[uri]
+        raw_lines = document.get_raw_lines()
+        diagnostics = [
+            {
+                "range": self.__get_line_range(line_index, raw_lines[line_index]),
+                "severity": DIAGNOSTIC_SEVERITY_ERROR,
+                "source": "mines",
+                "message": str(error),
+            }
+            for line_index, error in document.get_diagnostics()
+        ]
+        self.__write_message(
+            {
+                "method": "textDocument/publishDiagnostics",
+                "params": {"uri": uri, "diagnostics": diagnostics},
+            },
+        )
+
+    def __initialize(self, _: JsonObject) -> JsonObject:
+        return {
+            "capabilities": {
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": TEXT_DOCUMENT_SYNC_INCREMENTAL,
+                },
+                "hoverProvider": True,
+                "inlayHintProvider": True,
+            },
+            "serverInfo": {"name": SERVER_NAME},
+        }
+
+    def __exit(self, _: JsonObject) -> None:
+        self.__is_running = False
+
+    def __did_open(self, params: JsonObject) -> None:
+        text_document = params["textDocument"]
+        uri = text_document["uri"]
+        self.__documents[uri] = SourceDocument(text_document["text"])
+        self.__publish_diagnostics(uri)
+
+    def __did_change(self, params: JsonObject) -> None:
+        uri = params["textDocument"]["uri"]
+        for change in params["contentChanges"]:
+            change_range = change.get("range")
+            if change_range is None:
+                self.__documents[uri] = SourceDocument(change["text"])
+                continue
+
+            document = self.__documents[uri]
+            raw_lines = document.get_raw_lines()
+            start, end = change_range["start"], change_range["end"]
+            document.apply_change(
+                start["line"],
+                self.__get_char_index(raw_lines[start["line"]], start["character"]),
+                end["line"],
+                self.__get_char_index(raw_lines[end["line"]], end["character"]),
+                change["text"],
+            )
+        self.__publish_diagnostics(uri)
+
+    def __did_close(self, params: JsonObject) -> None:
+        self.__documents.pop(params["textDocument"]["uri"], None)
+
+    def __hover(self, params: JsonObject) -> JsonObject | None:
+        document = self.__documents.get(params["textDocument"]["uri"])
+        if document is None:
+            return None
+
+        line_index = params["position"]["line"]
+        code = document.get_operation_code(line_index)
+        cell_digits = document.get_cell_digits()
+        if code is None or code < CLICK_OPERATION_CODE_OFFSET or cell_digits is None:
+            return None
+
+        cell = decode_click_operation(code, cell_digits.get_board_size()).cell
+        return {
+            "contents": {
+                "kind": "markdown",
+                "value": f"cell `{cell}`: digit `{cell_digits.get(cell)}`",
+            },
+            "range": self.__get_line_range(
+                line_index,
+                document.get_raw_lines()[line_index],
+            ),
+        }
+
+    def __get_inlay_hints(self, params: JsonObject) -> list[JsonObject]:
+        document = self.__documents.get(params["textDocument"]["uri"])
+        if document is None:
+            return []
+        cell_digits = document.get_cell_digits()
+        if cell_digits is None:
+            return []
+
+        raw_lines = document.get_raw_lines()
+        hint_range = params["range"]
+        begin = hint_range["start"]["line"]
+        end = min(hint_range["end"]["line"] + 1, len(raw_lines))
+        operations = {
+            NO_OPERATION_CODE: NO_OPERATION,
+            SWITCH_OPERATION_CODE: SWITCH_OPERATION,
+            RESTART_OPERATION_CODE: RESTART_OPERATION,
+        }
+
+        inlay_hints: list[JsonObject] = []
+        for line_index in range(begin, end):
+            code = document.get_operation_code(line_index)
+            if code is None:
+                continue
+            operation = operations.get(code) or decode_click_operation(
+                code,
+                cell_digits.get_board_size(),
+            )
+            command = select_initial_command(operation, cell_digits)
+            inlay_hints.append(
+                {
+                    "position": {
+                        "line": line_index,
+                        "character": self.__get_utf16_len(raw_lines[line_index]),
+                    },
+                    "label": command.name,
+                    "paddingLeft": True,
+                },
+            )
+        return inlay_hints
+
+    def __write_error(self, message_id: Any, code: int, message: str) -> None:  # noqa: ANN401
+        self.__write_message(
+            {"id": message_id, "error": {"code": code, "message": message}},
+        )
+
+    def __handle_notification(self, method: str, params: JsonObject) -> None:
+        notification_handler = self.__notification_handlers.get(method)
+        if notification_handler is None:
+            return
+
+        try:
+            notification_handler(params)
+        except Exception as e:  # noqa: BLE001
+            # A notification has no response, so the error is only logged.
+            self.__write_message(
+                {
+                    "method": "window/logMessage",
+                    "params": {
+                        "type": MESSAGE_TYPE_ERROR,
+                        "message": f"Failed to handle '{method}': {e!r}",
+                    },
+                },
+            )
+
+    def __handle_request(
+        self,
+        message_id: Any,  # noqa: ANN401
+        method: str,
+        params: JsonObject,
+    ) -> None:
+        request_handler = self.__request_handlers.get(method)
+        if request_handler is None:
+            self.__write_error(
+                message_id,
+                METHOD_NOT_FOUND_ERROR_CODE,
+                f"Method '{method}' is not supported.",
+            )
+            return
+
+        try:
+            result = request_handler(params)
+        except Exception as e:  # noqa: BLE001
+            self.__write_error(
+                message_id,
+                INTERNAL_ERROR_CODE,
+                f"Failed to handle '{method}': {e!r}",
+            )
+            return
+        self.__write_message({"id": message_id, "result": result})
+
+    def __handle_message(self, message: JsonObject) -> None:
+        method = message.get("method") or ""
+        params = message.get("params", {})
+        if "id" in message:
+            self.__handle_request(message["id"], method, params)
+        else:
+            self.__handle_notification(method, params)
+
+    def run(self) -> None:
+        self.__is_running = True
+        while self.__is_running:
+            message = self.__read_message()
+            if message is None:
+                return
+            self.__handle_message(message)
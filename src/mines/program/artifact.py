@@ -0,0 +1,151 @@
+import sys
+from array import array
+from pathlib import Path
+from struct import Struct
+from typing import NamedTuple, cast
+from uuid import uuid4
+
+from mines.player.board import CELL_DIGIT_MINE, BoardSize, BoardValues, CellDigit
+from mines.program.operation_list import CLICK_OPERATION_CODE_OFFSET, OperationList
+from mines.program.program import Program
+
+ARTIFACT_SUFFIX = ".minesc"
+ARTIFACT_MAGIC = b"MINESC"
+ARTIFACT_VERSION = 2
+
+# magic, version, width, height, operation code typecode, operation count,
+# source line index of the first operation
+ARTIFACT_HEADER = Struct("<6sHIIcQQ")
+
+ARTIFACT_TYPECODES = (b"I", b"Q")
+ARTIFACT_CELL_DIGITS = bytes(range(CELL_DIGIT_MINE + 1))
+
+
+class ArtifactHeader(NamedTuple):
+    width: int
+    height: int
+    typecode: str
+    operation_count: int
+    operation_line_index: int
+
+
+class ArtifactFormatError(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(f"Invalid Mines artifact: {message}")
+
+
+def dump_artifact(program: Program) -> bytes:
+    cell_digits = program.cell_digits
+    board_size = cell_digits.get_board_size()
+    operation_codes = array(
+        program.operation_list.get_codes().typecode,
+        program.operation_list.get_codes(),
+    )
+    if sys.byteorder == "big":
+        operation_codes.byteswap()
+
+    header = ARTIFACT_HEADER.pack(
+        ARTIFACT_MAGIC,
+        ARTIFACT_VERSION,
+        board_size.width,
+        board_size.height,
+        operation_codes.typecode.encode(),
+        len(operation_codes),
+        program.operation_line_index,
+    )
+    return b"".join(
+        [header, bytes(cell_digits.iterate_values()), operation_codes.tobytes()],
+    )
+
+
+def __unpack_header(data: bytes) -> ArtifactHeader:
+    if len(data) < ARTIFACT_HEADER.size:
+        message = "header is truncated."
+        raise ArtifactFormatError(message)
+
+    (
+        magic,
+        version,
+        width,
+        height,
+        typecode_bytes,
+        operation_count,
+        operation_line_index,
+    ) = ARTIFACT_HEADER.unpack_from(data)
+    if magic != ARTIFACT_MAGIC:
+        message = "magic number does not match."
+        raise ArtifactFormatError(message)
+    if version != ARTIFACT_VERSION:
+        message = f"version {version} is not supported."
+        raise ArtifactFormatError(message)
+    if width == 0 or height == 0:
+        message = f"board size {width}x{height} is empty."
+        raise ArtifactFormatError(message)
+    if typecode_bytes not in ARTIFACT_TYPECODES:
+        message = f"operation code typecode {typecode_bytes!r} is not supported."
+        raise ArtifactFormatError(message)
+    if operation_count == 0:
+        message = "there are no operations."
+        raise ArtifactFormatError(message)
+    return ArtifactHeader(
+        width,
+        height,
+        typecode_bytes.decode(),
+        operation_count,
+        operation_line_index,
+    )
+
+
+def load_artifact(data: bytes) -> Program:
+    header = __unpack_header(data)
+    width, height = header.width, header.height
+
+    view = memoryview(data)
+    digits_begin = ARTIFACT_HEADER.size
+    codes_begin = digits_begin + width * height
+    operation_codes = array(header.typecode)
+    codes_end = codes_begin + header.operation_count * operation_codes.itemsize
+    if len(data) != codes_end:
+        message = "size does not match the header."
+        raise ArtifactFormatError(message)
+
+    digit_bytes = view[digits_begin:codes_begin].tobytes()
+    if len(digit_bytes.translate(None, ARTIFACT_CELL_DIGITS)) > 0:
+        message = "cell digits are out of range."
+        raise ArtifactFormatError(message)
+
+    operation_codes.frombytes(view[codes_begin:codes_end])
+    if sys.byteorder == "big":
+        operation_codes.byteswap()
+    if max(operation_codes) >= CLICK_OPERATION_CODE_OFFSET + width * height * 2:
+        message = "operation codes are out of range."
+        raise ArtifactFormatError(message)
+
+    board_size = BoardSize(width=width, height=height)
+    rows = [
+        cast("list[CellDigit]", list(view[begin : begin + width]))
+        for begin in range(digits_begin, codes_begin, width)
+    ]
+    return Program(
+        BoardValues.from_rows(board_size, rows),
+        OperationList(board_size, operation_codes),
+        header.operation_line_index,
+    )
+
+
+def write_artifact(program: Program, path: Path) -> None:
+    # Write to a uniquely named sibling file first, so that readers never see
+    # a partial file even if several writers compile the same source. Unlike
+    # tempfile, the file is created with the permissions given by the umask.
+    temp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    try:
+        with temp_path.open("xb") as f:
+            f.write(dump_artifact(program))
+        temp_path.replace(path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def read_artifact(path: Path) -> Program:
+    return load_artifact(path.read_bytes())
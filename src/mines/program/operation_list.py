@@ -0,0 +1,108 @@
+from array import array
+from typing import Self
+
+from mines.player.board import BoardSize, Cell
+from mines.player.operation import (
+    ClickOperation,
+    NoOperation,
+    Operation,
+    RestartOperation,
+    SwitchOperation,
+)
+
+NO_OPERATION_CODE = 0
+SWITCH_OPERATION_CODE = 1
+RESTART_OPERATION_CODE = 2
+CLICK_OPERATION_CODE_OFFSET = 3
+
+MAX_UINT32 = (1 << 32) - 1
+
+NO_OPERATION = NoOperation()
+SWITCH_OPERATION = SwitchOperation()
+RESTART_OPERATION = RestartOperation()
+
+
+class OperationListInternalError(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(f"Internal error in operation list: {message}")
+
+
+def get_operation_code_typecode(board_size: BoardSize) -> str:
+    max_code = CLICK_OPERATION_CODE_OFFSET + board_size.width * board_size.height * 2
+    return "I" if max_code <= MAX_UINT32 else "Q"
+
+
+def encode_operation(operation: Operation, board_size: BoardSize) -> int:
+    match operation:
+        case NoOperation():
+            return NO_OPERATION_CODE
+        case SwitchOperation():
+            return SWITCH_OPERATION_CODE
+        case RestartOperation():
+            return RESTART_OPERATION_CODE
+        case ClickOperation():
+            return encode_click_operation(
+                operation.cell,
+                board_size,
+                is_left_button=operation.is_left_button,
+            )
+
+
+def encode_click_operation(
+    cell: Cell,
+    board_size: BoardSize,
+    *,
+    is_left_button: bool,
+) -> int:
+    cell_id = cell.row_index * board_size.width + cell.column_index
+    return CLICK_OPERATION_CODE_OFFSET + cell_id * 2 + (0 if is_left_button else 1)
+
+
+def decode_click_operation(code: int, board_size: BoardSize) -> ClickOperation:
+    if code < CLICK_OPERATION_CODE_OFFSET:
+        message = f"operation code: {code} is invalid."
+        raise OperationListInternalError(message)
+
+    cell_id, button_bit = divmod(code - CLICK_OPERATION_CODE_OFFSET, 2)
+    row_index, column_index = divmod(cell_id, board_size.width)
+    return ClickOperation(
+        Cell(column_index=column_index, row_index=row_index),
+        is_left_button=button_bit == 0,
+    )
+
+
+class OperationList:
+    # Operations are packed into one array of codes, and decoded into shared
+    # objects only when indexed.
+    __board_size: BoardSize
+    __codes: array[int]
+    __operations: dict[int, Operation]
+
+    def __init__(self, board_size: BoardSize, codes: array[int]) -> None:
+        self.__board_size = board_size
+        self.__codes = codes
+        self.__operations = {
+            NO_OPERATION_CODE: NO_OPERATION,
+            SWITCH_OPERATION_CODE: SWITCH_OPERATION,
+            RESTART_OPERATION_CODE: RESTART_OPERATION,
+        }
+
+    def __reduce__(self) -> tuple[type[Self], tuple[BoardSize, array[int]]]:
+        return (type(self), (self.__board_size, self.__codes))
+
+    def __len__(self) -> int:
+        return len(self.__codes)
+
+    def __getitem__(self, index: int) -> Operation:
+        code = self.__codes[index]
+        operation = self.__operations.get(code)
+        if operation is None:
+            operation = decode_click_operation(code, self.__board_size)
+            self.__operations[code] = operation
+        return operation
+
+    def get_board_size(self) -> BoardSize:
+        return self.__board_size
+
+    def get_codes(self) -> array[int]:
+        return self.__codes
@@ -1,27 +1,23 @@
 import re
-
-from mines.player.board import (
-    BoardSize,
-    BoardValues,
-    Cell,
-    CellDigit,
-    is_cell_digit,
-)
-from mines.player.operation import (
-    ClickOperation,
-    NoOperation,
-    Operation,
-    RestartOperation,
-    SwitchOperation,
+from array import array
+from collections.abc import Iterable, Iterator
+from io import StringIO
+from itertools import chain
+
+from mines.player.board import BoardSize, count_cell_digits
+from mines.player.operation import ClickOperation, Operation
+from mines.program.operation_list import (
+    NO_OPERATION,
+    RESTART_OPERATION,
+    SWITCH_OPERATION,
+    OperationList,
+    encode_click_operation,
+    encode_operation,
+    get_operation_code_typecode,
 )
 from mines.program.program import Program
 
 
-class ParserInternalError(Exception):
-    def __init__(self, message: str) -> None:
-        super().__init__(f"Internal error in parser: {message}")
-
-
 class MinesCodeSyntaxError(Exception):
     def __init__(self, message: str) -> None:
         super().__init__(f"Syntax error in Mines code: {message}")
@@ -47,8 +43,19 @@ class NoOperationsSyntaxError(MinesCodeSyntaxError):
         super().__init__("No operations.")
 
 
+BOARD_LINE_TABLE = bytes.maketrans(b".*", b"\x00\x01")
+BOARD_CHARS = ".*"
+IGNORED_CHARS = " \t\v\f\r"
+IGNORED_CHARS_TABLE = str.maketrans("", "", IGNORED_CHARS)
+IGNORED_BYTES = IGNORED_CHARS.encode()
+INTEGER_RE = re.compile(r"^[+-]?[0-9]+$")
+CLICK_OPERATION_RE = re.compile(r"([+-]?[0-9]+)([,;])([+-]?[0-9]+)")
+
+MAX_CACHED_LINE_COUNT = 1 << 16
+
+
 def __parse_int(value: str) -> int:
-    if not re.compile(r"^[+-]?[0-9]+$").match(value):
+    if not INTEGER_RE.match(value):
         raise IntegerSyntaxError(value)
     return int(value)
 
@@ -77,11 +84,11 @@ def __parse_click_operation(
 def __parse_operation(line: str, board_size: BoardSize) -> Operation:
     match line:
         case "":
-            return NoOperation()
+            return NO_OPERATION
         case "!":
-            return SwitchOperation()
+            return SWITCH_OPERATION
         case "@":
-            return RestartOperation()
+            return RESTART_OPERATION
         case _:
             if click_operation := (
                 __parse_click_operation(line, board_size, is_left_button=True)
@@ -92,68 +99,114 @@ def __parse_operation(line: str, board_size: BoardSize) -> Operation:
     raise OperationSyntaxError(line)
 
 
-def parse(code: str) -> Program:
-    formatted_lines = [
-        (line + "#")[: line.find("#")].translate(str.maketrans("", "", " \t\v\f\r"))
-        for line in code.split(sep="\n")
-    ]
+def parse_operation_code(
+    line: str,
+    board_size: BoardSize,
+    line_codes: dict[str, int],
+) -> int:
+    code = line_codes.get(line)
+    if code is not None:
+        return code
+
+    match = CLICK_OPERATION_RE.fullmatch(line)
+    if match is None:
+        # Let the general path report the same errors as before.
+        code = encode_operation(__parse_operation(line, board_size), board_size)
+    else:
+        unwrapped_column_index_str, separator, unwrapped_row_index_str = match.groups()
+        code = encode_click_operation(
+            board_size.get_wrapped_cell(
+                unwrapped_column_index=int(unwrapped_column_index_str),
+                unwrapped_row_index=int(unwrapped_row_index_str),
+            ),
+            board_size,
+            is_left_button=separator == ",",
+        )
 
-    header_count = next(
-        (
-            index
-            for index in range(len(formatted_lines))
-            if len(formatted_lines[index]) > 0
-        ),
-        len(formatted_lines),
-    )
+    if len(line_codes) < MAX_CACHED_LINE_COUNT:
+        line_codes[line] = code
+    return code
 
-    if header_count == len(formatted_lines):
-        raise NoBoardSyntaxError
 
-    board_width = len(formatted_lines[header_count])
+def __remove_ignored_chars(line: str) -> str:
+    # Deleting from bytes is much faster than `str.translate` with a table.
+    if line.isascii():
+        return line.encode().translate(None, IGNORED_BYTES).decode()
+    return line.translate(IGNORED_CHARS_TABLE)
 
-    board_line_re = re.compile(rf"^[.*]{{{board_width}}}$")
-    board_height = (
-        next(
-            (
-                index
-                for index in range(header_count, len(formatted_lines))
-                if not board_line_re.match(formatted_lines[index])
-            ),
-            len(formatted_lines),
-        )
-        - header_count
-    )
 
-    if board_width * board_height == 0:
-        raise NoBoardSyntaxError
+def format_line(raw_line: str) -> str:
+    comment_index = raw_line.find("#")
+    if comment_index >= 0:
+        raw_line = raw_line[:comment_index]
+    return __remove_ignored_chars(raw_line)
 
-    board_size = BoardSize(width=board_width, height=board_height)
 
-    def count_cell_digit(cell: Cell) -> CellDigit:
-        cell = Cell(row_index=cell.row_index, column_index=cell.column_index)
-        if formatted_lines[header_count + cell.row_index][cell.column_index] == "*":
-            return 9
+def to_mine_row(line: str, board_width: int) -> bytes | None:
+    if len(line) != board_width or len(line.strip(BOARD_CHARS)) > 0:
+        return None
+    return line.encode().translate(BOARD_LINE_TABLE)
 
-        mine_count = sum(
-            formatted_lines[header_count + next_cell.row_index][next_cell.column_index]
-            == "*"
-            for next_cell in board_size.iterate_adjacent_cells(cell)
-        )
-        if is_cell_digit(mine_count):
-            return mine_count
 
-        message = f"mine count: {mine_count} is not a cell digit."
-        raise ParserInternalError(message)
+def __iterate_formatted_lines(lines: Iterable[str]) -> Iterator[str]:
+    # Lines are split like `str.split("\n")`, so a trailing newline (or no
+    # input at all) yields one more empty line.
+    has_trailing_line = True
+    for line in lines:
+        has_trailing_line = line.endswith("\n")
+        yield format_line(line[:-1] if has_trailing_line else line)
+
+    if has_trailing_line:
+        yield ""
+
+
+def parse_lines(lines: Iterable[str]) -> Program:
+    formatted_lines = __iterate_formatted_lines(lines)
+
+    header_line_count = 0
+    board_first_line: str | None = None
+    for line in formatted_lines:
+        if len(line) > 0:
+            board_first_line = line
+            break
+        header_line_count += 1
+    if board_first_line is None:
+        raise NoBoardSyntaxError
 
-    cell_digits = BoardValues[CellDigit](board_size, count_cell_digit)
+    board_width = len(board_first_line)
+    mine_rows: list[bytes] = []
+    operation_first_line: str | None = None
+    for line in chain((board_first_line,), formatted_lines):
+        mine_row = to_mine_row(line, board_width)
+        if mine_row is None:
+            operation_first_line = line
+            break
+        mine_rows.append(mine_row)
+
+    if len(mine_rows) == 0:
+        raise NoBoardSyntaxError
 
-    operation_list = [
-        __parse_operation(formatted_lines[index], board_size)
-        for index in range(header_count + board_height, len(formatted_lines))
-    ]
+    board_size = BoardSize(width=board_width, height=len(mine_rows))
+    cell_digits = count_cell_digits(board_size, mine_rows)
 
-    if len(operation_list) == 0:
+    if operation_first_line is None:
         raise NoOperationsSyntaxError
 
-    return Program(cell_digits, operation_list)
+    line_codes: dict[str, int] = {}
+    operation_codes = array(
+        get_operation_code_typecode(board_size),
+        (
+            parse_operation_code(line, board_size, line_codes)
+            for line in chain((operation_first_line,), formatted_lines)
+        ),
+    )
+
+    return Program(
+        cell_digits,
+        OperationList(board_size, operation_codes),
+        header_line_count + len(mine_rows),
+    )
+
+
+def parse(code: str) -> Program:
+    return parse_lines(StringIO(code, newline="\n"))
@@ -1,9 +1,11 @@
 from typing import NamedTuple
 
 from mines.player.board import BoardValues, CellDigit
-from mines.player.operation import Operation
+from mines.program.operation_list import OperationList
 
 
 class Program(NamedTuple):
     cell_digits: BoardValues[CellDigit]
-    operation_list: list[Operation]
+    operation_list: OperationList
+    # Each operation is one source line from this index on.
+    operation_line_index: int
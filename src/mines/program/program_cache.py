@@ -0,0 +1,68 @@
+import os
+from hashlib import sha256
+from pathlib import Path
+
+from mines.__version__ import __version__
+from mines.program.artifact import (
+    ARTIFACT_MAGIC,
+    ARTIFACT_SUFFIX,
+    ARTIFACT_VERSION,
+    ArtifactFormatError,
+    read_artifact,
+    write_artifact,
+)
+from mines.program.parser import parse_lines
+from mines.program.program import Program
+
+CACHE_DIR_ENV = "MINES_CACHE_DIR"
+
+
+def get_default_cache_dir() -> Path:
+    if cache_dir := os.environ.get(CACHE_DIR_ENV):
+        return Path(cache_dir)
+    if xdg_cache_home := os.environ.get("XDG_CACHE_HOME"):
+        return Path(xdg_cache_home) / "mines"
+    return Path.home() / ".cache" / "mines"
+
+
+def get_cache_path(source_path: Path, cache_dir: Path) -> Path:
+    # The package version is hashed too, since a parser change can change the
+    # program compiled from the same source without changing the format.
+    with source_path.open("rb") as f:
+        source_hash = sha256(ARTIFACT_MAGIC + bytes([ARTIFACT_VERSION]))
+        source_hash.update(f"{__version__}\0".encode())
+        while chunk := f.read1():
+            source_hash.update(chunk)
+    return cache_dir / f"{source_hash.hexdigest()}{ARTIFACT_SUFFIX}"
+
+
+def is_artifact_file(path: Path) -> bool:
+    with path.open("rb") as f:
+        return f.read(len(ARTIFACT_MAGIC)) == ARTIFACT_MAGIC
+
+
+def compile_source(source_path: Path) -> Program:
+    with source_path.open(encoding="utf-8") as f:
+        return parse_lines(f)
+
+
+def load_program(source_path: Path, cache_dir: Path | None) -> Program:
+    if is_artifact_file(source_path):
+        return read_artifact(source_path)
+    if cache_dir is None:
+        return compile_source(source_path)
+
+    cache_path = get_cache_path(source_path, cache_dir)
+    try:
+        return read_artifact(cache_path)
+    except (OSError, ArtifactFormatError):
+        pass
+
+    program = compile_source(source_path)
+    # The cache is only an optimization, so failing to update it is not fatal.
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        write_artifact(program, cache_path)
+    except OSError:
+        pass
+    return program
@@ -0,0 +1,247 @@
+from array import array
+from typing import NamedTuple
+
+from mines.player.board import (
+    BoardSize,
+    BoardValues,
+    CellDigit,
+    count_cell_digits,
+)
+from mines.program.operation_list import OperationList, get_operation_code_typecode
+from mines.program.parser import (
+    MinesCodeSyntaxError,
+    NoBoardSyntaxError,
+    NoOperationsSyntaxError,
+    format_line,
+    parse_operation_code,
+    to_mine_row,
+)
+from mines.program.program import Program
+
+OperationResult = int | MinesCodeSyntaxError
+
+
+class SourceDiagnostic(NamedTuple):
+    line_index: int
+    error: MinesCodeSyntaxError
+
+
+class SourceDocument:
+    # Keeps the parse result of every line, so that an edit re-parses only the
+    # changed lines. Each line after the board is one operation.
+    __raw_lines: list[str]
+    __formatted_lines: list[str]
+    __board_begin: int
+    __board_end: int
+    __board_width: int
+    __mine_rows: list[bytes]
+    __digit_rows: list[list[CellDigit]]
+    __line_codes: dict[str, int]
+    __operation_results: list[OperationResult]
+    __error: MinesCodeSyntaxError | None
+
+    def __init__(self, source: str) -> None:
+        self.__raw_lines = source.split("\n")
+        self.__formatted_lines = [format_line(line) for line in self.__raw_lines]
+        self.__parse_all()
+
+    def __parse_all(self) -> None:
+        lines = self.__formatted_lines
+        self.__board_begin = next(
+            (line_index for line_index, line in enumerate(lines) if len(line) > 0),
+            len(lines),
+        )
+        self.__board_end = self.__board_begin
+        self.__board_width = 0
+        self.__mine_rows = []
+        self.__digit_rows = []
+        self.__line_codes = {}
+        self.__operation_results = []
+        self.__error = None
+
+        if self.__board_begin == len(lines):
+            self.__error = NoBoardSyntaxError()
+            return
+
+        self.__board_width = len(lines[self.__board_begin])
+        while self.__board_end < len(lines):
+            mine_row = to_mine_row(lines[self.__board_end], self.__board_width)
+            if mine_row is None:
+                break
+            self.__mine_rows.append(mine_row)
+            self.__board_end += 1
+
+        if len(self.__mine_rows) == 0:
+            self.__error = NoBoardSyntaxError()
+            return
+
+        board_size = self.get_board_size()
+        self.__digit_rows = list(
+            count_cell_digits(board_size, self.__mine_rows).iterate_rows(),
+        )
+
+        if self.__board_end == len(lines):
+            self.__error = NoOperationsSyntaxError()
+            return
+
+        self.__operation_results = [
+            self.__parse_operation_line(line) for line in lines[self.__board_end :]
+        ]
+
+    def __parse_operation_line(self, line: str) -> OperationResult:
+        try:
+            return parse_operation_code(line, self.get_board_size(), self.__line_codes)
+        except MinesCodeSyntaxError as e:
+            return e
+
+    def __is_operation_edit(self, line_index: int) -> bool:
+        # The board ends at the first line which is not a row, so the edit keeps
+        # it unless the new first operation line could be a row.
+        if self.__error is not None or line_index < self.__board_end:
+            return False
+        if line_index > self.__board_end:
+            return True
+        return (
+            self.__board_end < len(self.__formatted_lines)
+            and to_mine_row(
+                self.__formatted_lines[self.__board_end],
+                self.get_board_size().width,
+            )
+            is None
+        )
+
+    def __update_mine_rows(self, row_index: int, mine_rows: list[bytes]) -> None:
+        end_row_index = row_index + len(mine_rows)
+        self.__mine_rows[row_index:end_row_index] = mine_rows
+
+        # A digit depends only on the adjacent rows, so recount the changed rows
+        # and their neighbors from a slice with one more row on each side.
+        height = len(self.__mine_rows)
+        digit_begin = max(row_index - 1, 0)
+        digit_end = min(end_row_index + 1, height)
+        slice_begin = max(digit_begin - 1, 0)
+        slice_end = min(digit_end + 1, height)
+        slice_rows = self.__mine_rows[slice_begin:slice_end]
+        digit_rows = list(
+            count_cell_digits(
+                BoardSize(width=self.__board_width, height=len(slice_rows)),
+                slice_rows,
+            ).iterate_rows(),
+        )
+        self.__digit_rows[digit_begin:digit_end] = digit_rows[
+            digit_begin - slice_begin : digit_end - slice_begin
+        ]
+
+    def __replace_lines(
+        self,
+        line_index: int,
+        removed_count: int,
+        raw_lines: list[str],
+    ) -> None:
+        formatted_lines = [format_line(line) for line in raw_lines]
+        end_line_index = line_index + removed_count
+        self.__raw_lines[line_index:end_line_index] = raw_lines
+        self.__formatted_lines[line_index:end_line_index] = formatted_lines
+
+        if self.__is_operation_edit(line_index):
+            operation_index = line_index - self.__board_end
+            self.__operation_results[
+                operation_index : operation_index + removed_count
+            ] = [self.__parse_operation_line(line) for line in formatted_lines]
+            return
+
+        if (
+            self.__error is None
+            and self.__board_begin <= line_index
+            and end_line_index <= self.__board_end
+            and removed_count == len(formatted_lines)
+        ):
+            mine_rows = [
+                to_mine_row(line, self.__board_width) for line in formatted_lines
+            ]
+            if all(mine_row is not None for mine_row in mine_rows):
+                self.__update_mine_rows(
+                    line_index - self.__board_begin,
+                    [mine_row for mine_row in mine_rows if mine_row is not None],
+                )
+                return
+
+        self.__parse_all()
+
+    def apply_change(
+        self,
+        start_line_index: int,
+        start_char_index: int,
+        end_line_index: int,
+        end_char_index: int,
+        text: str,
+    ) -> None:
+        head = self.__raw_lines[start_line_index][:start_char_index]
+        tail = self.__raw_lines[end_line_index][end_char_index:]
+        self.__replace_lines(
+            start_line_index,
+            end_line_index - start_line_index + 1,
+            (head + text + tail).split("\n"),
+        )
+
+    def get_raw_lines(self) -> list[str]:
+        return self.__raw_lines
+
+    def get_text(self) -> str:
+        return "\n".join(self.__raw_lines)
+
+    def get_board_size(self) -> BoardSize:
+        return BoardSize(width=self.__board_width, height=len(self.__mine_rows))
+
+    def get_cell_digits(self) -> BoardValues[CellDigit] | None:
+        if len(self.__mine_rows) == 0:
+            return None
+        return BoardValues.from_rows(self.get_board_size(), self.__digit_rows)
+
+    def get_board_line_range(self) -> range:
+        return range(self.__board_begin, self.__board_end)
+
+    def get_operation_line_index(self, operation_index: int) -> int:
+        return self.__board_end + operation_index
+
+    def get_operation_code(self, line_index: int) -> int | None:
+        operation_index = line_index - self.__board_end
+        if not 0 <= operation_index < len(self.__operation_results):
+            return None
+        result = self.__operation_results[operation_index]
+        return result if isinstance(result, int) else None
+
+    def get_diagnostics(self) -> list[SourceDiagnostic]:
+        if self.__error is not None:
+            return [
+                SourceDiagnostic(
+                    line_index=min(self.__board_end, len(self.__raw_lines) - 1),
+                    error=self.__error,
+                ),
+            ]
+        return [
+            SourceDiagnostic(
+                line_index=self.__board_end + operation_index,
+                error=result,
+            )
+            for operation_index, result in enumerate(self.__operation_results)
+            if not isinstance(result, int)
+        ]
+
+    def get_program(self) -> Program:
+        if self.__error is not None:
+            raise self.__error
+        for result in self.__operation_results:
+            if not isinstance(result, int):
+                raise result
+
+        board_size = self.get_board_size()
+        operation_codes = array(
+            get_operation_code_typecode(board_size),
+            [result for result in self.__operation_results if isinstance(result, int)],
+        )
+        return Program(
+            BoardValues.from_rows(board_size, [*map(list, self.__digit_rows)]),
+            OperationList(board_size, operation_codes),
+            self.__board_end,
+        )
@@ -0,0 +1,413 @@
+import operator
+from collections.abc import Callable
+from functools import partial
+from typing import Literal, NamedTuple, TypeIs, get_args
+
+from mines.player.board import Cell
+from mines.player.operation import ClickOperation, RestartOperation
+from mines.program.program import Program
+from mines.runtime.command_type import CommandErrorType, CommandType
+from mines.runtime.runner import StepResult
+from mines.runtime.runtime_state import RuntimeState
+
+COMMAND_TYPES: tuple[CommandType, ...] = get_args(CommandType)
+COMMAND_ERROR_TYPES: tuple[CommandErrorType, ...] = get_args(CommandErrorType)
+
+ComparisonOperator = Literal["==", "!=", "<", "<=", ">", ">="]
+
+COMPARISON_FUNCTIONS: dict[ComparisonOperator, Callable[[int, int], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+WatchTarget = Literal["depth", "top", "output"]
+
+BreakEvent = Literal["over", "restart"]
+
+
+class BreakpointError(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(f"Invalid breakpoint: {message}")
+
+
+class LineBreakpoint(NamedTuple):
+    line_number: int
+    operation_index: int
+
+    def __str__(self) -> str:
+        return f"line {self.line_number}"
+
+
+class CommandBreakpoint(NamedTuple):
+    command_type: CommandType
+
+    def __str__(self) -> str:
+        return f"command {self.command_type}"
+
+
+class ErrorBreakpoint(NamedTuple):
+    # Any error is matched if the error type is None.
+    command_error_type: CommandErrorType | None
+
+    def __str__(self) -> str:
+        if self.command_error_type is None:
+            return "error"
+        return f"error {self.command_error_type}"
+
+
+class CellBreakpoint(NamedTuple):
+    cell: Cell
+
+    def __str__(self) -> str:
+        return f"cell {self.cell.column_index} {self.cell.row_index}"
+
+
+class EventBreakpoint(NamedTuple):
+    event: BreakEvent
+
+    def __str__(self) -> str:
+        return self.event
+
+
+class WatchComparison(NamedTuple):
+    comparison_operator: ComparisonOperator
+    value: int
+
+
+class WatchBreakpoint(NamedTuple):
+    # Hits whenever the watched value changes if the comparison is None, or
+    # else whenever the comparison becomes true.
+    target: WatchTarget
+    comparison: WatchComparison | None
+
+    def __str__(self) -> str:
+        if self.comparison is None:
+            return self.target
+        comparison = self.comparison
+        return f"{self.target} {comparison.comparison_operator} {comparison.value}"
+
+
+Breakpoint = (
+    LineBreakpoint
+    | CommandBreakpoint
+    | ErrorBreakpoint
+    | CellBreakpoint
+    | EventBreakpoint
+    | WatchBreakpoint
+)
+
+# Receives each step with the index of its operation (None if it was queued),
+# and returns the breakpoint it hit, if any.
+StepBreaker = Callable[[int | None, StepResult], Breakpoint | None]
+
+
+def is_command_type(value: str) -> TypeIs[CommandType]:
+    return value in COMMAND_TYPES
+
+
+def is_command_error_type(value: str) -> TypeIs[CommandErrorType]:
+    return value in COMMAND_ERROR_TYPES
+
+
+def is_comparison_operator(value: str) -> TypeIs[ComparisonOperator]:
+    return value in COMPARISON_FUNCTIONS
+
+
+class BreakpointUsageError(BreakpointError):
+    def __init__(self, usage: str) -> None:
+        super().__init__(f"Usage is '{usage}'.")
+
+
+def __parse_int(token: str) -> int:
+    try:
+        return int(token)
+    except ValueError:
+        message = f"'{token}' is not an integer."
+        raise BreakpointError(message) from None
+
+
+# Each parser returns None if the arguments do not fit its usage.
+BreakpointParser = Callable[[list[str], Program], Breakpoint | None]
+
+
+def __parse_line(args: list[str], program: Program) -> Breakpoint | None:
+    if len(args) != 1:
+        return None
+    line_number = __parse_int(args[0])
+    operation_index = line_number - 1 - program.operation_line_index
+    if not 0 <= operation_index < len(program.operation_list):
+        message = f"Line {line_number} has no operation."
+        raise BreakpointError(message)
+    return LineBreakpoint(line_number, operation_index)
+
+
+def __parse_command(args: list[str], _program: Program) -> Breakpoint | None:
+    if len(args) != 1:
+        return None
+    if not is_command_type(args[0]):
+        message = f"Command '{args[0]}' is unknown."
+        raise BreakpointError(message)
+    return CommandBreakpoint(args[0])
+
+
+def __parse_error(args: list[str], _program: Program) -> Breakpoint | None:
+    if len(args) == 0:
+        return ErrorBreakpoint(None)
+    if len(args) != 1:
+        return None
+    if not is_command_error_type(args[0]):
+        message = f"Error '{args[0]}' is unknown."
+        raise BreakpointError(message)
+    return ErrorBreakpoint(args[0])
+
+
+def __parse_cell(args: list[str], program: Program) -> Breakpoint | None:
+    if len(args) != len(Cell._fields):
+        return None
+    board_size = program.cell_digits.get_board_size()
+    return CellBreakpoint(
+        board_size.get_wrapped_cell(__parse_int(args[0]), __parse_int(args[1])),
+    )
+
+
+def __parse_event(event: BreakEvent, args: list[str]) -> Breakpoint | None:
+    return EventBreakpoint(event) if len(args) == 0 else None
+
+
+def __parse_watch(target: WatchTarget, args: list[str]) -> Breakpoint | None:
+    if len(args) == 0:
+        return WatchBreakpoint(target, None)
+    if len(args) != len(WatchComparison._fields) or not is_comparison_operator(
+        args[0],
+    ):
+        return None
+    return WatchBreakpoint(target, WatchComparison(args[0], __parse_int(args[1])))
+
+
+WATCH_USAGE_ARGS = f"[{'|'.join(COMPARISON_FUNCTIONS)} N]"
+
+_BREAKPOINT_SYNTAXES: dict[str, tuple[str, BreakpointParser]] = {
+    "line": ("line N", __parse_line),
+    "command": ("command NAME", __parse_command),
+    "error": ("error [NAME]", __parse_error),
+    "cell": ("cell X Y", __parse_cell),
+    "over": ("over", lambda args, _: __parse_event("over", args)),
+    "restart": ("restart", lambda args, _: __parse_event("restart", args)),
+    "depth": (
+        f"depth {WATCH_USAGE_ARGS}",
+        lambda args, _: __parse_watch("depth", args),
+    ),
+    "top": (f"top {WATCH_USAGE_ARGS}", lambda args, _: __parse_watch("top", args)),
+    "output": (
+        f"output {WATCH_USAGE_ARGS}",
+        lambda args, _: __parse_watch("output", args),
+    ),
+}
+
+
+def parse_breakpoint(spec: str, program: Program) -> Breakpoint:
+    # A spec is a kind followed by its arguments, separated by spaces.
+    kind, *args = spec.split() or [""]
+    syntax = _BREAKPOINT_SYNTAXES.get(kind)
+    if syntax is None:
+        message = f"'{kind}' is not one of {', '.join(_BREAKPOINT_SYNTAXES)}."
+        raise BreakpointError(message)
+    usage, parse = syntax
+    breakpoint_ = parse(args, program)
+    if breakpoint_ is None:
+        raise BreakpointUsageError(usage)
+    return breakpoint_
+
+
+class _Watch:
+    # Keeps the value seen at the last check, so that a step which leaves it
+    # unchanged costs a single comparison.
+    __breakpoint: Breakpoint
+    __get_value: Callable[[], object]
+    __is_met: Callable[[object], bool] | None
+    __last_value: object
+
+    def __init__(
+        self,
+        breakpoint_: Breakpoint,
+        get_value: Callable[[], object],
+        is_met: Callable[[object], bool] | None,
+    ) -> None:
+        self.__breakpoint = breakpoint_
+        self.__get_value = get_value
+        self.__is_met = is_met
+        self.__last_value = get_value()
+
+    def check(
+        self,
+        _operation_index: int | None,
+        _step_result: StepResult,
+    ) -> Breakpoint | None:
+        value = self.__get_value()
+        last_value = self.__last_value
+        if value == last_value:
+            return None
+        self.__last_value = value
+        is_met = self.__is_met
+        if is_met is None or (is_met(value) and not is_met(last_value)):
+            return self.__breakpoint
+        return None
+
+
+def __is_compared(comparison: WatchComparison, value: object) -> bool:
+    if not isinstance(value, int):
+        return False
+    compare = COMPARISON_FUNCTIONS[comparison.comparison_operator]
+    return compare(value, comparison.value)
+
+
+def __is_over(game_status: object) -> bool:
+    return game_status == "over"
+
+
+def __get_watch(
+    breakpoint_: EventBreakpoint | WatchBreakpoint,
+    runtime_state: RuntimeState,
+    get_output_len: Callable[[], int],
+) -> _Watch:
+    stack = runtime_state.stack
+    player_state = runtime_state.player.get_player_state()
+
+    def get_top() -> int | None:
+        return stack.peek(0) if len(stack) > 0 else None
+
+    def get_game_status() -> str:
+        return player_state.game_status
+
+    if isinstance(breakpoint_, EventBreakpoint):
+        return _Watch(breakpoint_, get_game_status, __is_over)
+
+    get_value: Callable[[], object]
+    match breakpoint_.target:
+        case "depth":
+            get_value = partial(len, stack)
+        case "top":
+            get_value = get_top
+        case "output":
+            get_value = get_output_len
+    comparison = breakpoint_.comparison
+    return _Watch(
+        breakpoint_,
+        get_value,
+        None if comparison is None else partial(__is_compared, comparison),
+    )
+
+
+class _StepBreakpoints(NamedTuple):
+    # Breakpoints which depend only on the step, looked up by kind.
+    line_breakpoints: dict[int | None, Breakpoint]
+    command_breakpoints: dict[CommandType, Breakpoint]
+    error_breakpoints: dict[CommandErrorType | None, Breakpoint]
+    cell_breakpoints: dict[Cell, Breakpoint]
+    restart_breakpoints: list[Breakpoint]
+
+
+def __group_step_breakpoints(breakpoints: list[Breakpoint]) -> _StepBreakpoints:
+    step_breakpoints = _StepBreakpoints({}, {}, {}, {}, [])
+    for breakpoint_ in breakpoints:
+        match breakpoint_:
+            case LineBreakpoint(operation_index=operation_index):
+                step_breakpoints.line_breakpoints.setdefault(
+                    operation_index,
+                    breakpoint_,
+                )
+            case CommandBreakpoint(command_type=command_type):
+                step_breakpoints.command_breakpoints.setdefault(
+                    command_type,
+                    breakpoint_,
+                )
+            case ErrorBreakpoint(command_error_type=command_error_type):
+                for error_type in (
+                    COMMAND_ERROR_TYPES
+                    if command_error_type is None
+                    else (command_error_type,)
+                ):
+                    step_breakpoints.error_breakpoints.setdefault(
+                        error_type,
+                        breakpoint_,
+                    )
+            case CellBreakpoint(cell=cell):
+                step_breakpoints.cell_breakpoints.setdefault(cell, breakpoint_)
+            case EventBreakpoint(event="restart"):
+                step_breakpoints.restart_breakpoints.append(breakpoint_)
+            case _:
+                pass
+    return step_breakpoints
+
+
+def __get_step_checks(breakpoints: list[Breakpoint]) -> list[StepBreaker]:
+    (
+        line_breakpoints,
+        command_breakpoints,
+        error_breakpoints,
+        cell_breakpoints,
+        restart_breakpoints,
+    ) = __group_step_breakpoints(breakpoints)
+
+    def check_cell(_: int | None, step_result: StepResult) -> Breakpoint | None:
+        operation = step_result.operation
+        if isinstance(operation, ClickOperation):
+            return cell_breakpoints.get(operation.cell)
+        return None
+
+    def check_restart(_: int | None, step_result: StepResult) -> Breakpoint | None:
+        if isinstance(step_result.operation, RestartOperation):
+            return restart_breakpoints[0]
+        return None
+
+    checks: list[StepBreaker] = []
+    if len(line_breakpoints) > 0:
+        checks.append(lambda operation_index, _: line_breakpoints.get(operation_index))
+    if len(command_breakpoints) > 0:
+        checks.append(lambda _, step_result: command_breakpoints.get(step_result[1]))
+    if len(error_breakpoints) > 0:
+        checks.append(lambda _, step_result: error_breakpoints.get(step_result[2]))
+    if len(cell_breakpoints) > 0:
+        checks.append(check_cell)
+    if len(restart_breakpoints) > 0:
+        checks.append(check_restart)
+    return checks
+
+
+def compile_breakpoints(
+    breakpoints: list[Breakpoint],
+    runtime_state: RuntimeState,
+    get_output_len: Callable[[], int],
+) -> StepBreaker | None:
+    # Breakpoints of a kind are looked up together, and only the kinds in use
+    # are checked. Watched values are taken as of now.
+    checks = [
+        __get_watch(breakpoint_, runtime_state, get_output_len).check
+        for breakpoint_ in breakpoints
+        if isinstance(breakpoint_, WatchBreakpoint)
+        or (isinstance(breakpoint_, EventBreakpoint) and breakpoint_.event == "over")
+    ]
+    checks.extend(__get_step_checks(breakpoints))
+
+    if len(checks) == 0:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(
+        operation_index: int | None,
+        step_result: StepResult,
+    ) -> Breakpoint | None:
+        # Every check runs, so that every watch sees every value.
+        hit_breakpoint: Breakpoint | None = None
+        for check in checks:
+            breakpoint_ = check(operation_index, step_result)
+            if hit_breakpoint is None:
+                hit_breakpoint = breakpoint_
+        return hit_breakpoint
+
+    return check_all
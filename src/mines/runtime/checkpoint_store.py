@@ -0,0 +1,78 @@
+from bisect import bisect_right, insort
+
+DEFAULT_CHECKPOINT_INTERVAL = 1024
+CHECKPOINTS_PER_LEVEL = 64
+# A checkpoint may hold this many values per step of the interval.
+MAX_CHECKPOINT_SIZE_PER_STEP = 16
+MAX_TOTAL_CHECKPOINT_SIZE = 1 << 24
+
+
+class CheckpointStore[T]:
+    # Checkpoints are taken every interval steps and thinned out with age. One
+    # older than CHECKPOINTS_PER_LEVEL intervals, doubled k times, is kept only
+    # at a multiple of the interval doubled k + 1 times. Going back d steps
+    # thus replays at most about d / CHECKPOINTS_PER_LEVEL * 2 steps, while
+    # the count of checkpoints grows only logarithmically. The interval itself
+    # doubles while checkpoints are large for it or too large in total.
+    __interval: int
+    __step_counts: list[int]
+    __checkpoints: dict[int, tuple[T, int]]
+    __total_size: int
+    __last_step_count: int
+
+    def __init__(self) -> None:
+        self.__interval = DEFAULT_CHECKPOINT_INTERVAL
+        self.__step_counts = []
+        self.__checkpoints = {}
+        self.__total_size = 0
+        self.__last_step_count = 0
+
+    def __is_kept(self, step_count: int) -> bool:
+        age_level = (
+            (self.__last_step_count - step_count)
+            // (CHECKPOINTS_PER_LEVEL * self.__interval)
+        ).bit_length()
+        return step_count % (self.__interval << age_level) == 0
+
+    def __prune(self) -> None:
+        kept_step_counts: list[int] = []
+        for step_count in self.__step_counts:
+            if self.__is_kept(step_count):
+                kept_step_counts.append(step_count)
+            else:
+                _, size = self.__checkpoints.pop(step_count)
+                self.__total_size -= size
+        self.__step_counts = kept_step_counts
+
+    def get_interval(self) -> int:
+        return self.__interval
+
+    def add(self, step_count: int, checkpoint: T, size: int) -> None:
+        # Steps replayed after going back may reach a step already checkpointed.
+        self.__last_step_count = max(self.__last_step_count, step_count)
+        if step_count in self.__checkpoints or not self.__is_kept(step_count):
+            return
+
+        insort(self.__step_counts, step_count)
+        self.__checkpoints[step_count] = (checkpoint, size)
+        self.__total_size += size
+
+        while size > self.__interval * MAX_CHECKPOINT_SIZE_PER_STEP:
+            self.__interval *= 2
+        while (
+            self.__total_size > MAX_TOTAL_CHECKPOINT_SIZE
+            and len(self.__step_counts) > 1
+        ):
+            self.__interval *= 2
+            self.__prune()
+        self.__prune()
+
+    def find(self, step_count: int) -> tuple[int, T]:
+        # Returns the last checkpoint at or before step_count.
+        found_step_count = self.__step_counts[
+            bisect_right(self.__step_counts, step_count) - 1
+        ]
+        return found_step_count, self.__checkpoints[found_step_count][0]
+
+    def __len__(self) -> int:
+        return len(self.__step_counts)
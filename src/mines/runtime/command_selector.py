@@ -1,4 +1,4 @@
-from mines.player.board import CellDigit
+from mines.player.board import BoardValues, CellDigit
 from mines.player.operation import (
     ClickOperation,
     ClickResult,
@@ -84,6 +84,22 @@ def __select_click_on_opened_command(
     return command
 
 
+def __select_click_on_unopened_command(
+    clicked_digit: CellDigit,
+    *,
+    is_left_click: bool,
+) -> Command:
+    if not is_left_click:
+        return SWAP_COMMAND
+    match clicked_digit:
+        case 0:
+            return PUSH_COUNT_COMMAND
+        case 9:
+            return RESET_L_COMMAND
+        case _:
+            return PUSH_N_COMMAND
+
+
 def __select_click_command(
     click_operation: ClickOperation,
     player: Player,
@@ -97,15 +113,10 @@ def __select_click_command(
 
     match click_result.previous_cell_state:
         case "unopened":
-            if click_result.is_left_click:
-                match clicked_digit:
-                    case 0:
-                        return PUSH_COUNT_COMMAND
-                    case 9:
-                        return RESET_L_COMMAND
-                    case _:
-                        return PUSH_N_COMMAND
-            return SWAP_COMMAND
+            return __select_click_on_unopened_command(
+                clicked_digit,
+                is_left_click=click_result.is_left_click,
+            )
         case "flagged":
             return NOOP_COMMAND if click_result.is_left_click else SWAP_COMMAND
         case "opened":
@@ -120,3 +131,20 @@ def select_command(operation: Operation, player: Player) -> Command:
             return REVERSE_COMMAND
         case ClickOperation():
             return __select_click_command(operation, player)
+
+
+def select_initial_command(
+    operation: Operation,
+    cell_digits: BoardValues[CellDigit],
+) -> Command:
+    # Selects the command as if all cells were unopened and flagging mode off.
+    match operation:
+        case NoOperation() | RestartOperation():
+            return NOOP_COMMAND
+        case SwitchOperation():
+            return REVERSE_COMMAND
+        case ClickOperation():
+            return __select_click_on_unopened_command(
+                cell_digits.get(operation.cell),
+                is_left_click=operation.is_left_button,
+            )
@@ -1,6 +1,8 @@
-import re
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
+from typing import NamedTuple
+
+from mines.runtime.integer_str import decimal_str_to_int
 
 
 class InputSource(ABC):
@@ -16,6 +18,11 @@ class InputSource(ABC):
     def get_buffered_len(self) -> int:
         pass
 
+    @abstractmethod
+    def peek(self, max_len: int) -> str:
+        # Returns the first buffered chars without reading more input.
+        pass
+
     @abstractmethod
     def get_is_eof_confirmed(self) -> bool:
         pass
@@ -26,58 +33,91 @@ class InputBufferInternalError(Exception):
         super().__init__(f"Internal error in input buffer: {message}")
 
 
+DIGIT_CHARS = frozenset("0123456789")
+INTEGER_HEAD_CHARS = DIGIT_CHARS | {"+", "-"}
+
+
+class IntegerToken(NamedTuple):
+    value: int | None
+    consumed_len: int
+
+
+NO_INTEGER_TOKEN = IntegerToken(value=None, consumed_len=0)
+
+
 class InputBuffer:
     __input_queue: InputSource
+    __max_integer_digits: int
+    __integer_token: IntegerToken | None
 
-    def __init__(self, input_source: InputSource) -> None:
+    def __init__(self, input_source: InputSource, max_integer_digits: int) -> None:
         self.__input_queue = input_source
+        self.__max_integer_digits = max_integer_digits
+        self.__integer_token = None
 
-    def __parse_next_integer(self, *, consume_buffer: bool) -> int | None:
+    def __parse_next_integer(self) -> IntegerToken:
         space_count = 0
-        matched_str = ""
+        matched_chars: list[str] = []
 
         for c in self.__input_queue:
-            if len(matched_str) == 0:
+            if len(matched_chars) == 0:
                 if c.isspace():
                     space_count += 1
                     continue
 
-                if re.compile(r"^[0-9+-]$").match(c):
-                    matched_str += c
+                if c in INTEGER_HEAD_CHARS:
+                    matched_chars.append(c)
                     continue
 
-                return None
+                return NO_INTEGER_TOKEN
 
-            if re.compile(r"^[0-9]$").match(c):
-                matched_str += c
+            if c in DIGIT_CHARS:
+                matched_chars.append(c)
             else:
                 break
 
-        if matched_str in ["", "+", "-"]:
-            return None
+        if len(matched_chars) == 0 or matched_chars[-1] not in DIGIT_CHARS:
+            return NO_INTEGER_TOKEN
 
-        if consume_buffer:
-            for _ in range(space_count + len(matched_str)):
-                self.__input_queue.dequeue()
+        return IntegerToken(
+            value=decimal_str_to_int("".join(matched_chars), self.__max_integer_digits),
+            consumed_len=space_count + len(matched_chars),
+        )
 
-        return int(matched_str)
+    def __get_integer_token(self) -> IntegerToken:
+        # The token ends at a non-digit or EOF, so reading more input never
+        # changes it. It stays valid until the input is consumed.
+        if self.__integer_token is None:
+            self.__integer_token = self.__parse_next_integer()
+        return self.__integer_token
 
     def validate_request_integer(self) -> bool:
-        return self.__parse_next_integer(consume_buffer=False) is not None
+        return self.__get_integer_token().value is not None
 
     def request_integer(self) -> int:
-        next_integer = self.__parse_next_integer(consume_buffer=True)
+        next_integer, consumed_len = self.__get_integer_token()
 
         if next_integer is None:
             message = "Input does not match an integer."
             raise InputBufferInternalError(message)
 
+        for _ in range(consumed_len):
+            self.__input_queue.dequeue()
+        self.__integer_token = None
+
         return next_integer
 
     def validate_request_char(self) -> bool:
+        if self.__input_queue.get_buffered_len() > 0:
+            return True
         for _ in self.__input_queue:
             return True
         return False
 
     def request_char(self) -> int:
+        self.__integer_token = None
         return ord(self.__input_queue.dequeue())
+
+    def discard_integer_token(self) -> None:
+        # Called when the input is rewound under the buffer.
+        self.__integer_token = None
@@ -0,0 +1,87 @@
+from functools import lru_cache
+from math import log10
+
+# Chunks are converted with built-in `str`/`int`, so keep them below the
+# smallest value `sys.set_int_max_str_digits` accepts (640).
+CHUNK_DIGITS = 512
+
+_LOG10_2 = log10(2)
+
+
+class IntegerDigitLimitError(Exception):
+    def __init__(self, digit_count: int, max_digits: int) -> None:
+        super().__init__(
+            f"Integer with {digit_count} digits exceeds the limit of {max_digits}.",
+        )
+
+
+def __get_chunk_powers(value: int) -> list[int]:
+    # powers[k] == 10 ** (CHUNK_DIGITS * 2 ** k), up to the first one above value.
+    powers = [10**CHUNK_DIGITS]
+    while powers[-1] <= value:
+        powers.append(powers[-1] * powers[-1])
+    return powers
+
+
+def __write_chunks(
+    value: int,
+    powers: list[int],
+    level: int,
+    chunks: list[str],
+    *,
+    is_padded: bool,
+) -> None:
+    if level < 0:
+        chunk = str(value)
+        chunks.append(chunk.zfill(CHUNK_DIGITS) if is_padded else chunk)
+        return
+
+    high, low = divmod(value, powers[level])
+    if high == 0 and not is_padded:
+        __write_chunks(low, powers, level - 1, chunks, is_padded=False)
+        return
+
+    __write_chunks(high, powers, level - 1, chunks, is_padded=is_padded)
+    __write_chunks(low, powers, level - 1, chunks, is_padded=True)
+
+
+def __check_digit_count(digit_count: int, max_digits: int) -> None:
+    if max_digits > 0 and digit_count > max_digits:
+        raise IntegerDigitLimitError(digit_count, max_digits)
+
+
+def int_to_decimal_str(value: int, max_digits: int) -> str:
+    abs_value = abs(value)
+    __check_digit_count(int(abs_value.bit_length() * _LOG10_2), max_digits)
+
+    powers = __get_chunk_powers(abs_value)
+    chunks = ["-"] if value < 0 else []
+    __write_chunks(abs_value, powers, len(powers) - 2, chunks, is_padded=False)
+    decimal_str = "".join(chunks)
+
+    __check_digit_count(len(decimal_str) - (value < 0), max_digits)
+    return decimal_str
+
+
+@lru_cache(maxsize=64)
+def __get_power_of_ten(exponent: int) -> int:
+    return 10**exponent
+
+
+def __read_chunks(digits: str, begin: int, end: int) -> int:
+    if end - begin <= CHUNK_DIGITS:
+        return int(digits[begin:end])
+
+    # Split so that the low part is a whole number of chunks.
+    low_len = ((end - begin) // 2 + CHUNK_DIGITS - 1) // CHUNK_DIGITS * CHUNK_DIGITS
+    middle = end - low_len
+    high = __read_chunks(digits, begin, middle)
+    low = __read_chunks(digits, middle, end)
+    return high * __get_power_of_ten(low_len) + low
+
+
+def decimal_str_to_int(decimal_str: str, max_digits: int) -> int:
+    sign_len = 1 if decimal_str[:1] in ("+", "-") else 0
+    __check_digit_count(len(decimal_str) - sign_len, max_digits)
+    abs_value = __read_chunks(decimal_str, sign_len, len(decimal_str))
+    return -abs_value if decimal_str[:1] == "-" else abs_value
@@ -0,0 +1,65 @@
+from array import array
+from collections import Counter
+from typing import NamedTuple, get_args
+
+from mines.runtime.command_type import CommandErrorType, CommandType
+
+COMMAND_TYPES: tuple[CommandType, ...] = get_args(CommandType)
+COMMAND_TYPE_IDS: dict[CommandType, int] = {
+    command_type: command_id for command_id, command_type in enumerate(COMMAND_TYPES)
+}
+
+
+class SkipJump(NamedTuple):
+    operation_index: int
+    target_index: int
+
+
+class OperationCounter:
+    # Counts are kept in one flat array indexed by (operation index, command),
+    # so that a step costs a single increment. Operations queued by commands
+    # are counted at the extra index after the operation list.
+    __operation_count: int
+    __counts: array[int]
+    __skip_jumps: Counter[SkipJump]
+
+    def __init__(self, operation_count: int) -> None:
+        self.__operation_count = operation_count
+        self.__counts = array("Q", [0]) * ((operation_count + 1) * len(COMMAND_TYPES))
+        self.__skip_jumps = Counter()
+
+    def record_step(
+        self,
+        operation_index: int | None,
+        command_type: CommandType,
+        command_error_type: CommandErrorType | None,
+        next_operation_index: int,
+    ) -> None:
+        if operation_index is None:
+            operation_index = self.__operation_count
+        elif command_type == "skip" and command_error_type is None:
+            self.__skip_jumps[SkipJump(operation_index, next_operation_index)] += 1
+
+        self.__counts[
+            operation_index * len(COMMAND_TYPES) + COMMAND_TYPE_IDS[command_type]
+        ] += 1
+
+    def get_operation_count(self) -> int:
+        return self.__operation_count
+
+    def get_command_counts(self, operation_index: int | None) -> dict[CommandType, int]:
+        if operation_index is None:
+            operation_index = self.__operation_count
+        begin = operation_index * len(COMMAND_TYPES)
+        return {
+            command_type: count
+            for command_type, count in zip(
+                COMMAND_TYPES,
+                self.__counts[begin : begin + len(COMMAND_TYPES)],
+                strict=True,
+            )
+            if count > 0
+        }
+
+    def get_skip_jumps(self) -> Counter[SkipJump]:
+        return self.__skip_jumps
@@ -1,17 +1,21 @@
 from mines.player.operation import Operation
+from mines.program.operation_list import OperationList
 
 
 class OperationPointer:
-    __operation_list: list[Operation]
+    __operation_list: OperationList
     __index: int
 
-    def __init__(self, operation_list: list[Operation]) -> None:
+    def __init__(self, operation_list: OperationList) -> None:
         self.__operation_list = operation_list
         self.__index = 0
 
     def advance(self, n: int) -> None:
         self.__index = (self.__index + n) % len(self.__operation_list)
 
+    def get_index(self) -> int:
+        return self.__index
+
     def request_operation(self) -> Operation:
         operation = self.__operation_list[self.__index]
         self.advance(1)
@@ -1,19 +1,33 @@
-from typing import TextIO
+from abc import ABC, abstractmethod
+
+from mines.runtime.integer_str import int_to_decimal_str
 
 MAX_UNICODE_CODEPOINT = 0x10FFFF
 
 
+class OutputSink(ABC):
+    @abstractmethod
+    def write(self, value: str) -> None:
+        pass
+
+    @abstractmethod
+    def write_code_point(self, code_point: int) -> None:
+        pass
+
+
 class OutputBuffer:
-    __output_io: TextIO
+    __output_sink: OutputSink
+    __max_integer_digits: int
 
-    def __init__(self, output_io: TextIO) -> None:
-        self.__output_io = output_io
+    def __init__(self, output_sink: OutputSink, max_integer_digits: int) -> None:
+        self.__output_sink = output_sink
+        self.__max_integer_digits = max_integer_digits
 
     def write_as_integer(self, value: int) -> None:
-        self.__output_io.write(str(value))
+        self.__output_sink.write(int_to_decimal_str(value, self.__max_integer_digits))
 
     def validate_write_as_char(self, value: int) -> bool:
         return 0 <= value <= MAX_UNICODE_CODEPOINT
 
     def write_as_char(self, value: int) -> None:
-        self.__output_io.write(chr(value))
+        self.__output_sink.write_code_point(value)
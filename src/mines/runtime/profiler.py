@@ -0,0 +1,113 @@
+from collections import Counter
+
+from mines.player.operation import ClickResult, RestartOperation
+from mines.runtime.command_type import CommandErrorType, CommandType
+from mines.runtime.runner import StepResult
+
+# Latencies are bucketed by their top bits, so that every bucket spans at most
+# 1/8 of its lower bound.
+LATENCY_SUB_BUCKET_BITS = 3
+
+
+def get_latency_bucket(latency_ns: int) -> int:
+    shift = max(latency_ns.bit_length() - LATENCY_SUB_BUCKET_BITS - 1, 0)
+    return (shift << LATENCY_SUB_BUCKET_BITS) + (latency_ns >> shift)
+
+
+def get_latency_bucket_upper_bound(bucket: int) -> int:
+    shift = max((bucket >> LATENCY_SUB_BUCKET_BITS) - 1, 0)
+    mantissa = bucket - (shift << LATENCY_SUB_BUCKET_BITS)
+    return ((mantissa + 1) << shift) - 1
+
+
+class Profiler:
+    __command_counts: Counter[CommandType]
+    __command_times_ns: Counter[CommandType]
+    __command_error_counts: Counter[tuple[CommandType, CommandErrorType]]
+    __latency_bucket_counts: Counter[int]
+    __restart_count: int
+    __game_over_count: int
+    __flood_fill_count: int
+    __flood_fill_cell_count: int
+    __max_flood_fill_size: int
+
+    def __init__(self) -> None:
+        self.__command_counts = Counter()
+        self.__command_times_ns = Counter()
+        self.__command_error_counts = Counter()
+        self.__latency_bucket_counts = Counter()
+        self.__restart_count = 0
+        self.__game_over_count = 0
+        self.__flood_fill_count = 0
+        self.__flood_fill_cell_count = 0
+        self.__max_flood_fill_size = 0
+
+    def record_step(
+        self,
+        step_result: StepResult,
+        click_result: ClickResult | None,
+        latency_ns: int,
+    ) -> None:
+        operation, command_type, command_error_type = step_result
+        self.__command_counts[command_type] += 1
+        self.__command_times_ns[command_type] += latency_ns
+        if command_error_type is not None:
+            self.__command_error_counts[command_type, command_error_type] += 1
+        self.__latency_bucket_counts[get_latency_bucket(latency_ns)] += 1
+
+        if isinstance(operation, RestartOperation):
+            self.__restart_count += 1
+        if click_result is None or click_result.open_result is None:
+            return
+        if click_result.open_result == "over":
+            self.__game_over_count += 1
+            return
+        opened_count = len(click_result.open_result)
+        self.__flood_fill_count += 1
+        self.__flood_fill_cell_count += opened_count
+        self.__max_flood_fill_size = max(self.__max_flood_fill_size, opened_count)
+
+    def get_step_count(self) -> int:
+        return self.__command_counts.total()
+
+    def get_command_counts(self) -> Counter[CommandType]:
+        return self.__command_counts
+
+    def get_command_times_ns(self) -> Counter[CommandType]:
+        return self.__command_times_ns
+
+    def get_command_error_counts(
+        self,
+    ) -> Counter[tuple[CommandType, CommandErrorType]]:
+        return self.__command_error_counts
+
+    def get_latency_percentile_ns(self, percentile: float) -> int:
+        rank = self.get_step_count() * percentile / 100
+        cumulative_count = 0
+        for bucket in sorted(self.__latency_bucket_counts):
+            cumulative_count += self.__latency_bucket_counts[bucket]
+            if cumulative_count >= rank:
+                return get_latency_bucket_upper_bound(bucket)
+        return 0
+
+    def get_latency_histogram(self) -> list[tuple[int, int]]:
+        # Buckets are merged by powers of two for display.
+        histogram: Counter[int] = Counter()
+        for bucket, count in self.__latency_bucket_counts.items():
+            histogram[get_latency_bucket_upper_bound(bucket).bit_length()] += count
+        return sorted(histogram.items())
+
+    def get_restart_count(self) -> int:
+        return self.__restart_count
+
+    def get_game_over_count(self) -> int:
+        return self.__game_over_count
+
+    def get_flood_fill_count(self) -> int:
+        return self.__flood_fill_count
+
+    def get_flood_fill_cell_count(self) -> int:
+        return self.__flood_fill_cell_count
+
+    def get_max_flood_fill_size(self) -> int:
+        return self.__max_flood_fill_size
@@ -1,15 +1,17 @@
 from collections import deque
 from collections.abc import Callable
-from typing import NamedTuple, TextIO
+from time import perf_counter_ns
+from typing import NamedTuple
 
-from mines.player.operation import Operation
+from mines.player.operation import ClickResult, Operation
 from mines.player.player import Player
 from mines.program.program import Program
 from mines.runtime.command_selector import select_command
 from mines.runtime.command_type import CommandErrorType, CommandType
 from mines.runtime.input_buffer import InputBuffer, InputSource
+from mines.runtime.operation_counter import OperationCounter
 from mines.runtime.operation_pointer import OperationPointer
-from mines.runtime.output_buffer import OutputBuffer
+from mines.runtime.output_buffer import OutputBuffer, OutputSink
 from mines.runtime.runtime_state import RuntimeState
 from mines.runtime.stack import Stack
 
@@ -22,27 +24,40 @@ class StepResult(NamedTuple):
 
 StepListener = Callable[[StepResult], None]
 
+# Receives each step with its click result and latency in nanoseconds.
+StepProfiler = Callable[[StepResult, ClickResult | None, int], None]
+
+# Receives each step with the index of its operation (None if it was queued).
+StepTracer = Callable[[int | None, StepResult], None]
+
 
 class Runner:
     __runtime_state: RuntimeState
     __step_listener: StepListener | None
+    __step_profiler: StepProfiler | None
+    __operation_counter: OperationCounter | None
+    __step_tracer: StepTracer | None
 
     def __init__(
         self,
         program: Program,
         input_source: InputSource,
-        output_io: TextIO,
+        output_sink: OutputSink,
         step_listener: StepListener | None,
+        max_integer_digits: int,
     ) -> None:
         self.__runtime_state = RuntimeState(
             Player(program.cell_digits),
             OperationPointer(program.operation_list),
             deque(),
             Stack(),
-            InputBuffer(input_source),
-            OutputBuffer(output_io),
+            InputBuffer(input_source, max_integer_digits),
+            OutputBuffer(output_sink, max_integer_digits),
         )
         self.__step_listener = step_listener
+        self.__step_profiler = None
+        self.__operation_counter = None
+        self.__step_tracer = None
 
     def __get_next_operation(self) -> Operation:
         runtime_state = self.__runtime_state
@@ -52,7 +67,27 @@ class Runner:
             )
         return runtime_state.operation_queue.popleft()
 
+    def __perform_next_operation(self) -> StepResult | None:
+        runtime_state = self.__runtime_state
+        player_state = runtime_state.player.get_player_state()
+
+        if player_state.game_status == "cleared":
+            return None
+
+        operation = self.__get_next_operation()
+        runtime_state.player.perform_operation(operation)
+        command = select_command(operation, runtime_state.player)
+        command_error_type = (
+            command.validate(runtime_state) if command.validate else None
+        )
+        if command_error_type is None:
+            command.execute(runtime_state)
+
+        return StepResult(operation, command.name, command_error_type)
+
     def __process_next_operation(self) -> bool:
+        # Same as __perform_next_operation, but builds no step result unless a
+        # listener needs it, since this is the hot path of the plain run.
         runtime_state = self.__runtime_state
         player_state = runtime_state.player.get_player_state()
 
@@ -74,9 +109,72 @@ class Runner:
 
         return True
 
+    def __run_instrumented(self) -> None:
+        # A separate loop keeps the instrumentation out of the plain path.
+        runtime_state = self.__runtime_state
+        player = runtime_state.player
+        operation_pointer = runtime_state.operation_pointer
+        operation_queue = runtime_state.operation_queue
+        step_profiler = self.__step_profiler
+        operation_counter = self.__operation_counter
+        step_tracer = self.__step_tracer
+        while True:
+            operation_index = (
+                operation_pointer.get_index() if len(operation_queue) == 0 else None
+            )
+            begin_ns = perf_counter_ns()
+            step_result = self.__perform_next_operation()
+            if step_result is None:
+                return
+            latency_ns = perf_counter_ns() - begin_ns
+
+            if step_profiler is not None:
+                step_profiler(step_result, player.get_last_click_result(), latency_ns)
+            if operation_counter is not None:
+                operation_counter.record_step(
+                    operation_index,
+                    step_result.command_type,
+                    step_result.command_error_type,
+                    operation_pointer.get_index(),
+                )
+            if step_tracer is not None:
+                step_tracer(operation_index, step_result)
+            if self.__step_listener:
+                self.__step_listener(step_result)
+
     def run(self) -> None:
+        if (
+            self.__step_profiler is not None
+            or self.__operation_counter is not None
+            or self.__step_tracer is not None
+        ):
+            self.__run_instrumented()
+            return
+
         while self.__process_next_operation():
             pass
 
+    def step(self) -> StepResult | None:
+        # Performs one step without any listener, or returns None if cleared.
+        return self.__perform_next_operation()
+
+    def run_steps(self, max_step_count: int) -> int:
+        step_count = 0
+        while step_count < max_step_count and self.__process_next_operation():
+            step_count += 1
+        return step_count
+
+    def set_step_profiler(self, step_profiler: StepProfiler | None) -> None:
+        self.__step_profiler = step_profiler
+
+    def set_operation_counter(
+        self,
+        operation_counter: OperationCounter | None,
+    ) -> None:
+        self.__operation_counter = operation_counter
+
+    def set_step_tracer(self, step_tracer: StepTracer | None) -> None:
+        self.__step_tracer = step_tracer
+
     def get_runtime_state(self) -> RuntimeState:
         return self.__runtime_state
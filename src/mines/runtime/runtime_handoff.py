@@ -0,0 +1,57 @@
+from queue import Queue
+from threading import Event
+from typing import Literal
+
+# What the worker thread answers when the UI thread asks for the state.
+HandoffResult = Literal["lent", "reading", "finished"]
+
+
+class RuntimeHandoff:
+    # The runtime state is owned by a worker thread running steps in batches.
+    # Between batches it is lent to the UI thread only if asked for, so that
+    # the worker never waits for the UI otherwise. Once a pause is requested,
+    # the state is never lent again and the worker finishes.
+    __is_lend_requested: Event
+    __is_pause_requested: Event
+    __result_queue: Queue[HandoffResult]
+    __return_queue: Queue[None]
+
+    def __init__(self) -> None:
+        self.__is_lend_requested = Event()
+        self.__is_pause_requested = Event()
+        self.__result_queue = Queue()
+        self.__return_queue = Queue()
+
+    def request_pause(self) -> None:
+        self.__is_pause_requested.set()
+
+    def is_pause_requested(self) -> bool:
+        return self.__is_pause_requested.is_set()
+
+    def lend_if_requested(self) -> None:
+        # Called by the worker between batches.
+        if not self.__is_lend_requested.is_set() or self.is_pause_requested():
+            return
+        self.__is_lend_requested.clear()
+        self.__result_queue.put("lent")
+        self.__return_queue.get()
+
+    def wait_before_reading(self) -> None:
+        # Called by the worker before it reads input from the terminal, to
+        # wait until the UI thread stops using it.
+        self.__result_queue.put("reading")
+        self.__return_queue.get()
+
+    def finish(self) -> None:
+        # Called by the worker when it stops running steps.
+        self.__result_queue.put("finished")
+
+    def borrow(self) -> HandoffResult:
+        # Called by the UI thread, which must call give_back afterwards. The
+        # UI thread must not use the terminal until the next borrow if the
+        # worker is reading.
+        self.__is_lend_requested.set()
+        return self.__result_queue.get()
+
+    def give_back(self) -> None:
+        self.__return_queue.put(None)
@@ -0,0 +1,47 @@
+from typing import NamedTuple
+
+from mines.player.operation import Operation
+from mines.player.player import PlayerSnapshot
+from mines.runtime.runtime_state import RuntimeState
+from mines.runtime.stack import StackSnapshot
+
+
+class RuntimeSnapshot(NamedTuple):
+    player_snapshot: PlayerSnapshot
+    operation_index: int
+    operation_queue: tuple[Operation, ...]
+    stack_snapshot: StackSnapshot
+
+    def get_size(self) -> int:
+        player_snapshot = self.player_snapshot
+        return (
+            len(player_snapshot.opened_cells)
+            + len(player_snapshot.flagged_cells)
+            + sum(len(side) for side in self.stack_snapshot.sides)
+        )
+
+
+def take_runtime_snapshot(runtime_state: RuntimeState) -> RuntimeSnapshot:
+    # The input and output are not included, as their sources and sinks
+    # decide how far they can be rewound.
+    return RuntimeSnapshot(
+        player_snapshot=runtime_state.player.get_snapshot(),
+        operation_index=runtime_state.operation_pointer.get_index(),
+        operation_queue=tuple(runtime_state.operation_queue),
+        stack_snapshot=runtime_state.stack.get_snapshot(),
+    )
+
+
+def restore_runtime_snapshot(
+    runtime_state: RuntimeState,
+    runtime_snapshot: RuntimeSnapshot,
+) -> None:
+    runtime_state.player.restore_snapshot(runtime_snapshot.player_snapshot)
+    operation_pointer = runtime_state.operation_pointer
+    operation_pointer.advance(
+        runtime_snapshot.operation_index - operation_pointer.get_index(),
+    )
+    runtime_state.operation_queue.clear()
+    runtime_state.operation_queue.extend(runtime_snapshot.operation_queue)
+    runtime_state.stack.restore_snapshot(runtime_snapshot.stack_snapshot)
+    runtime_state.input_buffer.discard_integer_token()
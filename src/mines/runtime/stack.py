@@ -1,67 +1,120 @@
-from collections import deque
+from array import array
+from typing import NamedTuple
 
 MIN_ABS_ROLL_DEPTH = 2
 
+STACK_ARRAY_TYPECODE = "q"
+
+StackValues = array[int] | list[int]
+
+
+class StackSnapshot(NamedTuple):
+    sides: tuple[StackValues, StackValues]
+    top_side_index: int
+
 
 class Stack:
-    __deque: deque[int]
-    __is_reversed: bool
+    # Values are split into two sides growing outward from the middle, so that
+    # both ends can be pushed to and popped from. Each side keeps its outermost
+    # value at the end. Sides are 64-bit arrays until a value does not fit.
+    __sides: list[StackValues]
+    __top_side_index: int
 
     def __init__(self) -> None:
-        self.__deque = deque()
-        self.__is_reversed = False
+        self.__sides = [array(STACK_ARRAY_TYPECODE), array(STACK_ARRAY_TYPECODE)]
+        self.__top_side_index = 1
 
     def __len__(self) -> int:
-        return len(self.__deque)
+        return len(self.__sides[0]) + len(self.__sides[1])
 
     def __str__(self) -> str:
-        return ", ".join(
-            [
-                str(value)
-                for value in (
-                    reversed(self.__deque) if self.__is_reversed else self.__deque
-                )
-            ],
-        )
+        return ", ".join([str(value) for value in self.get_values()])
+
+    def __promote(self) -> None:
+        self.__sides = [list(side) for side in self.__sides]
+
+    def __fill_side(self, side_index: int, count: int) -> None:
+        # Moving at least half of the values keeps pops amortized O(1).
+        side = self.__sides[side_index]
+        other_side = self.__sides[1 - side_index]
+        move_count = max(count, (len(self) + 1) // 2) - len(side)
+        moved_values = other_side[:move_count]
+        moved_values.reverse()
+        moved_values.extend(side)
+        del other_side[:move_count]
+        self.__sides[side_index] = moved_values
 
     def peek(self, top_index: int) -> int:
-        if self.__is_reversed:
-            return self.__deque[top_index]
-        return self.__deque[-1 - top_index]
+        top_side_index = self.__top_side_index
+        top_side = self.__sides[top_side_index]
+        if top_index < len(top_side):
+            return top_side[-1 - top_index]
+        return self.__sides[1 - top_side_index][top_index - len(top_side)]
 
     def get_pops(self, pop_count: int) -> list[int]:
-        if self.__is_reversed:
-            return [self.__deque.popleft() for _ in range(pop_count)]
-        return [self.__deque.pop() for _ in range(pop_count)]
+        top_side = self.__sides[self.__top_side_index]
+        if len(top_side) < pop_count:
+            self.__fill_side(self.__top_side_index, pop_count)
+            top_side = self.__sides[self.__top_side_index]
+        return [top_side.pop() for _ in range(pop_count)]
 
     def push(self, *value: int) -> None:
-        if self.__is_reversed:
-            self.__deque.extendleft(value)
-        else:
-            self.__deque.extend(value)
+        top_side_index = self.__top_side_index
+        for item in value:
+            try:
+                self.__sides[top_side_index].append(item)
+            except OverflowError:
+                self.__promote()
+                self.__sides[top_side_index].append(item)
 
     def reverse(self) -> None:
-        self.__is_reversed ^= True
+        self.__top_side_index ^= 1
 
     def roll(self, depth: int, roll_time: int) -> None:
-        if abs(depth) < MIN_ABS_ROLL_DEPTH:
+        abs_depth = abs(depth)
+        if abs_depth < MIN_ABS_ROLL_DEPTH:
             return
 
-        if depth < -1:
-            self.reverse()
-            self.roll(-depth, roll_time)
-            self.reverse()
-            return
-
-        roll_time_rem = roll_time % depth
+        roll_time_rem = roll_time % abs_depth
 
         if roll_time_rem == 0:
             return
 
-        bottoms = self.get_pops(roll_time_rem)
-        tops = self.get_pops(depth - roll_time_rem)
-        self.push(*reversed(bottoms))
-        self.push(*reversed(tops))
+        top_side_index = self.__top_side_index
+        side_index = top_side_index if depth > 0 else 1 - top_side_index
+        if len(self.__sides[side_index]) < abs_depth:
+            self.__fill_side(side_index, abs_depth)
+        # The top roll_time_rem values of the window move under the others.
+        # Only the smaller part is copied aside, and the rest is shifted in
+        # place by the slice deletion and insertion.
+        side = self.__sides[side_index]
+        window_start = len(side) - abs_depth
+        if roll_time_rem <= abs_depth - roll_time_rem:
+            tops = side[-roll_time_rem:]
+            del side[-roll_time_rem:]
+            side[window_start:window_start] = tops
+        else:
+            bottoms = side[window_start:-roll_time_rem]
+            del side[window_start:-roll_time_rem]
+            side.extend(bottoms)
+
+    def get_values(self) -> list[int]:
+        # Values are ordered from the bottom to the top.
+        top_side_index = self.__top_side_index
+        return [
+            *reversed(self.__sides[1 - top_side_index]),
+            *self.__sides[top_side_index],
+        ]
 
     def clear(self) -> None:
-        self.__deque.clear()
+        self.__sides = [array(STACK_ARRAY_TYPECODE), array(STACK_ARRAY_TYPECODE)]
+
+    def get_snapshot(self) -> StackSnapshot:
+        return StackSnapshot(
+            (self.__sides[0][:], self.__sides[1][:]),
+            self.__top_side_index,
+        )
+
+    def restore_snapshot(self, snapshot: StackSnapshot) -> None:
+        self.__sides = [side[:] for side in snapshot.sides]
+        self.__top_side_index = snapshot.top_side_index
@@ -0,0 +1,101 @@
+from struct import Struct
+from typing import NamedTuple, get_args
+
+from mines.player.board import CellState
+from mines.runtime.command_type import CommandErrorType, CommandType
+
+TRACE_MAGIC = b"MINEST"
+TRACE_VERSION = 1
+TRACE_TRAILER_MAGIC = b"MINESTIX"
+DEFAULT_SNAPSHOT_INTERVAL = 1 << 12
+# Every this many blocks, the snapshot keeps no values of the previous one, so
+# that a stack is restored from at most this many snapshots.
+FULL_SNAPSHOT_BLOCK_INTERVAL = 16
+
+# magic, version, snapshot interval, board width, board height
+TRACE_HEADER = Struct("<6sHIII")
+# tag, payload length
+CHUNK_HEADER = Struct("<cQ")
+# operation index (-1 if queued), operation code, command id, command error id
+# (0 if none), click flags, opened cell count
+STEP_RECORD = Struct("<qQBBBI")
+# kept value count from the bottom of the last snapshot, new value count
+SNAPSHOT_HEADER = Struct("<QQ")
+VALUE_LEN = Struct("<I")
+# first step index, snapshot chunk offset, steps chunk offset
+INDEX_ENTRY = Struct("<QQQ")
+# index chunk offset, magic
+TRACE_TRAILER = Struct("<Q8s")
+
+STEPS_CHUNK_TAG = b"S"
+SNAPSHOT_CHUNK_TAG = b"K"
+INDEX_CHUNK_TAG = b"I"
+
+COMMAND_ID_OFFSET = 16
+CLICK_FLAGS_OFFSET = 18
+
+COMMAND_TYPES: tuple[CommandType, ...] = get_args(CommandType)
+COMMAND_ERROR_TYPES: tuple[CommandErrorType, ...] = get_args(CommandErrorType)
+CELL_STATES: tuple[CellState, ...] = get_args(CellState)
+
+# Click flags pack whether a click happened, its button, the previous cell state
+# and the kind of the open result.
+CLICKED_FLAG = 0x01
+LEFT_CLICK_FLAG = 0x02
+PREVIOUS_CELL_STATE_SHIFT = 2
+PREVIOUS_CELL_STATE_MASK = 0x03
+OPENED_FLAG = 0x10
+GAME_OVER_FLAG = 0x20
+
+
+class TraceFormatError(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(f"Invalid Mines trace: {message}")
+
+
+class TraceStep(NamedTuple):
+    step_index: int
+    operation_index: int | None
+    operation_code: int
+    command_type: CommandType
+    command_error_type: CommandErrorType | None
+    previous_cell_state: CellState | None
+    is_left_click: bool | None
+    is_game_over: bool
+    opened_count: int
+
+
+def encode_value(value: int) -> bytes:
+    value_bytes = value.to_bytes((value.bit_length() + 8) // 8, signed=True)
+    return VALUE_LEN.pack(len(value_bytes)) + value_bytes
+
+
+def decode_step(step_index: int, record: tuple[int, ...]) -> TraceStep:
+    (
+        operation_index,
+        operation_code,
+        command_id,
+        command_error_id,
+        click_flags,
+        opened_count,
+    ) = record
+    is_clicked = click_flags & CLICKED_FLAG != 0
+    return TraceStep(
+        step_index=step_index,
+        operation_index=operation_index if operation_index >= 0 else None,
+        operation_code=operation_code,
+        command_type=COMMAND_TYPES[command_id],
+        command_error_type=(
+            COMMAND_ERROR_TYPES[command_error_id - 1] if command_error_id > 0 else None
+        ),
+        previous_cell_state=(
+            CELL_STATES[
+                click_flags >> PREVIOUS_CELL_STATE_SHIFT & PREVIOUS_CELL_STATE_MASK
+            ]
+            if is_clicked
+            else None
+        ),
+        is_left_click=click_flags & LEFT_CLICK_FLAG != 0 if is_clicked else None,
+        is_game_over=click_flags & GAME_OVER_FLAG != 0,
+        opened_count=opened_count,
+    )
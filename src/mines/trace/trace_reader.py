@@ -0,0 +1,238 @@
+from collections.abc import Iterator
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from typing import NamedTuple
+
+from mines.player.board import BoardSize
+from mines.runtime.command_type import CommandType
+from mines.trace.trace_format import (
+    CHUNK_HEADER,
+    CLICK_FLAGS_OFFSET,
+    COMMAND_ID_OFFSET,
+    COMMAND_TYPES,
+    GAME_OVER_FLAG,
+    INDEX_CHUNK_TAG,
+    INDEX_ENTRY,
+    SNAPSHOT_CHUNK_TAG,
+    SNAPSHOT_HEADER,
+    STEP_RECORD,
+    STEPS_CHUNK_TAG,
+    TRACE_HEADER,
+    TRACE_MAGIC,
+    TRACE_TRAILER,
+    TRACE_TRAILER_MAGIC,
+    TRACE_VERSION,
+    VALUE_LEN,
+    TraceFormatError,
+    TraceStep,
+    decode_step,
+)
+
+GAME_OVER_TABLE = bytes(1 if flags & GAME_OVER_FLAG else 0 for flags in range(256))
+
+
+class TraceBlock(NamedTuple):
+    first_step_index: int
+    snapshot_offset: int
+    records_begin: int
+    records_end: int
+
+
+class TraceReader:
+    # The trace is memory-mapped, and steps are located through the index of
+    # blocks. A trace without the index (e.g. of a killed run) is scanned.
+    __mapping: mmap
+    __board_size: BoardSize
+    __snapshot_interval: int
+    __blocks: list[TraceBlock]
+
+    def __init__(self, trace_path: Path) -> None:
+        if trace_path.stat().st_size < TRACE_HEADER.size:
+            message = "header is truncated."
+            raise TraceFormatError(message)
+        with trace_path.open("rb") as f:
+            self.__mapping = mmap(f.fileno(), 0, access=ACCESS_READ)
+        magic, version, snapshot_interval, width, height = TRACE_HEADER.unpack_from(
+            self.__mapping,
+        )
+        if magic != TRACE_MAGIC:
+            message = "magic number does not match."
+            raise TraceFormatError(message)
+        if version != TRACE_VERSION:
+            message = f"version {version} is not supported."
+            raise TraceFormatError(message)
+
+        self.__board_size = BoardSize(width=width, height=height)
+        self.__snapshot_interval = snapshot_interval
+        self.__blocks = self.__read_index() or self.__scan_blocks()
+
+    def __del__(self) -> None:
+        self.__mapping.close()
+
+    def __get_block(self, snapshot_offset: int, steps_offset: int) -> TraceBlock:
+        _, payload_len = CHUNK_HEADER.unpack_from(self.__mapping, steps_offset)
+        records_begin = steps_offset + CHUNK_HEADER.size
+        return TraceBlock(
+            first_step_index=0,
+            snapshot_offset=snapshot_offset,
+            records_begin=records_begin,
+            records_end=records_begin + payload_len,
+        )
+
+    def __read_index(self) -> list[TraceBlock] | None:
+        mapping = self.__mapping
+        if len(mapping) < TRACE_HEADER.size + TRACE_TRAILER.size:
+            return None
+        index_offset, trailer_magic = TRACE_TRAILER.unpack_from(
+            mapping,
+            len(mapping) - TRACE_TRAILER.size,
+        )
+        if trailer_magic != TRACE_TRAILER_MAGIC:
+            return None
+
+        tag, payload_len = CHUNK_HEADER.unpack_from(mapping, index_offset)
+        if tag != INDEX_CHUNK_TAG:
+            return None
+        payload_begin = index_offset + CHUNK_HEADER.size
+        index_entries = INDEX_ENTRY.iter_unpack(
+            mapping[payload_begin : payload_begin + payload_len],
+        )
+        return [
+            self.__get_block(snapshot_offset, steps_offset)._replace(
+                first_step_index=first_step_index,
+            )
+            for first_step_index, snapshot_offset, steps_offset in index_entries
+        ]
+
+    def __scan_blocks(self) -> list[TraceBlock]:
+        mapping = self.__mapping
+        blocks: list[TraceBlock] = []
+        step_count = 0
+        snapshot_offset = 0
+        offset = TRACE_HEADER.size
+        while offset + CHUNK_HEADER.size <= len(mapping):
+            tag, payload_len = CHUNK_HEADER.unpack_from(mapping, offset)
+            chunk_end = offset + CHUNK_HEADER.size + payload_len
+            if chunk_end > len(mapping):
+                break
+
+            if tag == SNAPSHOT_CHUNK_TAG:
+                snapshot_offset = offset
+            elif tag == STEPS_CHUNK_TAG:
+                block = self.__get_block(snapshot_offset, offset)._replace(
+                    first_step_index=step_count,
+                )
+                blocks.append(block)
+                step_count += payload_len // STEP_RECORD.size
+            offset = chunk_end
+        return blocks
+
+    def __len__(self) -> int:
+        if len(self.__blocks) == 0:
+            return 0
+        last_block = self.__blocks[-1]
+        return last_block.first_step_index + (
+            (last_block.records_end - last_block.records_begin) // STEP_RECORD.size
+        )
+
+    def get_board_size(self) -> BoardSize:
+        return self.__board_size
+
+    def get_step(self, step_index: int) -> TraceStep:
+        if not 0 <= step_index < len(self):
+            message = f"Step {step_index} is out of the trace."
+            raise IndexError(message)
+
+        block = self.__blocks[step_index // self.__snapshot_interval]
+        offset = (
+            block.records_begin
+            + (step_index - block.first_step_index) * STEP_RECORD.size
+        )
+        return decode_step(step_index, STEP_RECORD.unpack_from(self.__mapping, offset))
+
+    def iterate_steps(self, begin_step_index: int = 0) -> Iterator[TraceStep]:
+        for block in self.__blocks[begin_step_index // self.__snapshot_interval :]:
+            skipped_count = max(begin_step_index - block.first_step_index, 0)
+            records = self.__mapping[
+                block.records_begin
+                + skipped_count * STEP_RECORD.size : block.records_end
+            ]
+            for record_index, record in enumerate(STEP_RECORD.iter_unpack(records)):
+                yield decode_step(
+                    block.first_step_index + skipped_count + record_index,
+                    record,
+                )
+
+    def __iterate_matched_steps(
+        self,
+        field_offset: int,
+        table: bytes | None,
+        matched_byte: bytes,
+    ) -> Iterator[TraceStep]:
+        # One field of all records in a block is sliced out at once and searched
+        # in C, so that unmatched steps are never decoded.
+        for block in self.__blocks:
+            field_bytes = self.__mapping[
+                block.records_begin
+                + field_offset : block.records_end : STEP_RECORD.size
+            ]
+            if table is not None:
+                field_bytes = field_bytes.translate(table)
+            record_index = field_bytes.find(matched_byte)
+            while record_index >= 0:
+                yield self.get_step(block.first_step_index + record_index)
+                record_index = field_bytes.find(matched_byte, record_index + 1)
+
+    def iterate_command_steps(self, command_type: CommandType) -> Iterator[TraceStep]:
+        return self.__iterate_matched_steps(
+            COMMAND_ID_OFFSET,
+            None,
+            bytes([COMMAND_TYPES.index(command_type)]),
+        )
+
+    def iterate_game_over_steps(self) -> Iterator[TraceStep]:
+        return self.__iterate_matched_steps(
+            CLICK_FLAGS_OFFSET,
+            GAME_OVER_TABLE,
+            b"\x01",
+        )
+
+    def __get_snapshot_header(self, block: TraceBlock) -> tuple[int, int]:
+        return SNAPSHOT_HEADER.unpack_from(
+            self.__mapping,
+            block.snapshot_offset + CHUNK_HEADER.size,
+        )
+
+    def get_stack_snapshot(self, step_index: int) -> tuple[int, list[int]]:
+        # Returns the stack before the last snapshotted step at or before
+        # step_index, with its index. Deltas are applied from the last snapshot
+        # of the whole stack, which is at most FULL_SNAPSHOT_BLOCK_INTERVAL
+        # blocks before (or the first one in a trace of an older writer).
+        mapping = self.__mapping
+        block_index = min(
+            step_index // self.__snapshot_interval,
+            len(self.__blocks) - 1,
+        )
+        if block_index < 0:
+            return 0, []
+
+        full_block_index = block_index
+        while (
+            full_block_index > 0
+            and self.__get_snapshot_header(self.__blocks[full_block_index])[0] > 0
+        ):
+            full_block_index -= 1
+
+        stack_values: list[int] = []
+        for block in self.__blocks[full_block_index : block_index + 1]:
+            kept_count, new_count = self.__get_snapshot_header(block)
+            offset = block.snapshot_offset + CHUNK_HEADER.size + SNAPSHOT_HEADER.size
+            del stack_values[kept_count:]
+            for _ in range(new_count):
+                (value_len,) = VALUE_LEN.unpack_from(mapping, offset)
+                offset += VALUE_LEN.size
+                stack_values.append(
+                    int.from_bytes(mapping[offset : offset + value_len], signed=True),
+                )
+                offset += value_len
+        return self.__blocks[block_index].first_step_index, stack_values
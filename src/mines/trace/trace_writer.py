@@ -0,0 +1,172 @@
+from typing import BinaryIO
+
+from mines.program.operation_list import encode_operation
+from mines.runtime.runner import StepResult
+from mines.runtime.runtime_state import RuntimeState
+from mines.trace.trace_format import (
+    CELL_STATES,
+    CHUNK_HEADER,
+    CLICKED_FLAG,
+    COMMAND_ERROR_TYPES,
+    COMMAND_TYPES,
+    FULL_SNAPSHOT_BLOCK_INTERVAL,
+    GAME_OVER_FLAG,
+    INDEX_CHUNK_TAG,
+    INDEX_ENTRY,
+    LEFT_CLICK_FLAG,
+    OPENED_FLAG,
+    PREVIOUS_CELL_STATE_SHIFT,
+    SNAPSHOT_CHUNK_TAG,
+    SNAPSHOT_HEADER,
+    STEP_RECORD,
+    STEPS_CHUNK_TAG,
+    TRACE_HEADER,
+    TRACE_MAGIC,
+    TRACE_TRAILER,
+    TRACE_TRAILER_MAGIC,
+    TRACE_VERSION,
+    encode_value,
+)
+
+COMMAND_IDS = {command_type: index for index, command_type in enumerate(COMMAND_TYPES)}
+COMMAND_ERROR_IDS = {
+    command_error_type: index + 1
+    for index, command_error_type in enumerate(COMMAND_ERROR_TYPES)
+}
+CELL_STATE_FLAGS = {
+    cell_state: index << PREVIOUS_CELL_STATE_SHIFT
+    for index, cell_state in enumerate(CELL_STATES)
+}
+
+
+class TraceWriter:
+    # Steps are written in blocks of the snapshot interval, each preceded by a
+    # snapshot of the stack as a delta from the previous one, or the whole stack
+    # at every FULL_SNAPSHOT_BLOCK_INTERVAL blocks.
+    __output_io: BinaryIO
+    __runtime_state: RuntimeState
+    __snapshot_interval: int
+    __offset: int
+    __step_count: int
+    __records: bytearray
+    __block_step_count: int
+    __snapshot_offset: int
+    __last_stack_values: list[int]
+    __index: bytearray
+
+    def __init__(
+        self,
+        output_io: BinaryIO,
+        runtime_state: RuntimeState,
+        snapshot_interval: int,
+    ) -> None:
+        self.__output_io = output_io
+        self.__runtime_state = runtime_state
+        self.__snapshot_interval = snapshot_interval
+        self.__offset = 0
+        self.__step_count = 0
+        self.__records = bytearray(STEP_RECORD.size * snapshot_interval)
+        self.__block_step_count = 0
+        self.__last_stack_values = []
+        self.__index = bytearray()
+
+        board_size = runtime_state.player.get_board_size()
+        self.__write(
+            TRACE_HEADER.pack(
+                TRACE_MAGIC,
+                TRACE_VERSION,
+                snapshot_interval,
+                board_size.width,
+                board_size.height,
+            ),
+        )
+        self.__snapshot_offset = self.__write_snapshot()
+
+    def __write(self, data: bytes | bytearray | memoryview) -> int:
+        offset = self.__offset
+        self.__output_io.write(data)
+        self.__offset += len(data)
+        return offset
+
+    def __write_chunk(
+        self,
+        tag: bytes,
+        payload: bytes | bytearray | memoryview,
+    ) -> int:
+        offset = self.__write(CHUNK_HEADER.pack(tag, len(payload)))
+        self.__write(payload)
+        return offset
+
+    def __write_snapshot(self) -> int:
+        stack_values = self.__runtime_state.stack.get_values()
+        block_index = self.__step_count // self.__snapshot_interval
+        last_stack_values = (
+            self.__last_stack_values
+            if block_index % FULL_SNAPSHOT_BLOCK_INTERVAL != 0
+            else []
+        )
+        kept_count = 0
+        for value, last_value in zip(stack_values, last_stack_values, strict=False):
+            if value != last_value:
+                break
+            kept_count += 1
+        new_values = stack_values[kept_count:]
+        self.__last_stack_values = stack_values
+
+        payload = SNAPSHOT_HEADER.pack(kept_count, len(new_values)) + b"".join(
+            [encode_value(value) for value in new_values],
+        )
+        return self.__write_chunk(SNAPSHOT_CHUNK_TAG, payload)
+
+    def __flush_block(self) -> None:
+        steps_offset = self.__write_chunk(
+            STEPS_CHUNK_TAG,
+            memoryview(self.__records)[: self.__block_step_count * STEP_RECORD.size],
+        )
+        self.__index += INDEX_ENTRY.pack(
+            self.__step_count,
+            self.__snapshot_offset,
+            steps_offset,
+        )
+        self.__step_count += self.__block_step_count
+        self.__block_step_count = 0
+
+    def record_step(self, operation_index: int | None, step_result: StepResult) -> None:
+        player = self.__runtime_state.player
+        click_result = player.get_last_click_result()
+        click_flags = 0
+        opened_count = 0
+        if click_result is not None:
+            click_flags = (
+                CLICKED_FLAG | CELL_STATE_FLAGS[click_result.previous_cell_state]
+            )
+            if click_result.is_left_click:
+                click_flags |= LEFT_CLICK_FLAG
+            if click_result.open_result == "over":
+                click_flags |= GAME_OVER_FLAG
+            elif click_result.open_result is not None:
+                click_flags |= OPENED_FLAG
+                opened_count = len(click_result.open_result)
+
+        command_error_type = step_result.command_error_type
+        STEP_RECORD.pack_into(
+            self.__records,
+            self.__block_step_count * STEP_RECORD.size,
+            -1 if operation_index is None else operation_index,
+            encode_operation(step_result.operation, player.get_board_size()),
+            COMMAND_IDS[step_result.command_type],
+            0 if command_error_type is None else COMMAND_ERROR_IDS[command_error_type],
+            click_flags,
+            opened_count,
+        )
+        self.__block_step_count += 1
+        if self.__block_step_count == self.__snapshot_interval:
+            self.__flush_block()
+            self.__snapshot_offset = self.__write_snapshot()
+
+    def close(self) -> None:
+        if self.__block_step_count > 0:
+            self.__flush_block()
+        index_offset = self.__write_chunk(INDEX_CHUNK_TAG, self.__index)
+        self.__write(TRACE_TRAILER.pack(index_offset, TRACE_TRAILER_MAGIC))
+        self.__output_io.close()
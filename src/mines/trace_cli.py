@@ -0,0 +1,103 @@
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from sys import stdout
+from typing import TYPE_CHECKING
+
+from mines.__version__ import __version__
+from mines.runtime.command_type import CommandType
+from mines.trace.trace_format import COMMAND_TYPES, TraceStep
+from mines.trace.trace_reader import TraceReader
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+@dataclass
+class Args:
+    trace: str = ""
+    start: int = 0
+    count: int = 20
+    command: CommandType | None = None
+    game_over: bool | None = None
+    stack: bool | None = None
+
+
+def __get_step_str(step: TraceStep) -> str:
+    operation_str = (
+        "queued" if step.operation_index is None else f"#{step.operation_index}"
+    )
+    parts = [
+        f"{step.step_index}:",
+        f"operation {operation_str} (code {step.operation_code})",
+        step.command_type,
+    ]
+    if step.command_error_type is not None:
+        parts.append(f"with {step.command_error_type}")
+    if step.previous_cell_state is not None:
+        button = "L" if step.is_left_click else "R"
+        parts.append(f"{button}-click at {step.previous_cell_state}")
+    if step.is_game_over:
+        parts.append("caused Game Over")
+    elif step.opened_count > 0:
+        parts.append(f"opened {step.opened_count} cells")
+    return " ".join(parts)
+
+
+def main() -> None:
+    arg_parser = ArgumentParser()
+    arg_parser.add_argument("-V", "--version", action="version", version=__version__)
+    arg_parser.add_argument("trace", type=str, help="trace file path")
+    arg_parser.add_argument(
+        "-s",
+        "--start",
+        type=int,
+        default=0,
+        help="step index to start from",
+    )
+    arg_parser.add_argument(
+        "-n",
+        "--count",
+        type=int,
+        default=20,
+        help="max number of steps to show",
+    )
+    arg_parser.add_argument(
+        "-c",
+        "--command",
+        type=str,
+        choices=COMMAND_TYPES,
+        help="show only steps of the command",
+    )
+    arg_parser.add_argument(
+        "--game-over",
+        action="store_true",
+        help="show only steps causing game over",
+    )
+    arg_parser.add_argument(
+        "--stack",
+        action="store_true",
+        help="show the stack snapshot taken at or before the start step",
+    )
+    args = arg_parser.parse_args(namespace=Args())
+
+    trace_reader = TraceReader(Path(args.trace))
+    stdout.write(f"{len(trace_reader)} steps\n")
+
+    if args.stack:
+        snapshot_step_index, stack_values = trace_reader.get_stack_snapshot(args.start)
+        stack_str = ", ".join([str(value) for value in stack_values])
+        stdout.write(f"stack before step {snapshot_step_index}: {stack_str}\n")
+
+    steps: Iterator[TraceStep]
+    if args.command is not None:
+        steps = trace_reader.iterate_command_steps(args.command)
+    elif args.game_over:
+        steps = trace_reader.iterate_game_over_steps()
+    else:
+        steps = trace_reader.iterate_steps(args.start)
+    steps = (step for step in steps if step.step_index >= args.start)
+
+    for step in islice(steps, args.count):
+        stdout.write(__get_step_str(step) + "\n")
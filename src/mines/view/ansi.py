@@ -12,6 +12,8 @@ ANSI_INIT = "\x1b[H\x1b[J"
 ANSI_START_FRAME = "\x1b[?25l\x1b[H"
 ANSI_END_FRAME = "\x1b[J\x1b[?25h"
 ANSI_LF = "\x1b[K\n"
+ANSI_HIDE_CURSOR = "\x1b[?25l"
+ANSI_ERASE_LINE = "\x1b[K"
 
 _SGR_BOLD = 1
 _SGR_FAINT = 2
@@ -46,6 +48,10 @@ class Ansi:
         return f"\x1b[{params_str}m{self.raw}\x1b[m"
 
 
+def move_cursor(line_index: int, column_index: int) -> str:
+    return f"\x1b[{line_index + 1};{column_index + 1}H"
+
+
 def em(value: str) -> str:
     return str(Ansi(value, bold=True))
 
@@ -0,0 +1,152 @@
+from mines.player.board import Cell, CellState
+from mines.player.operation import ClickResult
+from mines.player.player import Player
+from mines.view.board_viewport import BoardWindow
+from mines.view.player_view import PlayerView, get_cell_glyph
+
+
+class BoardRenderer:
+    # The glyph of each cell in the window is kept with the cell states and
+    # highlights it was rendered from. Only the rows whose states or highlights
+    # changed are rendered again, and the cells whose glyphs changed are
+    # collected, at their positions in the window, until they are drawn.
+    __player: Player
+    __window: BoardWindow | None
+    __is_over: bool
+    __row_states: list[list[CellState]]
+    __row_glyphs: list[list[str]]
+    __row_strs: list[str]
+    __selected_cell: Cell | None
+    __click_result: ClickResult | None
+    __clicked_cell_state: CellState | None
+    __cell_bgs: dict[Cell, int]
+    __changed_cells: dict[Cell, str] | None
+
+    def __init__(self, player: Player) -> None:
+        self.__player = player
+        self.__window = None
+        self.__is_over = False
+        self.__row_states = []
+        self.__row_glyphs = []
+        self.__row_strs = []
+        self.__selected_cell = None
+        self.__click_result = None
+        self.__clicked_cell_state = None
+        self.__cell_bgs = {}
+        self.__changed_cells = None
+
+    def __get_glyph(
+        self,
+        window: BoardWindow,
+        column_offset: int,
+        row_offset: int,
+        cell_state: CellState,
+    ) -> str:
+        cell = Cell(window.column_index + column_offset, window.row_index + row_offset)
+        return get_cell_glyph(
+            cell_state,
+            self.__player.get_cell_digit(cell),
+            self.__cell_bgs.get(cell),
+            is_over=self.__is_over,
+        )
+
+    def __get_row_states(self, row_offset: int) -> list[CellState]:
+        window = self.__window
+        if window is None:
+            return []
+        row = self.__player.get_player_state().cell_states.get_row(
+            window.row_index + row_offset,
+        )
+        return row[window.column_index : window.column_index + window.width]
+
+    def __render_all(self) -> None:
+        window = self.__window
+        if window is None:
+            return
+        self.__row_states = [
+            self.__get_row_states(row_offset) for row_offset in range(window.height)
+        ]
+        self.__row_glyphs = [
+            [
+                self.__get_glyph(window, column_offset, row_offset, cell_state)
+                for column_offset, cell_state in enumerate(row_states)
+            ]
+            for row_offset, row_states in enumerate(self.__row_states)
+        ]
+        self.__row_strs = ["".join(row_glyphs) for row_glyphs in self.__row_glyphs]
+        self.__changed_cells = None
+
+    def __render_row(self, row_offset: int, row_states: list[CellState]) -> None:
+        window = self.__window
+        if window is None:
+            return
+        row_glyphs = self.__row_glyphs[row_offset]
+        changed_cells = self.__changed_cells
+        is_changed = False
+        for column_offset, cell_state in enumerate(row_states):
+            glyph = self.__get_glyph(window, column_offset, row_offset, cell_state)
+            if glyph != row_glyphs[column_offset]:
+                row_glyphs[column_offset] = glyph
+                if changed_cells is not None:
+                    changed_cells[Cell(column_offset, row_offset)] = glyph
+                is_changed = True
+
+        self.__row_states[row_offset] = row_states
+        if is_changed:
+            self.__row_strs[row_offset] = "".join(row_glyphs)
+
+    def __update_cell_bgs(self, selected_cell: Cell | None) -> set[int] | None:
+        # Highlights are found again only if the click or the selection changed,
+        # and the rows which had or have them are returned.
+        player = self.__player
+        click_result = player.get_last_click_result()
+        clicked_cell_state = (
+            None
+            if click_result is None
+            else player.get_player_state().cell_states.get(click_result.clicked_cell)
+        )
+        if (
+            selected_cell == self.__selected_cell
+            and click_result is self.__click_result
+            and clicked_cell_state == self.__clicked_cell_state
+        ):
+            return None
+        self.__selected_cell = selected_cell
+        self.__click_result = click_result
+        self.__clicked_cell_state = clicked_cell_state
+
+        last_cell_bgs = self.__cell_bgs
+        self.__cell_bgs = PlayerView(player).get_cell_bgs(selected_cell)
+        return {cell.row_index for cell in (*last_cell_bgs, *self.__cell_bgs)}
+
+    def update(self, selected_cell: Cell | None, window: BoardWindow) -> None:
+        highlighted_row_indices = self.__update_cell_bgs(selected_cell)
+        is_over = self.__player.get_player_state().game_status == "over"
+
+        # Revealing mines on game over changes cells all over the board.
+        if window != self.__window or is_over != self.__is_over:
+            self.__window = window
+            self.__is_over = is_over
+            self.__render_all()
+            return
+
+        for row_offset in range(window.height):
+            row_states = self.__get_row_states(row_offset)
+            if (
+                highlighted_row_indices is not None
+                and window.row_index + row_offset in highlighted_row_indices
+            ) or row_states != self.__row_states[row_offset]:
+                self.__render_row(row_offset, row_states)
+
+    def get_window(self) -> BoardWindow | None:
+        return self.__window
+
+    def get_row_strs(self) -> list[str]:
+        return self.__row_strs
+
+    def pop_changed_cells(self) -> dict[Cell, str] | None:
+        # Returns the cells changed since the last call, or None if every row
+        # has to be drawn.
+        changed_cells = self.__changed_cells
+        self.__changed_cells = {}
+        return changed_cells
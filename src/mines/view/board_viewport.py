@@ -0,0 +1,124 @@
+import os
+from math import ceil
+from typing import NamedTuple, TextIO
+
+from mines.player.board import BoardSize, Cell
+
+# Each glyph of a board cell takes two columns.
+BOARD_CELL_COLUMNS = 2
+VIEWPORT_MARGIN = 2
+SCROLL_DIVISOR = 2
+MINIMAP_LEN = 16
+
+
+class BoardWindow(NamedTuple):
+    column_index: int
+    row_index: int
+    width: int
+    height: int
+
+
+def get_viewport_size(
+    output_io: TextIO,
+    reserved_line_count: int,
+    board_size: BoardSize,
+) -> BoardSize:
+    # The whole board is shown unless the frame goes to a terminal.
+    try:
+        terminal_size = os.get_terminal_size(output_io.fileno())
+    except (AttributeError, OSError, ValueError):
+        return board_size
+    return BoardSize(
+        width=max(terminal_size.columns // BOARD_CELL_COLUMNS, 1),
+        height=max(terminal_size.lines - reserved_line_count, 1),
+    )
+
+
+class BoardViewport:
+    # A window of the board which follows the focused cell whenever it changes,
+    # and can be scrolled in between.
+    __board_size: BoardSize
+    __window: BoardWindow
+    __focused_cell: Cell | None
+
+    def __init__(self, board_size: BoardSize) -> None:
+        self.__board_size = board_size
+        self.__window = BoardWindow(0, 0, board_size.width, board_size.height)
+        self.__focused_cell = None
+
+    @staticmethod
+    def __clamp(index: int, window_len: int, board_len: int) -> int:
+        return max(min(index, board_len - window_len), 0)
+
+    @staticmethod
+    def __follow(index: int, window_index: int, window_len: int) -> int:
+        margin = min(VIEWPORT_MARGIN, (window_len - 1) // 2)
+        if index < window_index + margin:
+            return index - margin
+        if index >= window_index + window_len - margin:
+            return index - window_len + margin + 1
+        return window_index
+
+    def __move(self, column_index: int, row_index: int) -> None:
+        width, height = self.__board_size
+        window = self.__window
+        self.__window = window._replace(
+            column_index=self.__clamp(column_index, window.width, width),
+            row_index=self.__clamp(row_index, window.height, height),
+        )
+
+    def resize(self, viewport_size: BoardSize) -> None:
+        width, height = self.__board_size
+        self.__window = self.__window._replace(
+            width=min(viewport_size.width, width),
+            height=min(viewport_size.height, height),
+        )
+        self.__move(self.__window.column_index, self.__window.row_index)
+
+    def focus(self, cell: Cell | None) -> None:
+        if cell is None or cell == self.__focused_cell:
+            return
+        self.__focused_cell = cell
+
+        window = self.__window
+        self.__move(
+            self.__follow(cell.column_index, window.column_index, window.width),
+            self.__follow(cell.row_index, window.row_index, window.height),
+        )
+
+    def scroll(self, dx: int, dy: int) -> None:
+        window = self.__window
+        self.__move(
+            window.column_index + dx * max(window.width // SCROLL_DIVISOR, 1),
+            window.row_index + dy * max(window.height // SCROLL_DIVISOR, 1),
+        )
+
+    def get_window(self) -> BoardWindow:
+        return self.__window
+
+    def is_scrollable(self) -> bool:
+        window = self.__window
+        return (window.width, window.height) != self.__board_size
+
+    @staticmethod
+    def __get_minimap_str(window_index: int, window_len: int, board_len: int) -> str:
+        begin = window_index * MINIMAP_LEN // board_len
+        end = max(
+            ceil((window_index + window_len) * MINIMAP_LEN / board_len),
+            begin + 1,
+        )
+        return "░" * begin + "█" * (end - begin) + "░" * (MINIMAP_LEN - end)
+
+    def get_summary_str(self) -> str:
+        width, height = self.__board_size
+        window = self.__window
+        column_end = window.column_index + window.width - 1
+        row_end = window.row_index + window.height - 1
+        return " ".join(
+            [
+                f"x {window.column_index}-{column_end}/{width}",
+                self.__get_minimap_str(window.column_index, window.width, width),
+                f"y {window.row_index}-{row_end}/{height}",
+                self.__get_minimap_str(window.row_index, window.height, height),
+            ],
+        )
@@ -0,0 +1,135 @@
+from queue import Queue
+from threading import Thread
+from typing import BinaryIO
+
+from mines.runtime.output_buffer import OutputSink
+
+DEFAULT_FLUSH_THRESHOLD = 1 << 16
+
+ORD_LF = 10
+ORD_ASCII_END = 0x80
+
+
+class BufferedOutputSink(OutputSink):
+    # Once a write fails, its error is raised from the next call and the rest
+    # of the output is dropped, so that a failed writer thread is never waited.
+    __output_io: BinaryIO
+    __flush_threshold: int
+    __is_line_buffered: bool
+    __buffer: bytearray
+    __write_queue: Queue[bytes | None] | None
+    __writer_thread: Thread | None
+    __write_error: Exception | None
+    __has_failed: bool
+
+    def __init__(
+        self,
+        output_io: BinaryIO,
+        flush_threshold: int,
+        *,
+        is_line_buffered: bool,
+        uses_writer_thread: bool,
+    ) -> None:
+        self.__output_io = output_io
+        self.__flush_threshold = flush_threshold
+        self.__is_line_buffered = is_line_buffered
+        self.__buffer = bytearray()
+        self.__write_error = None
+        self.__has_failed = False
+
+        if uses_writer_thread:
+            self.__write_queue = Queue()
+            self.__writer_thread = Thread(target=self.__write_loop, daemon=True)
+            self.__writer_thread.start()
+        else:
+            self.__write_queue = None
+            self.__writer_thread = None
+
+    def __write_chunk(self, chunk: bytes | bytearray) -> None:
+        self.__output_io.write(chunk)
+        self.__output_io.flush()
+
+    def __write_loop(self) -> None:
+        write_queue = self.__write_queue
+        if write_queue is None:
+            return
+
+        # Chunks are still taken after a failure, so that joining never blocks.
+        while True:
+            chunk = write_queue.get()
+            try:
+                if chunk is None:
+                    return
+                if self.__write_error is None:
+                    self.__write_chunk(chunk)
+            except Exception as e:  # noqa: BLE001
+                self.__write_error = e
+            finally:
+                write_queue.task_done()
+
+    def __stop_writer_thread(self) -> None:
+        if self.__write_queue is not None and self.__writer_thread is not None:
+            self.__write_queue.put(None)
+            self.__writer_thread.join()
+            self.__write_queue = None
+            self.__writer_thread = None
+
+    def __raise_write_error(self) -> None:
+        write_error = self.__write_error
+        if write_error is None:
+            return
+
+        self.__write_error = None
+        self.__has_failed = True
+        self.__stop_writer_thread()
+        raise write_error
+
+    def __hand_off(self) -> None:
+        self.__raise_write_error()
+        if len(self.__buffer) == 0:
+            return
+
+        if self.__has_failed:
+            self.__buffer.clear()
+            return
+
+        if self.__write_queue is None:
+            try:
+                self.__write_chunk(self.__buffer)
+            except Exception:
+                self.__has_failed = True
+                raise
+            finally:
+                self.__buffer.clear()
+        else:
+            self.__write_queue.put(bytes(self.__buffer))
+            self.__buffer.clear()
+
+    def write(self, value: str) -> None:
+        self.__raise_write_error()
+        self.__buffer += value.encode()
+        if len(self.__buffer) >= self.__flush_threshold:
+            self.__hand_off()
+        elif self.__is_line_buffered and "\n" in value:
+            self.flush()
+
+    def write_code_point(self, code_point: int) -> None:
+        self.__raise_write_error()
+        if code_point < ORD_ASCII_END:
+            self.__buffer.append(code_point)
+        else:
+            self.__buffer += chr(code_point).encode()
+        if len(self.__buffer) >= self.__flush_threshold:
+            self.__hand_off()
+        elif self.__is_line_buffered and code_point == ORD_LF:
+            self.flush()
+
+    def flush(self) -> None:
+        self.__hand_off()
+        if self.__write_queue is not None:
+            self.__write_queue.join()
+            self.__raise_write_error()
+
+    def close(self) -> None:
+        self.flush()
+        self.__stop_writer_thread()
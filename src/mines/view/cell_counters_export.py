@@ -0,0 +1,27 @@
+import csv
+import json
+from typing import TextIO
+
+from mines.player.cell_counters import CELL_COUNTER_KINDS, CellCounters
+
+
+def write_cell_counters_csv(cell_counters: CellCounters, output_io: TextIO) -> None:
+    width = cell_counters.get_board_size().width
+    writer = csv.writer(output_io, lineterminator="\n")
+    writer.writerow(["kind", "row", *range(width)])
+    for kind in CELL_COUNTER_KINDS:
+        for row_index, row in enumerate(cell_counters.get_rows(kind)):
+            writer.writerow([kind, row_index, *row])
+
+
+def write_cell_counters_json(cell_counters: CellCounters, output_io: TextIO) -> None:
+    board_size = cell_counters.get_board_size()
+    json.dump(
+        {
+            "width": board_size.width,
+            "height": board_size.height,
+            **{kind: cell_counters.get_rows(kind) for kind in CELL_COUNTER_KINDS},
+        },
+        output_io,
+    )
+    output_io.write("\n")
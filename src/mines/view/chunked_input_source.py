@@ -0,0 +1,217 @@
+import os
+import stat
+from collections.abc import Callable, Iterator
+from io import BufferedIOBase, UnsupportedOperation
+from mmap import ACCESS_READ, mmap
+from queue import Queue
+from threading import Thread
+
+from mines.runtime.input_buffer import InputSource
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+PREFETCH_CHUNK_COUNT = 4
+
+_ASCII_CHARS = tuple(chr(code_point) for code_point in range(0x80))
+_UTF8_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+_UTF8_2_BYTES_LEAD_END = 0xE0
+_UTF8_3_BYTES_LEAD_END = 0xF0
+_ASCII_END = 0x80
+_UTF8_MAX_CHAR_LEN = 4
+
+
+class ChunkedInputSource(InputSource):
+    # Input bytes are kept in a single buffer (a memory map for regular files)
+    # with a cursor at the first unconsumed byte, and decoded one char at a time.
+    # Like an interactive source, chars are made available one line at a time,
+    # and EOF is confirmed once a newly available line is read through.
+    __input_io: BufferedIOBase
+    __chunk_size: int
+    __before_read: Callable[[], None] | None
+    __mapping: mmap | None
+    __buffer: bytearray
+    __position: int
+    __line_end: int
+    __end: int
+    __buffered_len: int
+    __is_source_exhausted: bool
+    __is_eof_confirmed: bool
+    __chunk_queue: Queue[bytes] | None
+
+    def __init__(
+        self,
+        input_io: BufferedIOBase,
+        chunk_size: int,
+        before_read: Callable[[], None] | None,
+        *,
+        prefetches: bool,
+    ) -> None:
+        self.__input_io = input_io
+        self.__chunk_size = chunk_size
+        self.__before_read = before_read
+        self.__mapping = self.__open_mapping()
+        self.__buffer = bytearray()
+        self.__position = 0
+        self.__line_end = 0
+        self.__end = 0
+        self.__buffered_len = 0
+        self.__is_source_exhausted = False
+        self.__is_eof_confirmed = False
+        self.__chunk_queue = None
+
+        if prefetches and self.__mapping is None:
+            self.__chunk_queue = Queue(PREFETCH_CHUNK_COUNT)
+            Thread(target=self.__prefetch_loop, daemon=True).start()
+
+    def __del__(self) -> None:
+        if self.__mapping is not None:
+            self.__mapping.close()
+        self.__input_io.close()
+
+    def __open_mapping(self) -> mmap | None:
+        try:
+            fileno = self.__input_io.fileno()
+        except (OSError, UnsupportedOperation):
+            return None
+
+        file_stat = os.fstat(fileno)
+        if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size == 0:
+            return None
+
+        mapping = mmap(fileno, 0, access=ACCESS_READ)
+        if os.name != "nt":
+            from mmap import MADV_SEQUENTIAL  # noqa: PLC0415
+
+            mapping.madvise(MADV_SEQUENTIAL)
+        return mapping
+
+    def __read_raw_chunk(self) -> bytes:
+        return self.__input_io.read1(self.__chunk_size)
+
+    def __prefetch_loop(self) -> None:
+        chunk_queue = self.__chunk_queue
+        if chunk_queue is None:
+            return
+
+        while True:
+            chunk = self.__read_raw_chunk()
+            chunk_queue.put(chunk)
+            if len(chunk) == 0:
+                return
+
+    def __get_source(self) -> mmap | bytearray:
+        return self.__mapping if self.__mapping is not None else self.__buffer
+
+    def __read_chunk(self) -> bool:
+        if self.__is_source_exhausted:
+            return False
+
+        if self.__mapping is not None:
+            new_end = min(self.__end + self.__chunk_size, len(self.__mapping))
+            chunk_len = new_end - self.__end
+        else:
+            if self.__before_read:
+                self.__before_read()
+            chunk = (
+                self.__read_raw_chunk()
+                if self.__chunk_queue is None
+                else self.__chunk_queue.get()
+            )
+            if self.__position > len(self.__buffer) // 2:
+                del self.__buffer[: self.__position]
+                self.__line_end -= self.__position
+                self.__end -= self.__position
+                self.__position = 0
+            self.__buffer += chunk
+            chunk_len = len(chunk)
+            new_end = self.__end + chunk_len
+
+        if chunk_len == 0:
+            self.__is_source_exhausted = True
+            return False
+
+        self.__end = new_end
+        return True
+
+    def __fill_line(self) -> None:
+        # Reading a chunk may move the cursor, so positions are relative to it.
+        line_start = self.__line_end - self.__position
+        search_start = line_start
+        while True:
+            newline_position = self.__get_source().find(
+                b"\n",
+                self.__position + search_start,
+                self.__end,
+            )
+            if newline_position >= 0:
+                self.__line_end = newline_position + 1
+                break
+            search_start = self.__end - self.__position
+            if not self.__read_chunk():
+                self.__line_end = self.__end
+                break
+
+        line_bytes = self.__get_source()[self.__position + line_start : self.__line_end]
+        self.__buffered_len += len(line_bytes.translate(None, _UTF8_CONTINUATION_BYTES))
+
+    def __decode_char(self, offset: int) -> tuple[str, int] | None:
+        position = self.__position + offset
+        if position >= self.__line_end:
+            return None
+
+        source = self.__get_source()
+        lead_byte = source[position]
+        if lead_byte < _ASCII_END:
+            return _ASCII_CHARS[lead_byte], 1
+
+        if lead_byte < _UTF8_2_BYTES_LEAD_END:
+            char_len = 2
+        elif lead_byte < _UTF8_3_BYTES_LEAD_END:
+            char_len = 3
+        else:
+            char_len = 4
+        return source[position : position + char_len].decode(), char_len
+
+    def __iter__(self) -> Iterator[str]:
+        offset = 0
+        while decoded := self.__decode_char(offset):
+            c, char_len = decoded
+            yield c
+            offset += char_len
+
+        if self.__is_eof_confirmed:
+            return
+
+        self.__fill_line()
+        while decoded := self.__decode_char(offset):
+            c, char_len = decoded
+            yield c
+            offset += char_len
+
+        self.__is_eof_confirmed = True
+
+    def dequeue(self) -> str:
+        decoded = self.__decode_char(0)
+        if decoded is None:
+            message = "Input is empty."
+            raise IndexError(message)
+
+        c, char_len = decoded
+        self.__position += char_len
+        self.__buffered_len -= 1
+        return c
+
+    def get_buffered_len(self) -> int:
+        return self.__buffered_len
+
+    def peek(self, max_len: int) -> str:
+        # Enough bytes for max_len chars are decoded, and a char cut at the end
+        # is dropped with the slice unless it is among the first max_len chars.
+        end = min(
+            self.__position + max_len * _UTF8_MAX_CHAR_LEN + _UTF8_MAX_CHAR_LEN - 1,
+            self.__line_end,
+        )
+        source = self.__get_source()
+        return source[self.__position : end].decode(errors="replace")[:max_len]
+
+    def get_is_eof_confirmed(self) -> bool:
+        return self.__is_eof_confirmed
@@ -1,23 +1,201 @@
-from sys import stderr
+import os
+import re
+from typing import TextIO
+from unicodedata import east_asian_width
 
-from mines.view.ansi import ANSI_END_FRAME, ANSI_INIT, ANSI_LF, ANSI_START_FRAME, Ansi
+from mines.view.ansi import (
+    ANSI_END_FRAME,
+    ANSI_ERASE_LINE,
+    ANSI_HIDE_CURSOR,
+    ANSI_INIT,
+    ANSI_LF,
+    ANSI_START_FRAME,
+    Ansi,
+    move_cursor,
+)
+from mines.view.board_renderer import BoardRenderer
+from mines.view.board_viewport import BOARD_CELL_COLUMNS
+
+ANSI_ESCAPE_PATTERN = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]")
+TAB_COLUMNS = 8
+
+
+def get_str_width(line: str) -> int:
+    # A tab is counted as wide as it can be.
+    line = ANSI_ESCAPE_PATTERN.sub("", line)
+    tab_width = (TAB_COLUMNS - 1) * line.count("\t")
+    if line.isascii():
+        return len(line) + tab_width
+    return sum(2 if east_asian_width(c) in "FW" else 1 for c in line) + tab_width
+
+
+def get_row_count(text: str, columns: int) -> int:
+    # Rows taken by the text on a terminal, including the row it ends on.
+    return sum(
+        max((get_str_width(line) + columns - 1) // columns, 1)
+        for line in text.split("\n")
+    )
 
 
 class CliFrameDrawer:
+    # A frame is drawn over the previous one. The lines above the board are
+    # rewritten only if they changed, the board only at the changed cells (or
+    # by rows if its window moved), and the lines below it as a whole, since
+    # they may wrap. Text written below a frame, such as a prompt, is counted,
+    # since the whole frame is redrawn once anything has scrolled.
+    __output_io: TextIO
     __lines: list[str]
+    __board_renderer: BoardRenderer | None
+    __board_line_index: int
+    __text_below: str
+    __last_lines: list[str] | None
+    __last_board_line_index: int
+    __last_terminal_size: os.terminal_size | None
+    # Rows of the last frame but the one where it ends, and its line there.
+    __last_head_row_count: int
+    __last_end_line: str
 
-    def __init__(self) -> None:
+    def __init__(self, output_io: TextIO) -> None:
+        self.__output_io = output_io
         self.__lines = []
-
-        stderr.write(ANSI_INIT)
+        self.__board_renderer = None
+        self.__board_line_index = -1
+        self.__text_below = ""
+        self.__last_lines = None
+        self.__last_board_line_index = -1
+        self.__last_terminal_size = None
+        self.__last_head_row_count = 0
+        self.__last_end_line = ""
 
     def add_line(self, line: str, title: str | None = None) -> None:
         self.__lines.append(
             f"{Ansi(f'[{title}]', bold=True, faint=True)} {line}" if title else line,
         )
 
+    def add_board(self, board_renderer: BoardRenderer) -> None:
+        self.__board_renderer = board_renderer
+        self.__board_line_index = len(self.__lines)
+        self.__lines.extend(board_renderer.get_row_strs())
+
+    def add_text_below(self, text: str) -> None:
+        # Counts text written below the last frame, including input echoed by
+        # the terminal.
+        self.__text_below += text
+
+    def __get_terminal_size(self) -> os.terminal_size | None:
+        try:
+            return os.get_terminal_size(self.__output_io.fileno())
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def __fits(
+        self,
+        terminal_size: os.terminal_size,
+        head_row_count: int,
+        end_line: str,
+    ) -> bool:
+        # The frame is expected to be followed by the same text as the last
+        # one, and the lines above the board must not wrap.
+        columns = terminal_size.columns
+        text_below = self.__text_below
+        return (
+            self.__last_head_row_count
+            + get_row_count(self.__last_end_line + text_below, columns)
+            <= terminal_size.lines
+            and head_row_count + get_row_count(end_line + text_below, columns)
+            <= terminal_size.lines
+            and sum(
+                get_row_count(line, columns)
+                for line in self.__lines[: self.__board_line_index]
+            )
+            == self.__board_line_index
+        )
+
+    def __get_diff_str(
+        self,
+        terminal_size: os.terminal_size | None,
+        head_row_count: int,
+        end_line: str,
+    ) -> str | None:
+        lines = self.__lines
+        last_lines = self.__last_lines
+        board_renderer = self.__board_renderer
+        board_line_index = self.__board_line_index
+        if (
+            last_lines is None
+            or board_renderer is None
+            or board_line_index != self.__last_board_line_index
+        ):
+            return None
+
+        # Cursor positions are meaningful only if nothing wraps or scrolls.
+        board_row_strs = board_renderer.get_row_strs()
+        window = board_renderer.get_window()
+        if terminal_size != self.__last_terminal_size or window is None:
+            return None
+        if terminal_size is not None and (
+            not self.__fits(terminal_size, head_row_count, end_line)
+            or BOARD_CELL_COLUMNS * window.width > terminal_size.columns
+        ):
+            return None
+
+        diff_strs = [ANSI_HIDE_CURSOR]
+        for line_index in range(board_line_index):
+            if lines[line_index] != last_lines[line_index]:
+                diff_strs.append(move_cursor(line_index, 0))
+                diff_strs.append(lines[line_index])
+                diff_strs.append(ANSI_ERASE_LINE)
+
+        changed_cells = board_renderer.pop_changed_cells()
+        if changed_cells is None:
+            for row_offset, row_str in enumerate(board_row_strs):
+                diff_strs.append(move_cursor(board_line_index + row_offset, 0))
+                diff_strs.append(row_str)
+                diff_strs.append(ANSI_ERASE_LINE)
+        else:
+            for cell, glyph in changed_cells.items():
+                diff_strs.append(
+                    move_cursor(
+                        board_line_index + cell.row_index,
+                        BOARD_CELL_COLUMNS * cell.column_index,
+                    ),
+                )
+                diff_strs.append(glyph)
+
+        board_end_line_index = board_line_index + len(board_row_strs)
+        diff_strs.append(move_cursor(board_end_line_index, 0))
+        diff_strs.append(ANSI_LF.join(lines[board_end_line_index:]))
+        diff_strs.append(ANSI_END_FRAME)
+        return "".join(diff_strs)
+
     def draw_frame(self) -> None:
-        stderr.write(ANSI_START_FRAME)
-        stderr.write(ANSI_LF.join(self.__lines))
-        stderr.write(ANSI_END_FRAME)
-        stderr.flush()
+        output_io = self.__output_io
+        head_row_count = 0
+        end_line = ""
+        terminal_size = self.__get_terminal_size()
+        if terminal_size is not None:
+            *head_lines, end_line = "\n".join(self.__lines).split("\n")
+            head_row_count = sum(
+                get_row_count(line, terminal_size.columns) for line in head_lines
+            )
+        diff_str = self.__get_diff_str(terminal_size, head_row_count, end_line)
+        if diff_str is None:
+            if self.__board_renderer is not None:
+                self.__board_renderer.pop_changed_cells()
+            self.__last_terminal_size = terminal_size
+            output_io.write(ANSI_INIT)
+            output_io.write(ANSI_START_FRAME)
+            output_io.write(ANSI_LF.join(self.__lines))
+            output_io.write(ANSI_END_FRAME)
+        else:
+            output_io.write(diff_str)
+        output_io.flush()
+
+        self.__last_lines = self.__lines
+        self.__last_board_line_index = self.__board_line_index
+        self.__last_head_row_count = head_row_count
+        self.__last_end_line = end_line
+        self.__lines = []
+        self.__board_renderer = None
+        self.__board_line_index = -1
+        self.__text_below = ""
@@ -1,7 +1,11 @@
 import os
 
+# Seconds between checks for a key where it cannot be waited for.
+KEY_POLL_INTERVAL = 0.01
+
 if os.name == "nt":
     import msvcrt
+    from time import perf_counter, sleep
 
     def get_key() -> str:
         first = msvcrt.getch()
@@ -18,31 +22,56 @@ if os.name == "nt":
                 return "\n"
             case _:
                 return first.decode(errors="ignore")
+
+    def wait_key(timeout: float) -> str | None:
+        # Returns None if no key is pressed within the timeout in seconds.
+        deadline = perf_counter() + timeout
+        while not msvcrt.kbhit():
+            if perf_counter() >= deadline:
+                return None
+            sleep(KEY_POLL_INTERVAL)
+        return get_key()
 else:
+    from select import select
     from sys import stdin
     from termios import TCSADRAIN, tcgetattr, tcsetattr
     from tty import setcbreak
 
+    def __read_key() -> str:
+        first = stdin.read(1)
+        match first:
+            case "\x1b":
+                second = stdin.read(1)
+                third = stdin.read(1)
+                seq = second + third
+                return {
+                    "[A": "UP",
+                    "[B": "DOWN",
+                    "[C": "RIGHT",
+                    "[D": "LEFT",
+                }.get(seq, f"UNKNOWN(\\x1b{seq})")
+            case "\r":
+                return "\n"
+            case _:
+                return first
+
     def get_key() -> str:
         fd = stdin.fileno()
         old = tcgetattr(fd)
         try:
             setcbreak(fd)
-            first = stdin.read(1)
-            match first:
-                case "\x1b":
-                    second = stdin.read(1)
-                    third = stdin.read(1)
-                    seq = second + third
-                    return {
-                        "[A": "UP",
-                        "[B": "DOWN",
-                        "[C": "RIGHT",
-                        "[D": "LEFT",
-                    }.get(seq, f"UNKNOWN(\\x1b{seq})")
-                case "\r":
-                    return "\n"
-                case _:
-                    return first
+            return __read_key()
+        finally:
+            tcsetattr(fd, TCSADRAIN, old)
+
+    def wait_key(timeout: float) -> str | None:
+        # Returns None if no key is pressed within the timeout in seconds.
+        fd = stdin.fileno()
+        old = tcgetattr(fd)
+        try:
+            setcbreak(fd)
+            if len(select([stdin], [], [], timeout)[0]) == 0:
+                return None
+            return __read_key()
         finally:
             tcsetattr(fd, TCSADRAIN, old)
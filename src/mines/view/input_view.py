@@ -12,12 +12,10 @@ class InputView:
 
     def get_str(self) -> str:
         buffered_len = self.__input_source.get_buffered_len()
-        input_iter = iter(self.__input_source)
         lf_count = 0
         input_chars: list[str] = []
 
-        for i in range(buffered_len):
-            c = next(input_iter)
+        for i, c in enumerate(self.__input_source.peek(self.__max_len + 1)):
             if c == "\n":
                 lf_count += 1
             if i == self.__max_len or lf_count == self.__max_lf:
@@ -1,6 +1,7 @@
 import os
 from collections import deque
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
+from itertools import islice
 from sys import stderr
 from typing import TextIO
 
@@ -12,11 +13,17 @@ class InteractiveInputSource(InputSource):
     __stdin_buffer: deque[str]
     __is_eof_comfirmed: bool
     __input_io: TextIO
+    __before_read: Callable[[], None] | None
 
-    def __init__(self, input_io: TextIO) -> None:
+    def __init__(
+        self,
+        input_io: TextIO,
+        before_read: Callable[[], None] | None,
+    ) -> None:
         self.__stdin_buffer = deque()
         self.__is_eof_comfirmed = False
         self.__input_io = input_io
+        self.__before_read = before_read
 
     def __del__(self) -> None:
         self.__input_io.close()
@@ -26,6 +33,9 @@ class InteractiveInputSource(InputSource):
         stderr.flush()
 
     def __fill_buffer(self) -> str:
+        if self.__before_read:
+            self.__before_read()
+
         if self.__input_io.isatty():
             eof_key_str = "^Z" if os.name == "nt" else "^D"
             prompt_str = f"add input or EOF({eof_key_str}) >>> "
@@ -57,5 +67,8 @@ class InteractiveInputSource(InputSource):
     def get_buffered_len(self) -> int:
         return len(self.__stdin_buffer)
 
+    def peek(self, max_len: int) -> str:
+        return "".join(islice(self.__stdin_buffer, max_len))
+
     def get_is_eof_confirmed(self) -> bool:
         return self.__is_eof_comfirmed
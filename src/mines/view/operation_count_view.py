@@ -0,0 +1,103 @@
+from mines.runtime.command_type import CommandType
+from mines.runtime.operation_counter import OperationCounter
+
+COUNT_MARGIN_WIDTH = 12
+HOT_LOOP_LIMIT = 10
+
+
+class OperationCountView:
+    __operation_counter: OperationCounter
+    __source_lines: list[str] | None
+    __operation_line_index: int
+    __operation_totals: list[int]
+
+    def __init__(
+        self,
+        operation_counter: OperationCounter,
+        source_lines: list[str] | None,
+        operation_line_index: int,
+    ) -> None:
+        self.__operation_counter = operation_counter
+        self.__source_lines = source_lines
+        self.__operation_line_index = operation_line_index
+        self.__operation_totals = [
+            sum(operation_counter.get_command_counts(operation_index).values())
+            for operation_index in range(operation_counter.get_operation_count())
+        ]
+
+    @staticmethod
+    def __get_command_counts_str(command_counts: dict[CommandType, int]) -> str:
+        return ", ".join(
+            f"{command_type}: {count}"
+            for command_type, count in sorted(
+                command_counts.items(),
+                key=lambda item: -item[1],
+            )
+        )
+
+    def __get_operation_line_str(self, operation_index: int, line: str) -> str:
+        command_counts = self.__operation_counter.get_command_counts(operation_index)
+        count_str = f"{self.__operation_totals[operation_index]:>{COUNT_MARGIN_WIDTH}}"
+        if len(command_counts) == 0:
+            return f"{count_str} | {line}"
+        return (
+            f"{count_str} | {line}  # {self.__get_command_counts_str(command_counts)}"
+        )
+
+    def __get_line_number(self, operation_index: int) -> int:
+        return self.__operation_line_index + operation_index + 1
+
+    def get_annotated_source_str(self) -> str:
+        operation_count = self.__operation_counter.get_operation_count()
+        source_lines = self.__source_lines or [
+            "" for _ in range(self.__operation_line_index + operation_count)
+        ]
+
+        lines: list[str] = []
+        for line_index, line in enumerate(source_lines):
+            operation_index = line_index - self.__operation_line_index
+            if 0 <= operation_index < operation_count:
+                lines.append(self.__get_operation_line_str(operation_index, line))
+            else:
+                lines.append(f"{'':>{COUNT_MARGIN_WIDTH}} | {line}")
+
+        queued_command_counts = self.__operation_counter.get_command_counts(None)
+        if len(queued_command_counts) > 0:
+            queued_total = sum(queued_command_counts.values())
+            lines.append(
+                f"{queued_total:>{COUNT_MARGIN_WIDTH}} | # queued operations: "
+                f"{self.__get_command_counts_str(queued_command_counts)}",
+            )
+        return "\n".join(lines) + "\n"
+
+    def get_hot_loops_str(self) -> str:
+        # A skip landing on or before itself repeats the operations in between,
+        # so each jump is ranked by the steps it causes.
+        loops: list[tuple[int, int, int, int]] = []
+        for (
+            operation_index,
+            target_index,
+        ), taken_count in self.__operation_counter.get_skip_jumps().items():
+            if target_index > operation_index:
+                continue
+            body_len = operation_index - target_index + 1
+            loops.append(
+                (taken_count * body_len, taken_count, operation_index, target_index),
+            )
+        loops.sort(reverse=True)
+
+        lines = ["hot skip loops:"]
+        for rank, (step_count, taken_count, operation_index, target_index) in enumerate(
+            loops[:HOT_LOOP_LIMIT],
+            start=1,
+        ):
+            lines.append(
+                f"{rank:>3}. line {self.__get_line_number(operation_index)}"
+                f" -> line {self.__get_line_number(target_index)}:"
+                f" taken {taken_count} times,"
+                f" {operation_index - target_index + 1} operations,"
+                f" about {step_count} steps",
+            )
+        if len(loops) == 0:
+            lines.append("  (none)")
+        return "\n".join(lines) + "\n"
@@ -1,7 +1,55 @@
-from mines.player.board import CELL_DIGIT_MINE, BoardValues, Cell, CellState
+from functools import cache
+
+from mines.player.board import (
+    CELL_DIGIT_MINE,
+    BoardValues,
+    Cell,
+    CellDigit,
+    CellState,
+)
+from mines.player.cell_counters import CellCounterKind
 from mines.player.player import Player
 from mines.view.ansi import ANSI_LF, Ansi, em
 
+HEATMAP_BGS = (4, 6, 2, 3, 1)
+
+
+def get_cell_ansi(
+    cell_state: CellState,
+    cell_digit: CellDigit,
+    *,
+    is_over: bool,
+) -> Ansi:
+    match cell_state:
+        case "unopened":
+            raw_str = "＊" if is_over and cell_digit == CELL_DIGIT_MINE else "＿"  # noqa: RUF001
+            return Ansi(raw_str, fg=0, bg=7)
+        case "flagged":
+            raw_str = "Ｘ" if is_over and cell_digit != CELL_DIGIT_MINE else "Ｆ"  # noqa: RUF001
+            return Ansi(raw_str, fg=0, bg=7)
+        case "opened":
+            match cell_digit:
+                case 0:
+                    return Ansi("・", faint=True)
+                case _:
+                    return Ansi(chr(cell_digit + 65296))
+
+
+@cache
+def get_cell_glyph(
+    cell_state: CellState,
+    cell_digit: CellDigit,
+    bg: int | None,
+    *,
+    is_over: bool,
+) -> str:
+    # A board has only a few kinds of cells, so their escape strings are
+    # built once for each kind and shared.
+    cell_ansi = get_cell_ansi(cell_state, cell_digit, is_over=is_over)
+    if bg is not None:
+        cell_ansi.bg = bg
+    return str(cell_ansi)
+
 
 class PlayerView:
     __player: Player
@@ -11,21 +59,12 @@ class PlayerView:
 
     def __get_cell_ansi(self, cell: Cell, cell_state: CellState | None = None) -> Ansi:
         player = self.__player
-        is_over = player.get_player_state().game_status == "over"
-        cell_digit = player.get_cell_digit(cell)
-        match cell_state or player.get_player_state().cell_states.get(cell):
-            case "unopened":
-                raw_str = "＊" if is_over and cell_digit == CELL_DIGIT_MINE else "＿"  # noqa: RUF001
-                return Ansi(raw_str, fg=0, bg=7)
-            case "flagged":
-                raw_str = "Ｘ" if is_over and cell_digit != CELL_DIGIT_MINE else "Ｆ"  # noqa: RUF001
-                return Ansi(raw_str, fg=0, bg=7)
-            case "opened":
-                match cell_digit:
-                    case 0:
-                        return Ansi("・", faint=True)
-                    case _:
-                        return Ansi(chr(cell_digit + 65296))
+        player_state = player.get_player_state()
+        return get_cell_ansi(
+            cell_state or player_state.cell_states.get(cell),
+            player.get_cell_digit(cell),
+            is_over=player_state.game_status == "over",
+        )
 
     def get_board_info_str(self) -> str:
         player = self.__player
@@ -45,20 +84,17 @@ class PlayerView:
             ],
         )
 
-    def get_board_str(self, selected_cell: Cell | None = None) -> str:
-        board_ansi = BoardValues[Ansi](
-            self.__player.get_board_size(),
-            self.__get_cell_ansi,
-        )
-
+    def get_cell_bgs(self, selected_cell: Cell | None) -> dict[Cell, int]:
+        # Background colors of the highlighted cells, the later ones winning.
+        cell_bgs: dict[Cell, int] = {}
         if selected_cell:
-            board_ansi.get(selected_cell).bg = 4
+            cell_bgs[selected_cell] = 4
 
         click_result = self.__player.get_last_click_result()
         if click_result:
             if isinstance(click_result.open_result, list):
                 for cell in click_result.open_result:
-                    board_ansi.get(cell).bg = 2
+                    cell_bgs[cell] = 2
 
             clicked_cell = click_result.clicked_cell
             cell_state = self.__player.get_player_state().cell_states.get(clicked_cell)
@@ -73,8 +109,8 @@ class PlayerView:
                         clicked_cell_bg = 1
                     case _:
                         clicked_cell_bg = 4
-            board_ansi.get(clicked_cell).bg = clicked_cell_bg
-        return board_ansi.draw(end=ANSI_LF)
+            cell_bgs[clicked_cell] = clicked_cell_bg
+        return cell_bgs
 
     def get_click_result_str(self) -> str:
         click_result = self.__player.get_last_click_result()
@@ -103,3 +139,24 @@ class PlayerView:
                 opened_count_str = em(str(len(click_result.open_result)))
                 description_str = f"opened {opened_count_str} cells"
         return f"{diff_str} {description_str}"
+
+    def get_heatmap_str(self, kind: CellCounterKind) -> str:
+        cell_counters = self.__player.get_cell_counters()
+        if cell_counters is None:
+            return "--"
+
+        # Levels are logarithmic, since hot cells are often hotter by orders.
+        counts = cell_counters.get_counts(kind)
+        max_bit_length = max(max(counts, default=0).bit_length() - 1, 1)
+
+        def get_heat_ansi(cell: Cell) -> Ansi:
+            count = counts[cell_counters.get_cell_id(cell)]
+            if count == 0:
+                return Ansi("・", faint=True)
+            level = (count.bit_length() - 1) * (len(HEATMAP_BGS) - 1) // max_bit_length
+            return Ansi("  ", bg=HEATMAP_BGS[level])
+
+        board_ansi = BoardValues[Ansi](cell_counters.get_board_size(), get_heat_ansi)
+        return f"{kind} (max {max(counts, default=0)}){ANSI_LF}" + board_ansi.draw(
+            end=ANSI_LF,
+        )
@@ -0,0 +1,85 @@
+from mines.runtime.profiler import Profiler
+
+NS_PER_US = 1000
+HISTOGRAM_BAR_WIDTH = 40
+
+
+class ProfileView:
+    __profiler: Profiler
+
+    def __init__(self, profiler: Profiler) -> None:
+        self.__profiler = profiler
+
+    @staticmethod
+    def __format_us(time_ns: float) -> str:
+        return f"{time_ns / NS_PER_US:.3f}"
+
+    def __get_command_lines(self) -> list[str]:
+        command_counts = self.__profiler.get_command_counts()
+        command_times_ns = self.__profiler.get_command_times_ns()
+        command_error_counts = self.__profiler.get_command_error_counts()
+
+        lines = [
+            f"{'command':<12}{'count':>12}{'total ms':>12}{'mean us':>12}  errors",
+        ]
+        for command_type, time_ns in command_times_ns.most_common():
+            count = command_counts[command_type]
+            errors = ", ".join(
+                f"{command_error_type}: {error_count}"
+                for (
+                    error_command_type,
+                    command_error_type,
+                ), error_count in sorted(command_error_counts.items())
+                if error_command_type == command_type
+            )
+            lines.append(
+                f"{command_type:<12}{count:>12}"
+                f"{time_ns / NS_PER_US / 1000:>12.3f}"
+                f"{self.__format_us(time_ns / count):>12}  {errors}".rstrip(),
+            )
+        return lines
+
+    def __get_latency_lines(self) -> list[str]:
+        profiler = self.__profiler
+        histogram = profiler.get_latency_histogram()
+        max_count = max((count for _, count in histogram), default=0)
+
+        p50_str = self.__format_us(profiler.get_latency_percentile_ns(50))
+        p99_str = self.__format_us(profiler.get_latency_percentile_ns(99))
+        lines = [f"step latency: p50 {p50_str} us, p99 {p99_str} us"]
+        for bit_length, count in histogram:
+            bar = "#" * -(-count * HISTOGRAM_BAR_WIDTH // max_count)
+            lines.append(
+                f"  < {self.__format_us(1 << bit_length):>12} us {count:>12} {bar}",
+            )
+        return lines
+
+    def __get_player_lines(self) -> list[str]:
+        profiler = self.__profiler
+        flood_fill_count = profiler.get_flood_fill_count()
+        mean_flood_fill_size = (
+            profiler.get_flood_fill_cell_count() / flood_fill_count
+            if flood_fill_count > 0
+            else 0
+        )
+        return [
+            f"restarts: {profiler.get_restart_count()}",
+            f"game overs: {profiler.get_game_over_count()}",
+            (
+                f"flood fills: {flood_fill_count}"
+                f" (mean {mean_flood_fill_size:.2f} cells,"
+                f" max {profiler.get_max_flood_fill_size()} cells)"
+            ),
+        ]
+
+    def get_str(self) -> str:
+        lines = [
+            f"steps: {self.__profiler.get_step_count()}",
+            "",
+            *self.__get_command_lines(),
+            "",
+            *self.__get_latency_lines(),
+            "",
+            *self.__get_player_lines(),
+        ]
+        return "\n".join(lines) + "\n"
@@ -30,9 +30,11 @@ class Prompt:
         if desc:
             self.add_desc(desc)
 
+    def get_str(self) -> str:
+        return str(Ansi("  ".join(self.__descs), fg=6))
+
     def show(self) -> None:
-        prompt_str = "  ".join(self.__descs)
-        stderr.write(str(Ansi(prompt_str, fg=6)))
+        stderr.write(self.get_str())
         stderr.flush()
 
         while True:
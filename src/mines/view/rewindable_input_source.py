@@ -0,0 +1,94 @@
+from collections import deque
+from collections.abc import Callable, Iterator
+from itertools import islice
+
+from mines.runtime.input_buffer import InputSource
+
+CONSUMED_CHUNK_LEN = 4096
+
+
+class RewindableInputSourceError(Exception):
+    def __init__(self, message: str) -> None:
+        super().__init__(f"Input cannot be rewound: {message}")
+
+
+class RewindableInputSource(InputSource):
+    # Consumed chars are kept in chunks, so that the input can be rewound to
+    # any earlier position. Rewound chars are read again before the rest of
+    # the wrapped source.
+    __input_source: InputSource
+    __before_read: Callable[[], None] | None
+    __consumed_chunks: list[str]
+    __consumed_chars: list[str]
+    __rewound_chars: deque[str]
+
+    def __init__(
+        self,
+        input_source: InputSource,
+        before_read: Callable[[], None] | None,
+    ) -> None:
+        self.__input_source = input_source
+        self.__before_read = before_read
+        self.__consumed_chunks = []
+        self.__consumed_chars = []
+        self.__rewound_chars = deque()
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.__rewound_chars
+        input_source = self.__input_source
+        if self.__before_read is None:
+            yield from input_source
+            return
+
+        # The wrapped source reads more input only after its buffered chars.
+        input_chars = iter(input_source)
+        yield from islice(input_chars, input_source.get_buffered_len())
+        if not input_source.get_is_eof_confirmed():
+            self.__before_read()
+        yield from input_chars
+
+    def dequeue(self) -> str:
+        if len(self.__rewound_chars) > 0:
+            c = self.__rewound_chars.popleft()
+        else:
+            c = self.__input_source.dequeue()
+
+        consumed_chars = self.__consumed_chars
+        consumed_chars.append(c)
+        if len(consumed_chars) == CONSUMED_CHUNK_LEN:
+            self.__consumed_chunks.append("".join(consumed_chars))
+            consumed_chars.clear()
+        return c
+
+    def get_buffered_len(self) -> int:
+        return len(self.__rewound_chars) + self.__input_source.get_buffered_len()
+
+    def peek(self, max_len: int) -> str:
+        rewound_str = "".join(islice(self.__rewound_chars, max_len))
+        return rewound_str + self.__input_source.peek(max_len - len(rewound_str))
+
+    def get_is_eof_confirmed(self) -> bool:
+        return self.__input_source.get_is_eof_confirmed()
+
+    def get_consumed_len(self) -> int:
+        return len(self.__consumed_chunks) * CONSUMED_CHUNK_LEN + len(
+            self.__consumed_chars,
+        )
+
+    def rewind(self, consumed_len: int) -> None:
+        if not 0 <= consumed_len <= self.get_consumed_len():
+            message = f"{consumed_len} chars have not been consumed."
+            raise RewindableInputSourceError(message)
+
+        chunk_index, char_index = divmod(consumed_len, CONSUMED_CHUNK_LEN)
+        rewound_str = "".join(
+            [*self.__consumed_chunks[chunk_index:], *self.__consumed_chars],
+        )[char_index:]
+        kept_str = (
+            self.__consumed_chunks[chunk_index][:char_index]
+            if chunk_index < len(self.__consumed_chunks)
+            else "".join(self.__consumed_chars[:char_index])
+        )
+        del self.__consumed_chunks[chunk_index:]
+        self.__consumed_chars = list(kept_str)
+        self.__rewound_chars.extendleft(reversed(rewound_str))
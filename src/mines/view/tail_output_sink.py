@@ -0,0 +1,70 @@
+from collections import deque
+from typing import NamedTuple
+
+from mines.runtime.output_buffer import OutputSink
+
+
+class TailOutputSnapshot(NamedTuple):
+    tail: str
+    line_feed_offsets: tuple[int, ...]
+    total_len: int
+
+
+class TailOutputSink(OutputSink):
+    # Only the last chars of the output and the offsets of the last line feeds
+    # in them are kept, so that writing and viewing cost nothing more as the
+    # output grows.
+    __max_tail_len: int
+    __tail: deque[str]
+    __line_feed_offsets: deque[int]
+    __total_len: int
+
+    def __init__(self, max_tail_len: int, max_line_feed_count: int) -> None:
+        self.__max_tail_len = max_tail_len
+        self.__tail = deque(maxlen=max_tail_len)
+        self.__line_feed_offsets = deque(maxlen=max_line_feed_count)
+        self.__total_len = 0
+
+    def write(self, value: str) -> None:
+        value_len = len(value)
+        tail_begin = max(value_len - self.__max_tail_len, 0)
+
+        line_feed_offsets: list[int] = []
+        end = value_len
+        for _ in range(self.__line_feed_offsets.maxlen or 0):
+            index = value.rfind("\n", tail_begin, end)
+            if index < 0:
+                break
+            line_feed_offsets.append(self.__total_len + index)
+            end = index
+        line_feed_offsets.reverse()
+        self.__line_feed_offsets.extend(line_feed_offsets)
+
+        self.__tail.extend(value[tail_begin:])
+        self.__total_len += value_len
+
+    def write_code_point(self, code_point: int) -> None:
+        self.write(chr(code_point))
+
+    def get_total_len(self) -> int:
+        return self.__total_len
+
+    def get_tail(self) -> str:
+        return "".join(self.__tail)
+
+    def get_line_feed_offsets(self) -> list[int]:
+        return list(self.__line_feed_offsets)
+
+    def get_snapshot(self) -> TailOutputSnapshot:
+        return TailOutputSnapshot(
+            "".join(self.__tail),
+            tuple(self.__line_feed_offsets),
+            self.__total_len,
+        )
+
+    def restore_snapshot(self, snapshot: TailOutputSnapshot) -> None:
+        self.__tail.clear()
+        self.__tail.extend(snapshot.tail)
+        self.__line_feed_offsets.clear()
+        self.__line_feed_offsets.extend(snapshot.line_feed_offsets)
+        self.__total_len = snapshot.total_len
@@ -0,0 +1,16 @@
+from typing import TextIO
+
+from mines.runtime.output_buffer import OutputSink
+
+
+class TextOutputSink(OutputSink):
+    __output_io: TextIO
+
+    def __init__(self, output_io: TextIO) -> None:
+        self.__output_io = output_io
+
+    def write(self, value: str) -> None:
+        self.__output_io.write(value)
+
+    def write_code_point(self, code_point: int) -> None:
+        self.__output_io.write(chr(code_point))
@@ -0,0 +1,105 @@
+from collections import deque
+from random import Random
+
+import pytest
+
+from mines.runtime.stack import MIN_ABS_ROLL_DEPTH, Stack
+
+INT64_MAX = (1 << 63) - 1
+
+
+class ReferenceStack:
+    # The former deque stack, rolling by popping both parts and pushing them
+    # back in swapped order.
+    __deque: deque[int]
+    __is_reversed: bool
+
+    def __init__(self) -> None:
+        self.__deque = deque()
+        self.__is_reversed = False
+
+    def get_values(self) -> list[int]:
+        values = list(self.__deque)
+        if self.__is_reversed:
+            values.reverse()
+        return values
+
+    def get_pops(self, pop_count: int) -> list[int]:
+        if self.__is_reversed:
+            return [self.__deque.popleft() for _ in range(pop_count)]
+        return [self.__deque.pop() for _ in range(pop_count)]
+
+    def push(self, *value: int) -> None:
+        if self.__is_reversed:
+            self.__deque.extendleft(value)
+        else:
+            self.__deque.extend(value)
+
+    def reverse(self) -> None:
+        self.__is_reversed ^= True
+
+    def roll(self, depth: int, roll_time: int) -> None:
+        if abs(depth) < MIN_ABS_ROLL_DEPTH:
+            return
+
+        if depth < -1:
+            self.reverse()
+            self.roll(-depth, roll_time)
+            self.reverse()
+            return
+
+        roll_time_rem = roll_time % depth
+
+        if roll_time_rem == 0:
+            return
+
+        bottoms = self.get_pops(roll_time_rem)
+        tops = self.get_pops(depth - roll_time_rem)
+        self.push(*reversed(bottoms))
+        self.push(*reversed(tops))
+
+
+def __generate_value(random: Random, *, promotes: bool) -> int:
+    if promotes and random.random() < 0.02:
+        return random.choice([INT64_MAX + 1, -INT64_MAX - 2, 1 << 100])
+    return random.randint(-1000, 1000)
+
+
+@pytest.mark.parametrize("promotes", [False, True])
+@pytest.mark.parametrize("seed", range(50))
+def test_roll_matches_reference(seed: int, *, promotes: bool) -> None:
+    random = Random(seed)  # noqa: S311
+    stack = Stack()
+    reference = ReferenceStack()
+
+    for _ in range(500):
+        action = random.random()
+        if action < 0.35:
+            values = [
+                __generate_value(random, promotes=promotes)
+                for _ in range(random.randint(1, 8))
+            ]
+            stack.push(*values)
+            reference.push(*values)
+        elif action < 0.45 and len(stack) > 0:
+            pop_count = random.randint(1, len(stack))
+            assert stack.get_pops(pop_count) == reference.get_pops(pop_count)
+        elif action < 0.55:
+            stack.reverse()
+            reference.reverse()
+        elif len(stack) > 0:
+            depth = random.choice([-1, 1]) * random.randint(0, len(stack))
+            roll_time = random.randint(-3 * len(stack), 3 * len(stack))
+            stack.roll(depth, roll_time)
+            reference.roll(depth, roll_time)
+        assert stack.get_values() == reference.get_values()
+
+
+def test_roll_after_restoring_snapshot() -> None:
+    stack = Stack()
+    stack.push(*range(10))
+    snapshot = stack.get_snapshot()
+    stack.roll(10, 3)
+    stack.restore_snapshot(snapshot)
+    stack.roll(-4, 1)
+    assert stack.get_values() == [1, 2, 3, 0, 4, 5, 6, 7, 8, 9]